@@ -0,0 +1,197 @@
+"""Report the import time of the Resolve host modules.
+
+Every module is imported in a fresh interpreter with `-X importtime` and
+the cumulative import time of the module is compared with the budget.
+Imports of the parent packages (e.g. `ayon_core` imported by the addon in
+`ayon_resolve`) are reported but do not count against the budget of the
+module. The slowest imports of the module and heavy modules imported
+along are listed too.
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --modules ayon_resolve.api --budget 10
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARKS_DIR)
+CLIENT_DIR = os.path.join(REPO_ROOT, "client")
+
+DEFAULT_MODULES = ["ayon_resolve.api"]
+# budget of the cumulative import time of each module in milliseconds
+DEFAULT_BUDGET = 10.0
+# modules which are imported on first use only
+HEAVY_MODULES = [
+    "ayon_resolve.api.lib",
+    "ayon_resolve.api.menu",
+    "ayon_resolve.api.plugin",
+    "ayon_resolve.otio.davinci_export",
+    "opentimelineio",
+    "clique",
+    "qtpy",
+]
+# number of imports in a fresh interpreter, the fastest one is reported
+RUNS = 5
+TOP_COUNT = 10
+
+
+def parse_importtime(output):
+    """Return imports parsed from `-X importtime` output.
+
+    Imports of a module are listed before the module one level deeper.
+
+    Returns:
+        list[tuple[str, int, int, int]]: module name, nesting depth, self
+            and cumulative time in microseconds in import order
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0])
+            cumulative_us = int(parts[1])
+        except ValueError:
+            # header line
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), depth, self_us, cumulative_us))
+    return imports
+
+
+def import_module(module):
+    """Import module in a fresh interpreter and return parsed import times.
+
+    Raises:
+        RuntimeError: the import failed
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in (CLIENT_DIR, env.get("PYTHONPATH")) if path)
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + module],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+    if process.returncode != 0:
+        error = "\n".join(
+            line for line in process.stderr.splitlines()
+            if not line.startswith("import time:")
+        )
+        raise RuntimeError(
+            "Import of '{}' failed:\n{}".format(module, error))
+    return parse_importtime(process.stderr)
+
+
+def get_subtree(imports, name):
+    """Return imports done by the import of the module, including it."""
+    for index in range(len(imports) - 1, -1, -1):
+        if imports[index][0] == name:
+            break
+    else:
+        return []
+
+    depth = imports[index][1]
+    start = index
+    while start > 0 and imports[start - 1][1] > depth:
+        start -= 1
+    return imports[start:index + 1]
+
+
+def measure(module, runs=RUNS):
+    """Return report of the fastest of multiple imports of the module.
+
+    Returns:
+        dict: import time of the module without its parent packages and
+            of the parent packages in milliseconds, slowest imports of
+            the module and imported heavy modules
+    """
+    parts = module.split(".")
+    parents = [".".join(parts[:index]) for index in range(1, len(parts))]
+
+    best = None
+    for _ in range(runs):
+        imports = import_module(module)
+        subtree = get_subtree(imports, module)
+        parents_imports = [
+            item for parent in parents
+            for item in get_subtree(imports, parent)
+        ]
+        parents_us = sum(
+            item[3] for item in parents_imports if item[0] in parents)
+        module_us = subtree[-1][3] - parents_us
+        if best is None or module_us < best[0]:
+            best = (module_us, parents_us, subtree, parents_imports)
+
+    module_us, parents_us, subtree, parents_imports = best
+    parents_names = {item[0] for item in parents_imports}
+    module_imports = [
+        item for item in subtree if item[0] not in parents_names]
+    slowest = sorted(module_imports, key=lambda item: item[2], reverse=True)
+    imported = {item[0] for item in module_imports}
+    return {
+        "module": module,
+        "milliseconds": module_us / 1000.0,
+        "parents_milliseconds": parents_us / 1000.0,
+        "slowest": [
+            (item[0], item[2] / 1000.0) for item in slowest[:TOP_COUNT]
+        ],
+        "heavy_modules": [
+            name for name in HEAVY_MODULES
+            if name in imported and name != module
+        ],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--modules", default=",".join(DEFAULT_MODULES),
+        help="Comma separated modules to import")
+    parser.add_argument(
+        "--budget", type=float, default=DEFAULT_BUDGET,
+        help="Budget of cumulative import time of a module in milliseconds")
+    parser.add_argument(
+        "--runs", type=int, default=RUNS,
+        help="Number of imports of each module, the fastest is reported")
+    parser.add_argument(
+        "--fail-over-budget", action="store_true",
+        help="Exit with non-zero code when a module is over the budget or "
+             "imports heavy modules")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in [name for name in args.modules.split(",") if name]:
+        report = measure(module, max(args.runs, 1))
+        over_budget = report["milliseconds"] > args.budget
+        print("{}: {:.2f} ms (budget {:.2f} ms){}".format(
+            module, report["milliseconds"], args.budget,
+            ", OVER BUDGET" if over_budget else ""))
+        print("  parent packages: {:.2f} ms".format(
+            report["parents_milliseconds"]))
+        print("  slowest imports (self time):")
+        for name, milliseconds in report["slowest"]:
+            print("    {:>8.2f} ms  {}".format(milliseconds, name))
+        if report["heavy_modules"]:
+            print("  heavy modules imported: {}".format(
+                ", ".join(report["heavy_modules"])))
+
+        if over_budget or report["heavy_modules"]:
+            failed = True
+
+    if failed and args.fail_over_budget:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,476 @@
+"""Benchmark the hot paths of the Resolve host against synthetic projects.
+
+Every case runs against a fresh synthetic project in the in-process fake
+Resolve, see `synthetic.py`. Each Resolve API call can be delayed with
+`--latency` to simulate the cost of the scripting bridge, the number of
+API calls is reported regardless of the latency.
+
+Results of every run are appended as one JSON line to the history file
+and compared with the previous run of the same size and latency.
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes small,medium
+    python benchmarks/run_benchmarks.py --cases ls,create_bin --latency 0
+"""
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import datetime
+import tempfile
+import importlib.util
+import contextlib
+import subprocess
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARKS_DIR)
+CLIENT_DIR = os.path.join(REPO_ROOT, "client")
+PLUGINS_DIR = os.path.join(CLIENT_DIR, "ayon_resolve", "plugins")
+
+sys.path.insert(0, CLIENT_DIR)
+sys.path.insert(0, BENCHMARKS_DIR)
+
+import synthetic  # noqa: E402
+import opentimelineio as otio  # noqa: E402
+from ayon_resolve.api import (  # noqa: E402
+    lib,
+    pipeline,
+    workio,
+    collect_cache,
+)
+from ayon_resolve.otio import davinci_export  # noqa: E402
+
+SIZES = {
+    "small": {"items": 100, "timelines": 10, "bin_depth": 3},
+    "medium": {"items": 2000, "timelines": 20, "bin_depth": 5},
+    "large": {"items": 20000, "timelines": 50, "bin_depth": 8},
+}
+# number of representations loaded, updated and removed by loader cases
+LOADER_COUNT = 200
+# number of bins created by the `create_bin` case
+BIN_COUNT = 200
+# relative increase of API calls reported as regression
+CALLS_THRESHOLD = 0.1
+# relative increase of time reported as regression
+TIME_THRESHOLD = 0.25
+# smaller increases of time are considered noise
+TIME_MIN_DELTA = 0.01
+
+CASES = {}
+
+
+def case(name):
+    """Register benchmark case.
+
+    The decorated function prepares the case and returns the callable to
+    be measured.
+    """
+    def decorator(func):
+        CASES[name] = func
+        return func
+    return decorator
+
+
+def load_plugin_module(relative_path):
+    """Import plugin module from its file, plugins are not a package."""
+    path = os.path.join(PLUGINS_DIR, relative_path)
+    module_name = "benchmark_" + os.path.splitext(
+        os.path.basename(path))[0]
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@case("ls")
+def bench_ls(resolve, summary):
+    return lambda: list(pipeline.ls())
+
+
+@case("get_current_timeline_items")
+def bench_get_current_timeline_items(resolve, summary):
+    return lambda: lib.get_current_timeline_items(filter=False)
+
+
+@case("has_unsaved_changes")
+def bench_has_unsaved_changes(resolve, summary):
+    workio.remember_saved_state()
+    return workio.has_unsaved_changes
+
+
+@case("create_otio_timeline")
+def bench_create_otio_timeline(resolve, summary):
+    project = lib.get_current_project()
+
+    def run():
+        # the export prints every processed item
+        with contextlib.redirect_stdout(io.StringIO()):
+            davinci_export.create_otio_timeline(project)
+    return run
+
+
+@case("write_otio_timeline_to_file")
+def bench_write_otio_timeline_to_file(resolve, summary):
+    project = lib.get_current_project()
+    directory = tempfile.mkdtemp()
+    expected_path = os.path.join(directory, "expected.otio")
+    path = os.path.join(directory, "streamed.otio")
+
+    # reference file written by the otio_json adapter, not measured
+    latency = resolve.stats.latency
+    resolve.stats.latency = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        otio_timeline = davinci_export.create_otio_timeline(project)
+    otio.adapters.write_to_file(otio_timeline, expected_path)
+    resolve.stats.latency = latency
+
+    def run():
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                davinci_export.write_otio_timeline_to_file(project, path)
+            with open(expected_path, "rb") as stream:
+                expected = stream.read()
+            with open(path, "rb") as stream:
+                streamed = stream.read()
+            if streamed != expected:
+                raise AssertionError(
+                    "Streamed OTIO file differs from the one written by"
+                    " the otio_json adapter")
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+    return run
+
+
+@case("PrecollectInstances")
+def bench_precollect_instances(resolve, summary):
+    import pyblish.api
+
+    module = load_plugin_module("publish/precollect_instances.py")
+
+    # the otio timeline is collected by an earlier collector
+    latency = resolve.stats.latency
+    resolve.stats.latency = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        otio_timeline = davinci_export.create_otio_timeline(
+            lib.get_current_project())
+    resolve.stats.latency = latency
+    resolve.stats.reset()
+
+    def run():
+        context = pyblish.api.Context()
+        context.data["otioTimeline"] = otio_timeline
+        context.data["fps"] = 24.0
+        module.PrecollectInstances().process(context)
+    return run
+
+
+def _get_republish(resolve, use_cache):
+    """Return republish after the first publish changed one instance."""
+    import pyblish.api
+
+    module = load_plugin_module("publish/precollect_instances.py")
+    project = lib.get_current_project()
+
+    def run():
+        # same as `PrecollectWorkfile` without the AYON context
+        context = pyblish.api.Context()
+        snapshot = lib.TimelineSnapshot(
+            timeline=project.GetCurrentTimeline())
+        cache = None
+        if use_cache:
+            cache = collect_cache.get_collect_cache(project)
+        with contextlib.redirect_stdout(io.StringIO()):
+            otio_timeline = davinci_export.create_otio_timeline(
+                project, snapshot, cache)
+        context.data.update({
+            "otioTimeline": otio_timeline,
+            "timelineSnapshot": snapshot,
+            "collectCache": cache,
+            "fps": 24.0,
+        })
+        module.PrecollectInstances().process(context)
+
+    latency = resolve.stats.latency
+    resolve.stats.latency = 0
+    run()
+    timeline_item = lib.get_current_timeline_items(
+        filter=True, selecting_color=lib.publish_clip_color
+    )[0]["clip"]["item"]
+    lib.set_publish_attribute(timeline_item, False)
+    resolve.stats.latency = latency
+    resolve.stats.reset()
+    return run
+
+
+@case("Precollect.incremental")
+def bench_precollect_incremental(resolve, summary):
+    """Republish after a publish with one of the instances changed."""
+    return _get_republish(resolve, use_cache=True)
+
+
+@case("Precollect.uncached")
+def bench_precollect_uncached(resolve, summary):
+    """Same as `Precollect.incremental` without the collect cache."""
+    return _get_republish(resolve, use_cache=False)
+
+
+def _get_loader(summary):
+    """Return LoadMedia loader isolated from the AYON server."""
+    module = load_plugin_module("load/load_media.py")
+
+    class BenchmarkLoadMedia(module.LoadMedia):
+        media_pool_bin_path = "Loader/{folder[name]}"
+
+        def _get_file_info(self, context, anatomy=None):
+            return True, {
+                "FilePath": synthetic.get_media_path(
+                    int(context["folder"]["name"][2:])),
+                "StartIndex": synthetic.FRAME_START,
+                "EndIndex": (
+                    synthetic.FRAME_START + synthetic.FRAME_COUNT - 1),
+            }
+
+        def _get_missing_file_infos(self, file_infos):
+            # synthetic media do not exist on disk
+            return set()
+
+    # server access replaced with synthetic data
+    module.Anatomy = lambda project_name: None
+    module.get_representation_path = (
+        lambda representation: representation["attrib"]["path"])
+
+    latest = {}
+    # loaded media are imported after the existing media
+    for index in range(summary["media_pool_items"] + LOADER_COUNT):
+        context = synthetic.get_load_context(index, version=2)
+        latest[context["version"]["productId"]] = context["version"]["id"]
+    lib.last_version_cache.update(synthetic.PROJECT_NAME, latest)
+
+    return BenchmarkLoadMedia()
+
+
+def _get_media_containers(count):
+    containers = [
+        container
+        for container in pipeline.media_pool_containers.get_containers()
+        if container["loader"] == "LoadMedia"
+    ]
+    return containers[:count]
+
+
+@case("LoadMedia.load")
+def bench_load_media_load(resolve, summary):
+    loader = _get_loader(summary)
+    first_index = summary["media_pool_items"]
+    # load the cached last versions, older versions are queried again
+    contexts = [
+        synthetic.get_load_context(first_index + index, version=2)
+        for index in range(LOADER_COUNT)
+    ]
+    return lambda: loader.load_batch(contexts)
+
+
+@case("LoadMedia.update")
+def bench_load_media_update(resolve, summary):
+    loader = _get_loader(summary)
+    containers = _get_media_containers(LOADER_COUNT)
+    resolve.stats.reset()
+
+    def run():
+        # the scene inventory updates the containers one by one
+        for container in containers:
+            index = int(container["representation"].split("-")[1])
+            loader.update(
+                container, synthetic.get_load_context(index, version=2))
+    return run
+
+
+@case("LoadMedia.remove")
+def bench_load_media_remove(resolve, summary):
+    loader = _get_loader(summary)
+    containers = _get_media_containers(LOADER_COUNT)
+    resolve.stats.reset()
+    return lambda: loader.remove_batch(containers)
+
+
+@case("create_bin")
+def bench_create_bin(resolve, summary):
+    bin_depth = summary["bin_depth"]
+
+    def run():
+        for index in range(BIN_COUNT):
+            lib.create_bin(
+                synthetic.get_bin_path(index * 7, bin_depth) + "/new",
+                set_as_current=False
+            )
+    return run
+
+
+def run_case(name, size, latency):
+    """Run benchmark case on a fresh synthetic project.
+
+    Returns:
+        dict: case result
+    """
+    # keep the collect cache of the case out of the user data
+    with tempfile.TemporaryDirectory() as cache_dir:
+        collect_cache.get_cache_dir = lambda: cache_dir
+        collect_cache.collect_caches = {}
+        collect_cache.changed_media = None
+
+        resolve = synthetic.create_resolve(latency)
+        summary = synthetic.build_project(resolve, **SIZES[size])
+        summary["bin_depth"] = SIZES[size]["bin_depth"]
+        func = CASES[name](resolve, summary)
+
+        resolve.stats.reset()
+        start = time.perf_counter()
+        func()
+        duration = time.perf_counter() - start
+
+    return {
+        "size": size,
+        "case": name,
+        "seconds": round(duration, 6),
+        "calls": resolve.stats.total(),
+        "top_calls": dict(resolve.stats.most_common(5)),
+    }
+
+
+def get_git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            stderr=subprocess.DEVNULL,
+            text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def get_addon_version():
+    version = {}
+    path = os.path.join(CLIENT_DIR, "ayon_resolve", "version.py")
+    with open(path) as stream:
+        exec(stream.read(), version)
+    return version["__version__"]
+
+
+def read_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as stream:
+        return [json.loads(line) for line in stream if line.strip()]
+
+
+def find_previous_result(history, result, latency):
+    """Return latest result of the same case, size and latency."""
+    for record in reversed(history):
+        if record["latency"] != latency:
+            continue
+        for previous in record["results"]:
+            if (
+                previous["case"] == result["case"]
+                and previous["size"] == result["size"]
+            ):
+                return previous
+    return None
+
+
+def compare(result, previous):
+    """Return list of regression messages of the result."""
+    regressions = []
+    if previous is None:
+        return regressions
+
+    if result["calls"] > previous["calls"] * (1 + CALLS_THRESHOLD):
+        regressions.append(
+            "API calls {} -> {}".format(previous["calls"], result["calls"]))
+    if (
+        result["seconds"] > previous["seconds"] * (1 + TIME_THRESHOLD)
+        and result["seconds"] - previous["seconds"] > TIME_MIN_DELTA
+    ):
+        regressions.append(
+            "time {:.3f}s -> {:.3f}s".format(
+                previous["seconds"], result["seconds"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--sizes", default="small,medium",
+        help="Comma separated sizes: {}".format(", ".join(SIZES)))
+    parser.add_argument(
+        "--cases", default=",".join(CASES),
+        help="Comma separated cases: {}".format(", ".join(CASES)))
+    parser.add_argument(
+        "--latency", type=float, default=0.0,
+        help="Simulated seconds per Resolve API call")
+    parser.add_argument(
+        "--history", default=os.path.join(BENCHMARKS_DIR, "history.jsonl"),
+        help="JSON lines file the results are appended to")
+    parser.add_argument(
+        "--no-history", action="store_true",
+        help="Do not write the results to the history file")
+    parser.add_argument(
+        "--fail-on-regression", action="store_true",
+        help="Exit with non-zero code when a regression is found")
+    args = parser.parse_args(argv)
+
+    sizes = [size for size in args.sizes.split(",") if size]
+    cases = [name for name in args.cases.split(",") if name]
+    for name in cases:
+        if name not in CASES:
+            parser.error("Unknown case: {}".format(name))
+    for size in sizes:
+        if size not in SIZES:
+            parser.error("Unknown size: {}".format(size))
+
+    history = read_history(args.history)
+    results = []
+    regressions = []
+    print("{:<8} {:<28} {:>10} {:>10}  {}".format(
+        "size", "case", "seconds", "calls", "regression"))
+    for size in sizes:
+        for name in cases:
+            result = run_case(name, size, args.latency)
+            results.append(result)
+
+            previous = find_previous_result(history, result, args.latency)
+            messages = compare(result, previous)
+            if messages:
+                regressions.append((result, messages))
+            print("{:<8} {:<28} {:>10.3f} {:>10}  {}".format(
+                size, name, result["seconds"], result["calls"],
+                ", ".join(messages)))
+
+    if not args.no_history:
+        record = {
+            "timestamp": datetime.datetime.now(
+                datetime.timezone.utc).isoformat(),
+            "version": get_addon_version(),
+            "commit": get_git_commit(),
+            "python": platform.python_version(),
+            "latency": args.latency,
+            "results": results,
+        }
+        with open(args.history, "a") as stream:
+            stream.write(json.dumps(record, sort_keys=True) + "\n")
+
+    if regressions and args.fail_on_regression:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""Synthetic Resolve projects for the benchmarks.
+
+Projects are built in the in-process fake Resolve from
+`ayon_resolve.api.fake_resolve` so the benchmarks do not need Resolve.
+"""
+import json
+
+from ayon_resolve.api import fake_resolve, lib
+
+PROJECT_NAME = "bench"
+FRAME_START = 1001
+FRAME_COUNT = 50
+
+
+def get_media_path(index):
+    return "/mnt/bench/plates/sh{0:05d}/plate_sh{0:05d}.%04d.exr".format(
+        index)
+
+
+def get_bin_path(index, bin_depth):
+    """Return bin path of the media, neighbouring media share bins."""
+    parts = ["bench"]
+    for depth in range(1, bin_depth):
+        parts.append("level{}_{}".format(depth, (index // 4 ** depth) % 4))
+    return "/".join(parts)
+
+
+def build_project(
+    resolve,
+    items=100,
+    timelines=10,
+    bin_depth=3,
+    media_ratio=5,
+    instance_every=4,
+    container_every=5,
+    media_container_every=2,
+):
+    """Fill the current project of the fake Resolve with synthetic data.
+
+    Args:
+        resolve (fake_resolve.FakeResolve): installed fake Resolve
+        items (int): number of timeline items in the current timeline
+        timelines (int): number of timelines, the other timelines hold
+            `items / timelines` items each
+        bin_depth (int): depth of the media pool bin tree
+        media_ratio (int): timeline items per media pool item
+        instance_every (int): every n-th item is a publish instance
+        container_every (int): every n-th item is a LoadClip container
+        media_container_every (int): every n-th media pool item is
+            a LoadMedia container
+
+    Returns:
+        dict: summary of the built project
+    """
+    latency = resolve.stats.latency
+    resolve.stats.latency = 0
+
+    project = resolve.GetProjectManager().GetCurrentProject()
+    project.SetName(PROJECT_NAME)
+    media_pool = project.GetMediaPool()
+
+    # media in a bin tree
+    media_count = max(items // media_ratio, 1)
+    media_pool_items = []
+    media_indexes = []
+    indexes_by_bin_path = {}
+    for index in range(media_count):
+        indexes_by_bin_path.setdefault(
+            get_bin_path(index, bin_depth), []).append(index)
+
+    for bin_path, indexes in indexes_by_bin_path.items():
+        folder = lib.create_bin(bin_path)
+        media_pool.SetCurrentFolder(folder)
+        media_indexes.extend(indexes)
+        media_pool_items.extend(
+            media_pool.ImportMedia([
+                {
+                    "FilePath": get_media_path(index),
+                    "StartIndex": FRAME_START,
+                    "EndIndex": FRAME_START + FRAME_COUNT - 1,
+                }
+                for index in indexes
+            ])
+        )
+
+    for index, media_pool_item in zip(media_indexes, media_pool_items):
+        if index % media_container_every:
+            continue
+        media_pool_item.SetMetadata(
+            lib.pype_tag_name,
+            json.dumps(get_container_data(index, "LoadMedia"))
+        )
+
+    media_pool.SetCurrentFolder(media_pool.GetRootFolder())
+
+    # current timeline last so it stays current
+    other_items = max(items // timelines, 1)
+    for timeline_index in range(1, timelines):
+        timeline = media_pool.CreateEmptyTimeline(
+            "edit_{:03d}".format(timeline_index))
+        _fill_timeline(media_pool, timeline, media_pool_items, other_items)
+
+    timeline = media_pool.CreateEmptyTimeline("main")
+    timeline_items = _fill_timeline(
+        media_pool, timeline, media_pool_items, items)
+
+    instances = []
+    for index, timeline_item in enumerate(timeline_items):
+        if index % instance_every == 0:
+            instances.append((timeline_item, get_instance_data(index)))
+        elif index % container_every == 0:
+            lib.set_timeline_item_pype_tag(
+                timeline_item, get_container_data(index, "LoadClip"))
+    lib.imprint_many(instances, lib.publish_clip_color)
+
+    # start measuring with clean caches
+    lib.tag_cache.clear()
+    lib.media_pool_index.clear()
+    lib.clip_usage_index.clear()
+    resolve.stats.latency = latency
+    resolve.stats.reset()
+
+    return {
+        "media_pool_items": len(media_pool_items),
+        "bins": len(indexes_by_bin_path),
+        "timelines": timelines,
+        "timeline_items": len(timeline_items),
+        "instances": len(instances),
+    }
+
+
+def _fill_timeline(media_pool, timeline, media_pool_items, count):
+    """Append clips to the timeline spread over three video tracks."""
+    timeline.AddTrack("video")
+    timeline.AddTrack("video")
+    clip_infos = []
+    record_frames = [timeline.GetStartFrame()] * 3
+    for index in range(count):
+        track_index = index % 3
+        duration = 10 + index % 20
+        # leave a gap after every 7th clip
+        gap = 5 if index % 7 == 0 else 0
+        start_frame = FRAME_START + index % 10
+        clip_infos.append({
+            "mediaPoolItem": media_pool_items[index % len(media_pool_items)],
+            "startFrame": start_frame,
+            "endFrame": start_frame + duration - 1,
+            "trackIndex": track_index + 1,
+            "recordFrame": record_frames[track_index] + gap,
+        })
+        record_frames[track_index] += gap + duration
+    return media_pool.AppendToTimeline(clip_infos)
+
+
+def get_instance_data(index):
+    folder_path = "/shots/sq{:03d}/sh{:05d}".format(index // 100, index)
+    return {
+        "id": "pyblish.avalon.instance",
+        "productType": "plate",
+        "productName": "plateMain",
+        "folder_path": folder_path,
+        "handleStart": 10,
+        "handleEnd": 10,
+        "publish": True,
+        "sourceResolution": False,
+        "heroTrack": False,
+        "hierarchyData": {},
+    }
+
+
+def get_container_data(index, loader):
+    return {
+        "schema": "openpype:container-2.0",
+        "id": "ayon.load.container",
+        "name": "plateMain",
+        "namespace": "sh{:05d}".format(index),
+        "loader": loader,
+        "representation": get_representation_id(index),
+    }
+
+
+def get_representation_id(index, version=1):
+    return "repre-{:05d}-v{:03d}".format(index, version)
+
+
+def get_load_context(index, version=1):
+    """Return representation context like ayon_core passes to loaders."""
+    version_id = "version-{:05d}-v{:03d}".format(index, version)
+    return {
+        "project": {"name": PROJECT_NAME},
+        "folder": {"name": "sh{:05d}".format(index)},
+        "product": {"id": "product-{:05d}".format(index)},
+        "version": {
+            "id": version_id,
+            "productId": "product-{:05d}".format(index),
+            "name": version,
+            "version": version,
+            "attrib": {
+                "frameStart": FRAME_START,
+                "frameEnd": FRAME_START + FRAME_COUNT - 1,
+                "handleStart": 0,
+                "handleEnd": 0,
+                "source": "",
+                "fps": 24.0,
+                "colorSpace": None,
+            },
+            "data": {"author": "bench"},
+        },
+        "representation": {
+            "id": get_representation_id(index, version),
+            "name": "exr",
+            "versionId": version_id,
+            "context": {"frame": str(FRAME_START)},
+            "data": {},
+            "attrib": {
+                "path": get_media_path(index).replace(
+                    "%04d", str(FRAME_START)),
+            },
+            "files": [
+                {"path": get_media_path(index) % frame}
+                for frame in range(FRAME_START, FRAME_START + FRAME_COUNT)
+            ],
+        },
+    }
+
+
+def create_resolve(latency=0.0):
+    """Return installed fake Resolve."""
+    resolve = fake_resolve.FakeResolve(latency=latency)
+    fake_resolve.install(resolve)
+    return resolve
@@ -1,73 +1,101 @@
 """
 resolve api
-"""
-from .utils import (
-    get_resolve_module
-)
-
-from .pipeline import (
-    ResolveHost,
-    ls,
-    containerise,
-    update_container,
-    maintained_selection,
-    remove_instance,
-    list_instances
-)
-
-from .lib import (
-    maintain_current_timeline,
-    publish_clip_color,
-    get_project_manager,
-    get_current_project,
-    get_current_timeline,
-    get_any_timeline,
-    get_new_timeline,
-    create_bin,
-    get_media_pool_item,
-    create_media_pool_item,
-    create_timeline_item,
-    get_timeline_item,
-    get_video_track_names,
-    get_current_timeline_items,
-    get_pype_timeline_item_by_name,
-    get_timeline_item_pype_tag,
-    set_timeline_item_pype_tag,
-    imprint,
-    set_publish_attribute,
-    get_publish_attribute,
-    create_compound_clip,
-    swap_clips,
-    get_pype_clip_metadata,
-    set_project_manager_to_folder_name,
-    get_otio_clip_instance_data,
-    get_reformated_path
-)
-
-from .menu import launch_ayon_menu
-
-from .plugin import (
-    ClipLoader,
-    TimelineItemLoader,
-    Creator,
-    PublishClip
-)
-
-from .workio import (
-    open_file,
-    save_file,
-    current_file,
-    has_unsaved_changes,
-    file_extensions,
-    work_root
-)
-
-from .testing_utils import TestGUI
 
+Public names are imported from their modules on first access, so importing
+the package, e.g. from the startup script run while Resolve is already
+interactive, does not import `lib`, OTIO, Qt or the plugin code. Only
+`bmdvr` and `bmdvf` set by `get_resolve_module` are plain attributes.
+"""
+import importlib
 
 bmdvr = None
 bmdvf = None
 
+# public name -> module of this package it is imported from
+_LAZY_NAMES = {
+    # utils
+    "get_resolve_module": "utils",
+
+    # pipeline
+    "ResolveHost": "pipeline",
+    "ls": "pipeline",
+    "containerise": "pipeline",
+    "update_container": "pipeline",
+    "maintained_selection": "pipeline",
+    "remove_instance": "pipeline",
+    "list_instances": "pipeline",
+
+    # lib
+    "maintain_current_timeline": "lib",
+    "publish_clip_color": "lib",
+    "get_project_manager": "lib",
+    "get_current_project": "lib",
+    "get_current_timeline": "lib",
+    "get_any_timeline": "lib",
+    "get_new_timeline": "lib",
+    "create_bin": "lib",
+    "get_media_pool_item": "lib",
+    "create_media_pool_item": "lib",
+    "create_timeline_item": "lib",
+    "create_timeline_items": "lib",
+    "get_timeline_item": "lib",
+    "get_video_track_names": "lib",
+    "TimelineSnapshot": "lib",
+    "get_current_timeline_items": "lib",
+    "get_pype_timeline_item_by_name": "lib",
+    "get_timeline_item_pype_tag": "lib",
+    "set_timeline_item_pype_tag": "lib",
+    "imprint": "lib",
+    "imprint_many": "lib",
+    "set_publish_attribute": "lib",
+    "get_publish_attribute": "lib",
+    "create_compound_clip": "lib",
+    "swap_clips": "lib",
+    "get_pype_clip_metadata": "lib",
+    "set_project_manager_to_folder_name": "lib",
+    "get_otio_clip_instance_data": "lib",
+    "OTIOClipIndex": "lib",
+    "get_reformated_path": "lib",
+
+    # menu
+    "launch_ayon_menu": "menu",
+
+    # plugin
+    "ClipLoader": "plugin",
+    "TimelineItemLoader": "plugin",
+    "Creator": "plugin",
+    "PublishClip": "plugin",
+
+    # workio
+    "open_file": "workio",
+    "save_file": "workio",
+    "current_file": "workio",
+    "has_unsaved_changes": "workio",
+    "file_extensions": "workio",
+    "work_root": "workio",
+
+    # testing_utils
+    "TestGUI": "testing_utils",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name))
+
+    module = importlib.import_module("." + module_name, __name__)
+    value = getattr(module, name)
+    # next access does not go through `__getattr__`
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_NAMES))
+
+
 __all__ = [
     "bmdvr",
     "bmdvf",
@@ -96,13 +124,16 @@ __all__ = [
     "get_media_pool_item",
     "create_media_pool_item",
     "create_timeline_item",
+    "create_timeline_items",
     "get_timeline_item",
     "get_video_track_names",
+    "TimelineSnapshot",
     "get_current_timeline_items",
     "get_pype_timeline_item_by_name",
     "get_timeline_item_pype_tag",
     "set_timeline_item_pype_tag",
     "imprint",
+    "imprint_many",
     "set_publish_attribute",
     "get_publish_attribute",
     "create_compound_clip",
@@ -110,6 +141,7 @@ __all__ = [
     "get_pype_clip_metadata",
     "set_project_manager_to_folder_name",
     "get_otio_clip_instance_data",
+    "OTIOClipIndex",
     "get_reformated_path",
 
     # menu
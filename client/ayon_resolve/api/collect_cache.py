@@ -0,0 +1,311 @@
+"""Persistent cache of collected timeline item data.
+
+Publishing converts every item of the current timeline to OTIO and reads
+the tag of every publishable item through the scripting bridge. Artists
+usually republish a few shots of the same timeline many times, so the
+collected data of each item are stored on disk per Resolve project by
+a fingerprint of the item. The fingerprint is made only of attributes
+collected anyway: the name, range, offsets and media pool item id read
+by the timeline snapshot and the markers, which hold the AYON tag and are
+exported to OTIO. Data of items with unchanged fingerprint are reused,
+only changed items are collected again.
+
+Changes which do not affect the fingerprint are not detected:
+
+- media relinked or replaced in Resolve, keeping the media pool item
+  unique id, e.g. a different file path or frame range of the media
+- clip properties and metadata of the media pool item
+
+Media pool items changed in place by AYON, e.g. by `ReplaceClip` on update
+of a loaded media, are recorded with `mark_media_pool_items_changed` so
+the data of items using them are not reused.
+"""
+import os
+import sys
+import copy
+import json
+import time
+import hashlib
+
+from ayon_core.lib import Logger, get_ayon_appdirs
+
+log = Logger.get_logger(__name__)
+
+self = sys.modules[__name__]
+self.collect_caches = {}
+# media pool item unique id -> time it was changed
+self.changed_media = None
+
+# bump when the stored data or the fingerprint change
+CACHE_VERSION = 4
+# data not collected again for this long are dropped, in seconds
+MAX_AGE = 30 * 24 * 60 * 60
+CHANGED_MEDIA_FILENAME = "changed_media.jsonl"
+
+
+def get_cache_dir():
+    return get_ayon_appdirs("resolve", "collect_cache")
+
+
+class CollectCache:
+    """Collected data of timeline items of one project stored on disk.
+
+    Data are stored by timeline and fingerprint of the timeline item, so
+    looking them up does not need the unique id of the item. Items equal
+    in all attributes of the fingerprint share the data.
+
+    Args:
+        path (str): path to the json file
+        changed_media (dict)[optional]: time of change by media pool item
+            unique id, data cached before the change of their media pool
+            item are not returned
+    """
+
+    def __init__(self, path, changed_media=None):
+        self.path = path
+        self.changed_media = {} if changed_media is None else changed_media
+        # timeline id -> item fingerprint -> entry
+        self._timelines = {}
+        self._changed = False
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    @staticmethod
+    def get_fingerprint(clip_data, markers, fps):
+        """Return fingerprint of the timeline item.
+
+        Args:
+            clip_data (dict): clip data of a `lib.TimelineSnapshot` item
+            markers (dict): markers of the timeline item by frame
+            fps (Union[str, float]): frame rate of the timeline
+
+        Returns:
+            str: fingerprint
+        """
+        values = [
+            clip_data["name"],
+            clip_data["start"],
+            clip_data["end"],
+            clip_data["leftOffset"],
+            clip_data["rightOffset"],
+            clip_data["mediaPoolItemId"],
+            str(fps),
+            sorted(
+                [str(frame), marker] for frame, marker in markers.items()
+            ),
+        ]
+        return hashlib.sha1(
+            json.dumps(values, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as stream:
+                data = json.load(stream)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as error:
+            log.warning(
+                "Ignoring unreadable collect cache '{}': {}".format(
+                    self.path, error))
+            return
+
+        if data.get("version") != CACHE_VERSION:
+            return
+
+        min_time = time.time() - MAX_AGE
+        for timeline_id, items in data["timelines"].items():
+            items = {
+                fingerprint: entry
+                for fingerprint, entry in items.items()
+                if entry["time"] > min_time
+            }
+            if items:
+                self._timelines[timeline_id] = items
+
+    def _get_entry(self, timeline_id, fingerprint):
+        entry = self._timelines.get(timeline_id, {}).get(fingerprint)
+        if entry is None:
+            return None
+
+        changed = self.changed_media.get(entry["mediaPoolItemId"])
+        if changed is not None and changed >= entry["time"]:
+            return None
+        return entry
+
+    def get(self, timeline_id, fingerprint, key):
+        """Return copy of cached data or None if not cached or outdated.
+
+        Args:
+            timeline_id (str): timeline unique id
+            fingerprint (str): current fingerprint of the item, see
+                `get_fingerprint`
+            key (str): name of the data
+
+        Returns:
+            Any: cached data
+        """
+        entry = self._get_entry(timeline_id, fingerprint)
+        if entry is None or key not in entry["data"]:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return copy.deepcopy(entry["data"][key])
+
+    def set(
+        self,
+        timeline_id,
+        fingerprint,
+        key,
+        value,
+        media_pool_item_id=None
+    ):
+        """Store json serializable data of the timeline item.
+
+        Args:
+            timeline_id (str): timeline unique id
+            fingerprint (str): fingerprint of the item
+            key (str): name of the data
+            value (Any): data to store
+            media_pool_item_id (str)[optional]: unique id of the media pool
+                item of the timeline item
+        """
+        items = self._timelines.setdefault(timeline_id, {})
+        entry = self._get_entry(timeline_id, fingerprint)
+        if entry is None:
+            entry = {
+                "mediaPoolItemId": media_pool_item_id,
+                "time": time.time(),
+                "data": {},
+            }
+            items[fingerprint] = entry
+        entry["data"][key] = copy.deepcopy(value)
+        self._changed = True
+
+    def retain(self, timeline_id, fingerprints):
+        """Drop data of the timeline items which are not in the timeline.
+
+        Args:
+            timeline_id (str): timeline unique id
+            fingerprints (Iterable[str]): fingerprints of all items of the
+                timeline
+        """
+        items = self._timelines.get(timeline_id)
+        if not items:
+            return
+
+        fingerprints = set(fingerprints)
+        for fingerprint in list(items):
+            if fingerprint not in fingerprints:
+                del items[fingerprint]
+                self._changed = True
+
+    def save(self):
+        """Write the cache to disk if it changed since loaded."""
+        if not self._changed:
+            return
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = "{}.tmp".format(self.path)
+        with open(tmp_path, "w", encoding="utf-8") as stream:
+            json.dump(
+                {"version": CACHE_VERSION, "timelines": self._timelines},
+                stream
+            )
+        os.replace(tmp_path, self.path)
+        self._changed = False
+
+    def clear(self):
+        if self._timelines:
+            self._timelines.clear()
+            self._changed = True
+
+    def stats(self) -> dict:
+        """Return cache counters.
+
+        Returns:
+            dict: with `hits`, `misses` and `size` keys
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": sum(len(items) for items in self._timelines.values()),
+        }
+
+
+def _get_changed_media():
+    """Return time of change by media pool item id, loaded once."""
+    if self.changed_media is not None:
+        return self.changed_media
+
+    self.changed_media = {}
+    path = os.path.join(get_cache_dir(), CHANGED_MEDIA_FILENAME)
+    try:
+        with open(path, "r", encoding="utf-8") as stream:
+            lines = stream.readlines()
+    except OSError:
+        return self.changed_media
+
+    min_time = time.time() - MAX_AGE
+    for line in lines:
+        try:
+            unique_id, changed = json.loads(line)
+        except ValueError:
+            continue
+        if changed > min_time:
+            self.changed_media[unique_id] = changed
+
+    # cached data older than that are dropped anyway
+    if len(self.changed_media) < len(lines):
+        with open(path, "w", encoding="utf-8") as stream:
+            for unique_id, changed in self.changed_media.items():
+                stream.write(json.dumps([unique_id, changed]) + "\n")
+    return self.changed_media
+
+
+def mark_media_pool_items_changed(unique_ids):
+    """Do not reuse cached data of timeline items using the media.
+
+    The change is recorded for all projects as media pool item unique ids
+    are unique across projects.
+
+    Args:
+        unique_ids (Iterable[str]): unique ids of changed media pool items
+    """
+    changed_media = _get_changed_media()
+    changed = time.time()
+    lines = []
+    for unique_id in unique_ids:
+        changed_media[unique_id] = changed
+        lines.append(json.dumps([unique_id, changed]) + "\n")
+
+    if not lines:
+        return
+
+    cache_dir = get_cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, CHANGED_MEDIA_FILENAME)
+    with open(path, "a", encoding="utf-8") as stream:
+        stream.writelines(lines)
+
+
+def get_collect_cache(project):
+    """Return collect cache of the Resolve project.
+
+    The cache is loaded from disk on first call for the project.
+
+    Args:
+        project (resolve.Project): Resolve project
+
+    Returns:
+        CollectCache: cache of the project
+    """
+    project_id = project.GetUniqueId()
+    cache = self.collect_caches.get(project_id)
+    if cache is None:
+        path = os.path.join(get_cache_dir(), "{}.json".format(project_id))
+        cache = CollectCache(path, _get_changed_media())
+        self.collect_caches[project_id] = cache
+    return cache
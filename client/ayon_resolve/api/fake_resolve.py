@@ -0,0 +1,991 @@
+"""In-process stand-in for the DaVinci Resolve scripting API.
+
+The objects mimic the `DaVinciResolveScript` API closely enough to run
+`lib`, `pipeline` and the plugins headless, e.g. to benchmark and check
+the number of scripting bridge calls on machines without Resolve.
+
+Every API call (any attribute starting with an uppercase letter) is
+counted in `CallStats` and can be delayed by a configurable latency to
+simulate the cost of the scripting bridge.
+
+Example:
+    >>> from ayon_resolve.api import fake_resolve
+    >>> resolve = fake_resolve.FakeResolve(latency=0.0005)
+    >>> with fake_resolve.installed(resolve):
+    ...     lib.get_current_timeline()
+    >>> resolve.stats.total()
+"""
+import os
+import re
+import sys
+import time
+import types
+import contextlib
+import collections
+import functools
+import itertools
+
+
+AUDIO_EXTENSIONS = {".wav", ".aif", ".aiff", ".mp3", ".flac", ".m4a"}
+
+
+class CallStats:
+    """Counter of API calls with simulated per-call latency.
+
+    Args:
+        latency (float)[optional]: seconds each API call takes
+        latencies (dict)[optional]: latency override per call name, e.g.
+            `{"MediaPool.ImportMedia": 0.05}`
+    """
+
+    def __init__(self, latency=0.0, latencies=None):
+        self.latency = latency
+        self.latencies = dict(latencies or {})
+        self.calls = collections.Counter()
+
+    def record(self, name):
+        self.calls[name] += 1
+        latency = self.latencies.get(name, self.latency)
+        if latency:
+            time.sleep(latency)
+
+    def total(self):
+        return sum(self.calls.values())
+
+    def reset(self):
+        self.calls.clear()
+
+    def most_common(self, count=None):
+        return self.calls.most_common(count)
+
+
+class FakeObject:
+    """Base of all fake API objects.
+
+    Public API methods are wrapped on access so each call is recorded in
+    the shared `CallStats` of the Resolve instance.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, stats):
+        self._stats = stats
+        self._unique_id = "{}-{:08d}".format(
+            type(self).__name__.replace("Fake", ""), next(self._ids))
+
+    def __getattribute__(self, name):
+        attr = object.__getattribute__(self, name)
+        if not name[:1].isupper() or not callable(attr):
+            return attr
+
+        stats = object.__getattribute__(self, "_stats")
+        call_name = "{}.{}".format(
+            type(self).__name__.replace("Fake", ""), name)
+
+        @functools.wraps(attr)
+        def api_call(*args, **kwargs):
+            stats.record(call_name)
+            return attr(*args, **kwargs)
+
+        return api_call
+
+    def __repr__(self):
+        return "<{} {}>".format(type(self).__name__, self._unique_id)
+
+    def GetUniqueId(self):
+        return self._unique_id
+
+
+class _MarkersMixin:
+    """Markers API shared by timelines, timeline and media pool items."""
+
+    def _init_markers(self):
+        self._markers = {}
+        self._clip_color = ""
+        self._flags = []
+
+    def GetMarkers(self):
+        return {
+            frame: dict(marker) for frame, marker in self._markers.items()
+        }
+
+    def AddMarker(
+        self, frameId, color, name, note, duration, customData=""
+    ):
+        if frameId in self._markers:
+            return False
+        self._markers[frameId] = {
+            "color": color,
+            "duration": duration,
+            "note": note,
+            "name": name,
+            "customData": customData,
+        }
+        return True
+
+    def GetMarkerByCustomData(self, customData):
+        for frame, marker in self._markers.items():
+            if marker["customData"] == customData:
+                return {frame: dict(marker)}
+        return {}
+
+    def UpdateMarkerCustomData(self, frameId, customData):
+        marker = self._markers.get(frameId)
+        if marker is None:
+            return False
+        marker["customData"] = customData
+        return True
+
+    def GetMarkerCustomData(self, frameId):
+        marker = self._markers.get(frameId)
+        return marker["customData"] if marker else ""
+
+    def DeleteMarkersByColor(self, color):
+        frames = [
+            frame for frame, marker in self._markers.items()
+            if color == "All" or marker["color"] == color
+        ]
+        for frame in frames:
+            del self._markers[frame]
+        return True
+
+    def DeleteMarkerAtFrame(self, frameNum):
+        return self._markers.pop(frameNum, None) is not None
+
+    def DeleteMarkerByCustomData(self, customData):
+        for frame, marker in list(self._markers.items()):
+            if marker["customData"] == customData:
+                del self._markers[frame]
+                return True
+        return False
+
+    def GetClipColor(self):
+        return self._clip_color
+
+    def SetClipColor(self, colorName):
+        self._clip_color = colorName
+        return True
+
+    def ClearClipColor(self):
+        self._clip_color = ""
+        return True
+
+    def GetFlagList(self):
+        return list(self._flags)
+
+    def AddFlag(self, color):
+        self._flags.append(color)
+        return True
+
+    def ClearFlags(self, color):
+        self._flags = [
+            flag for flag in self._flags
+            if color != "All" and flag != color
+        ]
+        return True
+
+
+class FakeMediaPoolItem(_MarkersMixin, FakeObject):
+    def __init__(self, stats, properties):
+        super().__init__(stats)
+        self._init_markers()
+        self._properties = dict(properties)
+        self._metadata = {}
+        self._usage = 0
+
+    def GetName(self):
+        return self._properties.get("Clip Name", "")
+
+    def GetMediaId(self):
+        return "media-{}".format(self._unique_id)
+
+    def GetClipProperty(self, propertyName=None):
+        if propertyName is None:
+            properties = dict(self._properties)
+            properties["Usage"] = str(self._usage)
+            return properties
+        if propertyName == "Usage":
+            return str(self._usage)
+        return self._properties.get(propertyName, "")
+
+    def SetClipProperty(self, propertyName, propertyValue):
+        self._properties[propertyName] = propertyValue
+        return True
+
+    def GetMetadata(self, metadataType=None):
+        if metadataType is None:
+            return dict(self._metadata)
+        return self._metadata.get(metadataType, "")
+
+    def SetMetadata(self, metadataType, metadataValue=None):
+        if isinstance(metadataType, dict):
+            self._metadata.update(metadataType)
+        else:
+            self._metadata[metadataType] = metadataValue
+        return True
+
+    def ReplaceClip(self, filePath):
+        properties = get_media_properties(filePath)
+        # keep the clip name like Resolve does
+        properties["Clip Name"] = self._properties.get(
+            "Clip Name", properties["Clip Name"])
+        self._properties.update(properties)
+        return True
+
+
+class FakeFolder(FakeObject):
+    def __init__(self, stats, name, parent=None):
+        super().__init__(stats)
+        self._name = name
+        self._parent = parent
+        self._clips = []
+        self._subfolders = []
+        self._deleted = False
+
+    # assumed behavior of calls on deleted folders, not verified against
+    # Resolve
+    def GetName(self):
+        if self._deleted:
+            return None
+        return self._name
+
+    def GetClipList(self):
+        if self._deleted:
+            return None
+        return list(self._clips)
+
+    def GetSubFolderList(self):
+        if self._deleted:
+            return None
+        return list(self._subfolders)
+
+    def GetIsFolderStale(self):
+        return False
+
+
+class FakeTimelineItem(_MarkersMixin, FakeObject):
+    def __init__(
+        self, stats, timeline, media_pool_item, start, duration,
+        left_offset=0, track_type="video", track_index=1
+    ):
+        super().__init__(stats)
+        self._init_markers()
+        self._timeline = timeline
+        self._media_pool_item = media_pool_item
+        self._start = start
+        self._duration = duration
+        self._left_offset = left_offset
+        self._track = (track_type, track_index)
+        self._name = (
+            media_pool_item._properties.get("Clip Name", "")
+            if media_pool_item else ""
+        )
+
+    def GetName(self):
+        return self._name
+
+    def SetName(self, name):
+        self._name = name
+        return True
+
+    def GetMediaPoolItem(self):
+        return self._media_pool_item
+
+    def GetStart(self):
+        return self._start
+
+    def GetEnd(self):
+        return self._start + self._duration
+
+    def GetDuration(self):
+        return self._duration
+
+    def GetLeftOffset(self):
+        return self._left_offset
+
+    def GetRightOffset(self):
+        return self._left_offset + self._duration
+
+    def GetTrackTypeAndIndex(self):
+        return list(self._track)
+
+
+class FakeInvalidTimelineItem(FakeObject):
+    """Returned by Resolve for clips which failed to be appended.
+
+    All getters return None like the real API does.
+    """
+
+    def __getattr__(self, name):
+        if name[:1].isupper():
+            return lambda *args, **kwargs: None
+        raise AttributeError(name)
+
+
+class FakeTimeline(_MarkersMixin, FakeObject):
+    def __init__(self, stats, project, name, start_frame=86400):
+        super().__init__(stats)
+        self._init_markers()
+        self._project = project
+        self._name = name
+        self._start_frame = start_frame
+        self._tracks = {"video": [[]], "audio": [[]], "subtitle": []}
+        self._track_names = {}
+        self._settings = {}
+
+    def GetName(self):
+        return self._name
+
+    def SetName(self, timelineName):
+        self._name = timelineName
+        return True
+
+    def GetStartFrame(self):
+        return self._start_frame
+
+    def GetEndFrame(self):
+        ends = [
+            item._start + item._duration
+            for tracks in self._tracks.values()
+            for track in tracks
+            for item in track
+        ]
+        return max(ends) if ends else self._start_frame
+
+    def GetStartTimecode(self):
+        return frames_to_timecode(self._start_frame, self._get_fps())
+
+    def SetStartTimecode(self, timecode):
+        self._start_frame = timecode_to_frames(timecode, self._get_fps())
+        return True
+
+    def GetSetting(self, settingName=None):
+        settings = dict(self._project._settings)
+        settings.update(self._settings)
+        if settingName is None:
+            return settings
+        return settings.get(settingName, "")
+
+    def SetSetting(self, settingName, settingValue):
+        self._settings[settingName] = settingValue
+        return True
+
+    def GetTrackCount(self, trackType):
+        return len(self._tracks.get(trackType, []))
+
+    def AddTrack(self, trackType, subTrackType=None):
+        if trackType not in self._tracks:
+            return False
+        if trackType == "audio" and not subTrackType:
+            return False
+        self._tracks[trackType].append([])
+        return True
+
+    def DeleteTrack(self, trackType, trackIndex):
+        tracks = self._tracks.get(trackType, [])
+        if not 0 < trackIndex <= len(tracks):
+            return False
+        for item in tracks.pop(trackIndex - 1):
+            self._release_item(item)
+        return True
+
+    def GetTrackName(self, trackType, trackIndex):
+        default = "{} {}".format(
+            {"video": "Video", "audio": "Audio"}.get(
+                trackType, trackType.capitalize()),
+            trackIndex
+        )
+        return self._track_names.get((trackType, trackIndex), default)
+
+    def SetTrackName(self, trackType, trackIndex, name):
+        self._track_names[(trackType, trackIndex)] = name
+        return True
+
+    def GetItemListInTrack(self, trackType, index):
+        tracks = self._tracks.get(trackType, [])
+        if not 0 < index <= len(tracks):
+            return None
+        return list(tracks[index - 1])
+
+    def DeleteClips(self, timelineItems, ripple=False):
+        for items in self._tracks.values():
+            for track in items:
+                for item in timelineItems:
+                    if item in track:
+                        track.remove(item)
+                        self._release_item(item)
+        return True
+
+    def GetCurrentVideoItem(self):
+        tracks = self._tracks["video"]
+        for track in reversed(tracks):
+            if track:
+                return track[0]
+        return None
+
+    def _get_fps(self):
+        fps = self._settings.get(
+            "timelineFrameRate",
+            self._project._settings.get("timelineFrameRate")
+        )
+        return float(fps or 24)
+
+    def _release_item(self, item):
+        media_pool_item = item._media_pool_item
+        if media_pool_item is not None:
+            media_pool_item._usage -= 1
+
+    def _append(self, media_pool_item, clip_info):
+        media_type = clip_info.get("mediaType")
+        # internal access does not count as API calls
+        properties = media_pool_item._properties
+        media_is_audio = properties.get("Type") == "Audio"
+        track_type = (
+            "audio" if media_type == 2 or media_is_audio else "video")
+        track_index = int(clip_info.get("trackIndex", 1))
+        tracks = self._tracks[track_type]
+        if not 0 < track_index <= len(tracks):
+            return FakeInvalidTimelineItem(self._stats)
+        track = tracks[track_index - 1]
+
+        source_start = int(properties.get("Start") or 0)
+        source_end = int(properties.get("End") or 0)
+        start_frame = int(clip_info.get("startFrame", source_start))
+        end_frame = int(clip_info.get("endFrame", source_end))
+        duration = end_frame - start_frame + 1
+
+        if "recordFrame" in clip_info:
+            record_frame = int(clip_info["recordFrame"])
+        elif track:
+            record_frame = track[-1]._start + track[-1]._duration
+        else:
+            record_frame = self._start_frame
+
+        # Resolve refuses to place a clip over an existing one, items of
+        # a track are sorted and never overlap so check the neighbours
+        index = _bisect_items(track, record_frame)
+        if index:
+            previous = track[index - 1]
+            if record_frame < previous._start + previous._duration:
+                return FakeInvalidTimelineItem(self._stats)
+        if index < len(track):
+            if track[index]._start < record_frame + duration:
+                return FakeInvalidTimelineItem(self._stats)
+
+        item = FakeTimelineItem(
+            self._stats,
+            self,
+            media_pool_item,
+            record_frame,
+            duration,
+            left_offset=start_frame - source_start,
+            track_type=track_type,
+            track_index=track_index
+        )
+        track.insert(index, item)
+        media_pool_item._usage += 1
+        return item
+
+
+def _bisect_items(track, frame):
+    """Return index of the first item of the sorted track after frame."""
+    low, high = 0, len(track)
+    while low < high:
+        middle = (low + high) // 2
+        if frame < track[middle]._start:
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+class FakeMediaPool(FakeObject):
+    def __init__(self, stats, project):
+        super().__init__(stats)
+        self._project = project
+        self._root_folder = FakeFolder(stats, "Master")
+        self._current_folder = self._root_folder
+
+    def GetRootFolder(self):
+        return self._root_folder
+
+    def GetCurrentFolder(self):
+        return self._current_folder
+
+    def SetCurrentFolder(self, folder):
+        self._current_folder = folder
+        return True
+
+    def AddSubFolder(self, folder, name):
+        subfolder = FakeFolder(self._stats, name, parent=folder)
+        folder._subfolders.append(subfolder)
+        return subfolder
+
+    def DeleteFolders(self, folders):
+        for folder in folders:
+            if folder._parent is not None:
+                folder._parent._subfolders.remove(folder)
+            deleted = [folder]
+            for deleted_folder in deleted:
+                deleted_folder._deleted = True
+                deleted.extend(deleted_folder._subfolders)
+        return True
+
+    def ImportMedia(self, items):
+        return self._import_media(items)
+
+    def _import_media(self, items):
+        media_pool_items = []
+        for item in items:
+            if isinstance(item, dict):
+                properties = get_media_properties(
+                    item["FilePath"],
+                    item.get("StartIndex"),
+                    item.get("EndIndex")
+                )
+            else:
+                properties = get_media_properties(item)
+
+            if not self._project._resolve.media_exists(
+                    properties["File Path"]):
+                continue
+
+            media_pool_item = FakeMediaPoolItem(self._stats, properties)
+            self._current_folder._clips.append(media_pool_item)
+            media_pool_items.append(media_pool_item)
+        return media_pool_items
+
+    def DeleteClips(self, clips):
+        folders = [self._root_folder]
+        while folders:
+            folder = folders.pop()
+            folder._clips = [
+                clip for clip in folder._clips if clip not in clips
+            ]
+            folders.extend(folder._subfolders)
+        return True
+
+    def MoveClips(self, clips, targetFolder):
+        self.DeleteClips(clips)
+        targetFolder._clips.extend(clips)
+        return True
+
+    def CreateEmptyTimeline(self, name):
+        if any(
+            timeline._name == name for timeline in self._project._timelines
+        ):
+            return None
+        timeline = FakeTimeline(self._stats, self._project, name)
+        self._project._timelines.append(timeline)
+        self._project._current_timeline = timeline
+
+        # Resolve lists timelines as media pool items in the current bin
+        settings = self._project._settings
+        self._current_folder._clips.append(
+            FakeMediaPoolItem(
+                self._stats,
+                {
+                    "Clip Name": name,
+                    "File Name": "",
+                    "File Path": "",
+                    "Type": "Timeline",
+                    "FPS": settings["timelineFrameRate"],
+                    "Resolution": "{}x{}".format(
+                        settings["timelineResolutionWidth"],
+                        settings["timelineResolutionHeight"]
+                    ),
+                    "PAR": "Square",
+                }
+            )
+        )
+        return timeline
+
+    def CreateTimelineFromClips(self, name, clips):
+        timeline = self.CreateEmptyTimeline(name)
+        if timeline is not None:
+            self.AppendToTimeline(clips)
+        return timeline
+
+    def AppendToTimeline(self, clips):
+        timeline = self._project._current_timeline
+        if timeline is None:
+            timeline = self.CreateEmptyTimeline("Timeline 1")
+
+        timeline_items = []
+        for clip in clips:
+            if isinstance(clip, dict):
+                media_pool_item = clip["mediaPoolItem"]
+                clip_info = clip
+            else:
+                media_pool_item = clip
+                clip_info = {}
+            timeline_items.append(
+                timeline._append(media_pool_item, clip_info))
+        return timeline_items
+
+    def ImportTimelineFromFile(self, filePath, importOptions=None):
+        return None
+
+
+class FakeProject(FakeObject):
+    def __init__(self, stats, resolve, name):
+        super().__init__(stats)
+        self._resolve = resolve
+        self._name = name
+        self._media_pool = FakeMediaPool(stats, self)
+        self._timelines = []
+        self._current_timeline = None
+        self._settings = {
+            "timelineFrameRate": "24",
+            "timelineResolutionWidth": "1920",
+            "timelineResolutionHeight": "1080",
+            "colorScienceMode": "davinciYRGBColorManagedv2",
+        }
+
+    def GetName(self):
+        return self._name
+
+    def SetName(self, projectName):
+        self._name = projectName
+        return True
+
+    def GetMediaPool(self):
+        return self._media_pool
+
+    def GetTimelineCount(self):
+        return len(self._timelines)
+
+    def GetTimelineByIndex(self, idx):
+        if not 0 < idx <= len(self._timelines):
+            return None
+        return self._timelines[idx - 1]
+
+    def GetCurrentTimeline(self):
+        return self._current_timeline
+
+    def SetCurrentTimeline(self, timeline):
+        if timeline not in self._timelines:
+            return False
+        self._current_timeline = timeline
+        return True
+
+    def GetSetting(self, settingName=None):
+        if settingName is None:
+            return dict(self._settings)
+        return self._settings.get(settingName, "")
+
+    def SetSetting(self, settingName, settingValue):
+        self._settings[settingName] = settingValue
+        return True
+
+
+class FakeProjectManager(FakeObject):
+    def __init__(self, stats, resolve):
+        super().__init__(stats)
+        self._resolve = resolve
+        self._projects = {}
+        self._folder_path = []
+        self._folders = {(): set()}
+        self._current_project = self.CreateProject("Untitled Project")
+
+    def GetCurrentProject(self):
+        return self._current_project
+
+    def CreateProject(self, projectName):
+        if projectName in self._projects:
+            return None
+        project = FakeProject(self._stats, self._resolve, projectName)
+        self._projects[projectName] = project
+        self._current_project = project
+        return project
+
+    def LoadProject(self, projectName):
+        project = self._projects.get(projectName)
+        if project is not None:
+            self._current_project = project
+        return project
+
+    def SaveProject(self):
+        return True
+
+    def CloseProject(self, project):
+        return True
+
+    def DeleteProject(self, projectName):
+        if self._projects.get(projectName) is self._current_project:
+            return False
+        return self._projects.pop(projectName, None) is not None
+
+    def ExportProject(self, projectName, filePath, withStillsAndLUTs=True):
+        # projects can be renamed after they were created
+        if not any(
+            project._name == projectName
+            for project in self._projects.values()
+        ):
+            return False
+        with open(filePath, "w") as stream:
+            stream.write(projectName)
+        return True
+
+    def ImportProject(self, filePath, projectName=None):
+        if projectName is None:
+            projectName = os.path.splitext(os.path.basename(filePath))[0]
+        if projectName in self._projects:
+            return False
+        self._projects[projectName] = FakeProject(
+            self._stats, self._resolve, projectName)
+        return True
+
+    def GetProjectListInCurrentFolder(self):
+        return list(self._projects)
+
+    def GetFolderListInCurrentFolder(self):
+        return sorted(self._folders[tuple(self._folder_path)])
+
+    # older name of the call used by `lib`
+    GetFoldersInCurrentFolder = GetFolderListInCurrentFolder
+
+    def GotoRootFolder(self):
+        self._folder_path = []
+        return True
+
+    def GotoParentFolder(self):
+        if not self._folder_path:
+            return False
+        self._folder_path.pop()
+        return True
+
+    def GetCurrentFolder(self):
+        return self._folder_path[-1] if self._folder_path else ""
+
+    def CreateFolder(self, folderName):
+        current = tuple(self._folder_path)
+        if folderName in self._folders[current]:
+            return False
+        self._folders[current].add(folderName)
+        self._folders[current + (folderName,)] = set()
+        return True
+
+    def OpenFolder(self, folderName):
+        if folderName not in self._folders[tuple(self._folder_path)]:
+            return False
+        self._folder_path.append(folderName)
+        return True
+
+
+class FakeMediaStorage(FakeObject):
+    def __init__(self, stats, resolve):
+        super().__init__(stats)
+        self._resolve = resolve
+
+    def GetMountedVolumeList(self):
+        return ["/"]
+
+    def GetSubFolderList(self, folderPath):
+        return [
+            os.path.join(folderPath, name)
+            for name in sorted(os.listdir(folderPath))
+            if os.path.isdir(os.path.join(folderPath, name))
+        ]
+
+    def GetFileList(self, folderPath):
+        return [
+            os.path.join(folderPath, name)
+            for name in sorted(os.listdir(folderPath))
+            if os.path.isfile(os.path.join(folderPath, name))
+        ]
+
+    def AddItemListToMediaPool(self, *items):
+        if len(items) == 1 and isinstance(items[0], list):
+            items = items[0]
+        project = self._resolve._project_manager._current_project
+        return project._media_pool._import_media(list(items))
+
+
+class FakeFusion(FakeObject):
+    def GetCurrentComp(self):
+        return None
+
+
+class FakeResolve(FakeObject):
+    """Fake `Resolve` application object.
+
+    Args:
+        latency (float)[optional]: seconds each API call takes
+        latencies (dict)[optional]: latency override per call name
+        media_exists (callable)[optional]: returns whether a media path
+            can be imported, all media exist by default
+    """
+
+    def __init__(self, latency=0.0, latencies=None, media_exists=None):
+        super().__init__(CallStats(latency, latencies))
+        self.media_exists = media_exists or (lambda path: True)
+        self._page = "edit"
+        self._project_manager = FakeProjectManager(self._stats, self)
+        self._media_storage = FakeMediaStorage(self._stats, self)
+        self._fusion = FakeFusion(self._stats)
+
+    @property
+    def stats(self):
+        return self._stats
+
+    def GetProjectManager(self):
+        return self._project_manager
+
+    def GetMediaStorage(self):
+        return self._media_storage
+
+    def Fusion(self):
+        return self._fusion
+
+    def GetCurrentPage(self):
+        return self._page
+
+    def OpenPage(self, pageName):
+        self._page = pageName
+        return True
+
+    def GetProductName(self):
+        return "DaVinci Resolve"
+
+    def GetVersion(self):
+        return [19, 0, 0, 0, ""]
+
+    def GetVersionString(self):
+        return "19.0.0"
+
+
+def get_media_properties(file_path, start_index=None, end_index=None):
+    """Return clip properties Resolve reports for imported media.
+
+    Args:
+        file_path (str): path to the media, sequences with `%0Nd` padding
+        start_index (int)[optional]: first frame of a sequence
+        end_index (int)[optional]: last frame of a sequence
+
+    Returns:
+        dict[str, str]: clip properties
+    """
+    dirname, file_name = os.path.split(file_path)
+    ext = os.path.splitext(file_name)[1].lower()
+    padding = re.search(r"%0?(\d*)d", file_name)
+
+    if padding and start_index is not None:
+        # Resolve shows sequences as `name.[1001-1100].exr`
+        padding_length = int(padding.group(1) or 1)
+        frame_range = "[{}-{}]".format(
+            str(start_index).zfill(padding_length),
+            str(end_index).zfill(padding_length)
+        )
+        file_name = "{}{}{}".format(
+            file_name[:padding.start()],
+            frame_range,
+            file_name[padding.end():]
+        )
+        start, end = int(start_index), int(end_index)
+    else:
+        start, end = 0, 99
+
+    frames = end - start + 1
+    media_type = "Audio" if ext in AUDIO_EXTENSIONS else "Video"
+    properties = {
+        "Clip Name": file_name,
+        "File Name": file_name,
+        "File Path": os.path.join(dirname, file_name),
+        "Type": media_type,
+        "Start": str(start),
+        "End": str(end),
+        "Frames": str(frames),
+        "FPS": "24",
+        "Duration": frames_to_timecode(frames, 24),
+        "Resolution": "1920x1080",
+        "PAR": "Square",
+        "Input Color Space": "Project",
+        "Audio Ch": "2" if media_type == "Audio" else "0",
+    }
+    return properties
+
+
+def frames_to_timecode(frames, fps):
+    fps = int(round(fps))
+    return "{:02d}:{:02d}:{:02d}:{:02d}".format(
+        frames // (3600 * fps),
+        frames // (60 * fps) % 60,
+        frames // fps % 60,
+        frames % fps
+    )
+
+
+def timecode_to_frames(timecode, fps):
+    fps = int(round(fps))
+    hours, minutes, seconds, frames = (
+        int(part) for part in re.split("[:;]", timecode))
+    return ((hours * 60 + minutes) * 60 + seconds) * fps + frames
+
+
+def create_scripting_module(resolve):
+    """Return module standing in for `DaVinciResolveScript`."""
+    module = types.ModuleType("DaVinciResolveScript")
+
+    def scriptapp(app_name):
+        if app_name == "Resolve":
+            return resolve
+        if app_name == "Fusion":
+            return resolve.Fusion()
+        return None
+
+    module.scriptapp = scriptapp
+    return module
+
+
+def install(resolve):
+    """Make the AYON Resolve integration use the fake Resolve.
+
+    Caches of `lib` and `pipeline` are cleared as they may hold objects
+    of a previously installed Resolve.
+
+    Args:
+        resolve (FakeResolve): the fake Resolve to use
+    """
+    from ayon_resolve import api
+
+    api.bmdvr = resolve
+    api.bmdvf = resolve.Fusion()
+    sys.modules["DaVinciResolveScript"] = create_scripting_module(resolve)
+    _clear_caches()
+
+
+@contextlib.contextmanager
+def installed(resolve):
+    """Context manager installing the fake Resolve temporarily."""
+    from ayon_resolve import api
+
+    previous = (
+        api.bmdvr,
+        api.bmdvf,
+        sys.modules.get("DaVinciResolveScript")
+    )
+    install(resolve)
+    try:
+        yield resolve
+    finally:
+        api.bmdvr, api.bmdvf, scripting_module = previous
+        if scripting_module is None:
+            sys.modules.pop("DaVinciResolveScript", None)
+        else:
+            sys.modules["DaVinciResolveScript"] = scripting_module
+        _clear_caches()
+
+
+def _clear_caches():
+    from . import lib, pipeline, workio
+
+    lib.project_manager = None
+    lib.media_storage = None
+    lib.tag_cache.clear()
+    lib.bin_path_cache.clear()
+    lib.media_pool_index.clear()
+    lib.clip_usage_index.clear()
+    lib.last_version_cache.clear()
+    pipeline.media_pool_containers.clear()
+    workio.saved_fingerprint = None
@@ -0,0 +1,235 @@
+"""Queue of jobs running in the background of the AYON tools.
+
+Calls through the Resolve scripting bridge must not run concurrently, so
+a job is split into two parts:
+    - `Job.prepare` runs in a worker thread and does the work which does
+      not touch Resolve, like resolving paths, formatting anatomy templates
+      or querying the server. Jobs are prepared concurrently.
+    - `Job.iter_steps` makes the Resolve API calls in small steps. Steps
+      run one at a time on the main thread from the Qt event loop, so all
+      bridge calls stay serialized on the thread the tools use and the UI
+      is responsive in between the steps.
+
+Without a running Qt application jobs are run right away, see `run_job`.
+"""
+import sys
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+from qtpy import QtCore, QtWidgets
+
+from ayon_core.lib import Logger
+
+log = Logger.get_logger(__name__)
+
+self = sys.modules[__name__]
+self.job_queue = None
+
+_job_ids = itertools.count(1)
+
+
+class Job:
+    """Job of the `JobQueue`.
+
+    Subclasses implement `prepare` which must not call the Resolve API and
+    `iter_steps` which yields the number of finished work units after each
+    step. Errors are raised as usual and reported by the queue.
+    """
+
+    label = "Job"
+
+    def __init__(self):
+        self.id = next(_job_ids)
+        self.done = 0
+        self.total = 0
+        self.cancelled = False
+        self.error = None
+
+    def prepare(self):
+        pass
+
+    def iter_steps(self):
+        yield self.total
+
+    def can_merge(self, other):
+        """Return whether other job not started yet can be merged in.
+
+        Jobs returning True must implement `merge`.
+        """
+        return False
+
+    def merge(self, other):
+        """Merge other job into this one.
+
+        Called only if `can_merge` returned True for the other job, which
+        is then finished together with this job.
+        """
+        pass
+
+
+def run_job(job):
+    """Run job right away in the current thread."""
+    job.prepare()
+    for done in job.iter_steps():
+        job.done = done
+
+
+class JobQueue(QtCore.QObject):
+    """Queue running jobs in the background of the Qt event loop.
+
+    All methods must be called from the main thread.
+
+    Args:
+        max_workers (int)[optional]: number of threads preparing jobs
+        parent (QtCore.QObject)[optional]: parent object
+    """
+
+    job_added = QtCore.Signal(object)
+    job_progress = QtCore.Signal(object)
+    job_finished = QtCore.Signal(object)
+
+    # wait between polls of jobs being prepared, in milliseconds
+    poll_interval = 20
+
+    def __init__(self, max_workers=4, parent=None):
+        super(JobQueue, self).__init__(parent)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="ayon-resolve-job"
+        )
+        # jobs in order with their prepare future, None if not started
+        self._pending = []
+        self._current = None
+        self._steps = None
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.timeout.connect(self._process)
+
+    def submit(self, job):
+        """Add job to the queue.
+
+        Jobs submitted right after each other, e.g. by the loader for each
+        selected representation, are merged if the job allows it.
+        """
+        self._pending.append([job, None])
+        self.job_added.emit(job)
+        self._timer.start(0)
+
+    def get_jobs(self):
+        """Return the running job followed by the pending jobs."""
+        jobs = [job for job, _ in self._pending]
+        if self._current is not None:
+            jobs.insert(0, self._current)
+        return jobs
+
+    def is_busy(self):
+        return bool(self._pending) or self._current is not None
+
+    def cancel(self, job=None):
+        """Cancel the job, or all jobs if not specified.
+
+        The running job is stopped before its next step.
+        """
+        for entry in list(self._pending):
+            pending_job, future = entry
+            if job is not None and pending_job is not job:
+                continue
+            pending_job.cancelled = True
+            if future is not None:
+                future.cancel()
+            self._pending.remove(entry)
+            self.job_finished.emit(pending_job)
+
+        if self._current is not None and job in (None, self._current):
+            self._current.cancelled = True
+
+    def _merge_pending(self):
+        merged = []
+        for entry in self._pending:
+            job, future = entry
+            if (
+                merged
+                and future is None
+                and merged[-1][1] is None
+                and merged[-1][0].can_merge(job)
+            ):
+                merged[-1][0].merge(job)
+                # merged job finishes together with the job it is merged to
+                continue
+            merged.append(entry)
+        self._pending = merged
+
+    def _process(self):
+        self._merge_pending()
+        for entry in self._pending:
+            if entry[1] is None:
+                entry[1] = self._executor.submit(entry[0].prepare)
+
+        if self._current is None:
+            if not self._pending:
+                self._timer.stop()
+                return
+
+            job, future = self._pending[0]
+            if not future.done():
+                self._timer.start(self.poll_interval)
+                return
+
+            self._pending.pop(0)
+            error = future.exception()
+            if error is not None:
+                self._finish(job, error)
+                return
+
+            self._current = job
+            self._steps = job.iter_steps()
+            self.job_progress.emit(job)
+            self._timer.start(0)
+            return
+
+        job = self._current
+        if job.cancelled:
+            self._steps.close()
+            self._finish(job)
+            return
+
+        try:
+            job.done = next(self._steps)
+        except StopIteration:
+            self._finish(job)
+            return
+        except Exception as error:
+            self._finish(job, error)
+            return
+        self.job_progress.emit(job)
+
+    def _finish(self, job, error=None):
+        if job is self._current:
+            self._current = None
+            self._steps = None
+
+        if error is not None:
+            job.error = error
+            log.error(
+                "Job '{}' failed: {}".format(job.label, error),
+                exc_info=error
+            )
+        elif job.cancelled:
+            log.info("Job '{}' was cancelled.".format(job.label))
+        self.job_finished.emit(job)
+        self._timer.start(0)
+
+
+def is_available():
+    """Return whether jobs can run in the background."""
+    return QtWidgets.QApplication.instance() is not None
+
+
+def get_job_queue():
+    """Return the job queue, it is created on first call.
+
+    Must be called from the main thread.
+    """
+    if self.job_queue is None:
+        self.job_queue = JobQueue(parent=QtWidgets.QApplication.instance())
+    return self.job_queue
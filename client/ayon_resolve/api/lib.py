@@ -2,7 +2,14 @@ import sys
 import json
 import re
 import os
+import copy
+import time
+import bisect
+import datetime
 import contextlib
+from collections import namedtuple
+import ayon_api
+import opentimelineio as otio
 from opentimelineio import opentime
 
 from ayon_core.lib import Logger
@@ -12,6 +19,8 @@ from ayon_core.pipeline.editorial import (
 )
 
 from ..otio import davinci_export as otio_export
+from .profiler import profiler
+from .path_probe import path_probe
 
 log = Logger.get_logger(__name__)
 
@@ -33,7 +42,8 @@ self.pype_tag_name = "VFX Notes"
 self.pype_marker_name = "OpenPypeData"
 self.pype_marker_duration = 1
 self.pype_marker_color = "Mint"
-self.temp_marker_frame = None
+# custom data of the marker to find it without scanning all markers
+self.pype_marker_custom_data = "AYON_marker"
 
 # OpenPype default timeline
 self.pype_timeline_name = "OpenPypeTimeline"
@@ -76,14 +86,16 @@ def maintain_current_timeline(to_timeline: object,
 def get_project_manager():
     from . import bmdvr
     if not self.project_manager:
-        self.project_manager = bmdvr.GetProjectManager()
+        self.project_manager = profiler.wrap(
+            bmdvr.GetProjectManager(), "ProjectManager")
     return self.project_manager
 
 
 def get_media_storage():
     from . import bmdvr
     if not self.media_storage:
-        self.media_storage = bmdvr.GetMediaStorage()
+        self.media_storage = profiler.wrap(
+            bmdvr.GetMediaStorage(), "MediaStorage")
     return self.media_storage
 
 
@@ -155,6 +167,9 @@ def create_bin(name: str,
     If the input name is with forward or backward slashes then it will create
     all parents and return the last child bin object
 
+    Folders are looked up through `bin_path_cache` so repeated calls for
+    the same or neighbouring paths don't list the folder tree again.
+
     Args:
         name (str): name of folder / bin, or hierarchycal name "parent/name"
         root (resolve.Folder)[optional]: root folder / bin object
@@ -168,32 +183,488 @@ def create_bin(name: str,
     media_pool = get_current_project().GetMediaPool()
     root_bin = root or media_pool.GetRootFolder()
 
-    # create hierarchy of bins in case there is slash in name
-    if "/" in name.replace("\\", "/"):
-        child_bin = None
-        for bname in name.split("/"):
-            child_bin = create_bin(bname,
-                                   root=child_bin or root_bin,
-                                   set_as_current=set_as_current)
-        if child_bin:
-            return child_bin
-    else:
-        # Find existing folder or create it
-        for subfolder in root_bin.GetSubFolderList():
-            if subfolder.GetName() == name:
-                created_bin = subfolder
+    created_bin = self.bin_path_cache.get_folder(media_pool, root_bin, name)
+
+    # only the resulting bin is set as current, not the parents
+    if created_bin and set_as_current:
+        media_pool.SetCurrentFolder(created_bin)
+
+    return created_bin
+
+
+class BinPathCache:
+    """Cache of media pool folders by their bin path.
+
+    Resolving a bin path like `Loader/shots/sh010` requires listing the
+    subfolders of every level and querying all their names through the
+    scripting bridge. The cache keeps a trie of the known folders per root
+    folder which is filled lazily, the subfolders of each folder are
+    listed only once and folders created by the cache are added to the
+    trie directly.
+
+    A folder missing in the trie is looked for again only if the count of
+    subfolders changed since they were listed, e.g. when a bin was added
+    in Resolve. Only the resulting folder is validated with a `GetName()`
+    call, and the parent of a folder about to be created. A folder which
+    fails the validation is looked up again in its parent, and if that
+    fails too the cached folders of the root are dropped and the path is
+    resolved again. A deleted folder is expected to fail the validation
+    as well, its name is not readable.
+    """
+
+    def __init__(self):
+        # root folder unique id -> trie node
+        self._roots = {}
+
+    @staticmethod
+    def split_path(path: str) -> list:
+        return [part for part in path.replace("\\", "/").split("/") if part]
+
+    @staticmethod
+    def _new_node(folder: object, name: str = None) -> dict:
+        # children are None until the subfolders of the folder are listed,
+        # count is the number of subfolders when listed or added since
+        return {"folder": folder, "name": name, "children": None, "count": 0}
+
+    def get_folder(self, media_pool: object, root: object, path: str):
+        """Return folder of the bin path, create missing folders.
+
+        Args:
+            media_pool (resolve.MediaPool): media pool of the project
+            root (resolve.Folder): folder the path is relative to
+            path (str): bin path, e.g. "parent/name"
+
+        Returns:
+            Union[resolve.Folder, None]: the folder or None if it could not
+                be created
+        """
+        root_id = root.GetUniqueId()
+        folder = self._get_folder(media_pool, root, root_id, path)
+        if folder is False:
+            # cached folders are stale, resolve the path again
+            self._roots.pop(root_id, None)
+            folder = self._get_folder(media_pool, root, root_id, path)
+        return folder or None
+
+    def _get_folder(self, media_pool, root, root_id, path):
+        """Return folder, None if it failed or False if cache is stale."""
+        node = self._roots.get(root_id)
+        if node is None:
+            node = self._roots[root_id] = self._new_node(root)
+
+        parent = None
+        cached = False
+        for part in self.split_path(path):
+            parent = node
+            node, cached = self._get_child(media_pool, parent, part)
+            if not node:
+                return node
+
+        # folder may be renamed or deleted in Resolve since cached
+        if not cached or node["folder"].GetName() == node["name"]:
+            return node["folder"]
+
+        # look the folder up again in its parent
+        if not self._is_valid(parent):
+            return False
+        parent["children"] = None
+        node, _ = self._get_child(media_pool, parent, node["name"])
+        return node["folder"] if node else node
+
+    def _get_child(self, media_pool, node, name):
+        """Return child node of the name, the folder is created if missing.
+
+        Returns:
+            tuple[Union[dict, None, bool], bool]: child node, None if the
+                folder could not be created or False if the folder of the
+                node no longer exists, and whether the child node was taken
+                from the cache without listing or creating it
+        """
+        children = node["children"]
+        if children is not None and name in children:
+            return children[name], True
+
+        subfolders = node["folder"].GetSubFolderList()
+        if subfolders is None:
+            return False, False
+
+        if children is None or len(subfolders) != node["count"]:
+            children = self._list_children(node, subfolders)
+            if name in children:
+                return children[name], False
+
+        elif not self._is_valid(node):
+            # do not create the folder under a renamed folder
+            return False, False
+
+        folder = media_pool.AddSubFolder(node["folder"], name)
+        if not folder:
+            log.warning("Failed to create media pool bin: {}".format(name))
+            return None, False
+        child = children[name] = self._new_node(folder, name)
+        node["count"] += 1
+        return child, False
+
+    @staticmethod
+    def _is_valid(node):
+        # root folders are passed in by the caller, they are not validated
+        return (
+            node["name"] is None
+            or node["folder"].GetName() == node["name"]
+        )
+
+    def _list_children(self, node, subfolders):
+        """(Re)list subfolders of the node.
+
+        Args:
+            node (dict): trie node
+            subfolders (list[resolve.Folder]): current subfolders of the
+                folder of the node
+
+        Returns:
+            dict: child nodes by folder name
+        """
+        children = {}
+        for subfolder in subfolders:
+            name = subfolder.GetName()
+            # first folder wins if there are more with same name
+            if name in children:
+                continue
+            children[name] = self._new_node(subfolder, name)
+        node["children"] = children
+        node["count"] = len(subfolders)
+        return children
+
+    def clear(self):
+        self._roots.clear()
+
+
+self.bin_path_cache = BinPathCache()
+
+
+class MediaPoolIndex:
+    """Index of media pool items per bin by their file paths.
+
+    Looking up a media pool item by file path requires querying the clip
+    properties of every clip in the bin through the scripting bridge. The
+    index is built once per bin with a single `GetClipProperty()` call per
+    clip and is kept up to date by the functions importing and deleting
+    media pool items.
+
+    Clips are indexed by:
+        - normalized file path of the first file
+        - file name of the first file
+        - sequence pattern (e.g. `plate.%04d.exr`) and first frame
+
+    Bins changed outside of the index are detected by their clip count and
+    get re-indexed on next lookup.
+    """
+
+    def __init__(self):
+        self._bins = {}
+        self._bin_id_by_item_id = {}
+
+    @staticmethod
+    def normalize_path(path: str) -> str:
+        return os.path.normcase(os.path.normpath(path)).replace("\\", "/")
+
+    @classmethod
+    def get_clip_keys(cls, clip_properties: dict) -> list:
+        """Return index keys for media pool item clip properties.
+
+        Args:
+            clip_properties (dict): result of `GetClipProperty()`
+
+        Returns:
+            list[tuple[str, Any]]: index type and key pairs
+        """
+        file_path = clip_properties.get("File Path") or ""
+        file_name = (
+            clip_properties.get("File Name") or os.path.basename(file_path))
+        if not file_name:
+            return []
+
+        first_file_name = get_reformated_path(file_name, first=True)
+        keys = [("name", first_file_name)]
+        if file_path:
+            dirname = os.path.dirname(file_path)
+            keys.append((
+                "path",
+                cls.normalize_path(os.path.join(dirname, first_file_name))
+            ))
+            first_frame = re.findall(r"\[(\d+)\-\d+\]", file_path)
+            if first_frame:
+                pattern = get_reformated_path(file_path, padded=True)
+                keys.append((
+                    "sequence",
+                    (cls.normalize_path(pattern), int(first_frame[0]))
+                ))
+        return keys
+
+    def _get_bin_index(self, folder: object) -> dict:
+        folder_id = folder.GetUniqueId()
+        clips = folder.GetClipList() or []
+        bin_index = self._bins.get(folder_id)
+        if bin_index is not None and bin_index["count"] == len(clips):
+            return bin_index
+
+        # (re)build the bin index
+        if bin_index is not None:
+            for item_id in bin_index["keys"]:
+                self._bin_id_by_item_id.pop(item_id, None)
+
+        bin_index = {
+            "count": 0,
+            "items": {},
+            "keys": {},
+        }
+        self._bins[folder_id] = bin_index
+        for clip in clips:
+            self._add_to_bin(folder_id, bin_index, clip)
+        return bin_index
+
+    def _add_to_bin(self, folder_id, bin_index, media_pool_item):
+        item_id = media_pool_item.GetUniqueId()
+        if item_id in bin_index["keys"]:
+            return
+
+        keys = self.get_clip_keys(media_pool_item.GetClipProperty() or {})
+        for key in keys:
+            bin_index["items"][key] = media_pool_item
+        bin_index["keys"][item_id] = keys
+        bin_index["count"] += 1
+        self._bin_id_by_item_id[item_id] = folder_id
+
+    def find(self, folder: object, filepath: str):
+        """Return media pool item in the bin matching the file path.
+
+        Args:
+            folder (resolve.Folder): media pool folder / bin
+            filepath (str): absolute path to a file
+
+        Returns:
+            Union[resolve.MediaPoolItem, None]: matching item if found
+        """
+        items = self._get_bin_index(folder)["items"]
+        return (
+            items.get(("path", self.normalize_path(filepath)))
+            or items.get(("name", os.path.basename(filepath)))
+        )
+
+    def find_sequence(
+            self, folder: object, path_pattern: str, first_frame: int):
+        """Return media pool item in the bin matching the image sequence.
+
+        Args:
+            folder (resolve.Folder): media pool folder / bin
+            path_pattern (str): sequence path with padding expression,
+                e.g. `/path/plate.%04d.exr`
+            first_frame (int): first frame of the sequence
+
+        Returns:
+            Union[resolve.MediaPoolItem, None]: matching item if found
+        """
+        items = self._get_bin_index(folder)["items"]
+        return items.get((
+            "sequence",
+            (self.normalize_path(path_pattern), int(first_frame))
+        ))
+
+    def add(self, folder: object, media_pool_items: list):
+        """Add newly imported media pool items to the bin index."""
+        folder_id = folder.GetUniqueId()
+        bin_index = self._bins.get(folder_id)
+        if bin_index is None:
+            # bin is not indexed yet, it will be built on first lookup
+            return
+
+        for media_pool_item in media_pool_items:
+            self._add_to_bin(folder_id, bin_index, media_pool_item)
+
+    def discard(self, media_pool_items: list):
+        """Remove deleted media pool items from the index."""
+        for media_pool_item in media_pool_items:
+            item_id = media_pool_item.GetUniqueId()
+            folder_id = self._bin_id_by_item_id.pop(item_id, None)
+            bin_index = self._bins.get(folder_id)
+            if bin_index is None:
+                continue
+
+            for key in bin_index["keys"].pop(item_id, []):
+                bin_index["items"].pop(key, None)
+            bin_index["count"] -= 1
+
+    def clear(self):
+        self._bins.clear()
+        self._bin_id_by_item_id.clear()
+
+
+self.media_pool_index = MediaPoolIndex()
+
+
+class ClipUsageIndex:
+    """Project wide index of timeline items per media pool item.
+
+    Finding where a media pool item is used requires visiting every item of
+    every track in every timeline of the project. This index collects all
+    of them in a single pass so lookups for many media pool items (e.g.
+    when removing many containers) share the same traversal, see
+    `find_many`.
+
+    An entry is trusted only while the number of indexed usages matches
+    the "Usage" clip property of the media pool item. Otherwise only the
+    usage of that media pool item is scanned again, stopping once all its
+    usages are found.
+    """
+
+    track_types = ("video", "audio")
+
+    def __init__(self):
+        self._project_id = None
+        # media pool item unique id -> list of (timeline, timeline item)
+        self._usage = None
+
+    def _iter_usage(self, project):
+        """Yield timeline items with their timeline and media pool item id.
+        """
+        for timeline_idx in range(project.GetTimelineCount()):
+            timeline = project.GetTimelineByIndex(timeline_idx + 1)
+            for track_type in self.track_types:
+                track_count = timeline.GetTrackCount(track_type) or 0
+                for track_idx in range(track_count):
+                    timeline_items = timeline.GetItemListInTrack(
+                        track_type, track_idx + 1) or []
+                    for timeline_item in timeline_items:
+                        media_pool_item = timeline_item.GetMediaPoolItem()
+                        if not media_pool_item:
+                            continue
+                        yield (
+                            timeline,
+                            timeline_item,
+                            media_pool_item.GetUniqueId()
+                        )
+
+    def _scan(self, project, unique_id, usage_count):
+        """Return usage of one media pool item, stop once all are found."""
+        usage = []
+        for timeline, timeline_item, item_id in self._iter_usage(project):
+            if item_id != unique_id:
+                continue
+            usage.append((timeline, timeline_item))
+            if len(usage) >= usage_count:
                 break
-        else:
-            created_bin = media_pool.AddSubFolder(root_bin, name)
+        return usage
+
+    def _is_built(self, project):
+        return (
+            self._usage is not None
+            and self._project_id == project.GetUniqueId()
+        )
+
+    def build(self, project: object = None):
+        """Collect usage of all media pool items in all timelines.
+
+        Args:
+            project (resolve.Project)[optional]: project to index
+        """
+        if project is None:
+            project = get_current_project()
+
+        usage = {}
+        for timeline, timeline_item, unique_id in self._iter_usage(project):
+            usage.setdefault(unique_id, []).append((timeline, timeline_item))
+
+        self._project_id = project.GetUniqueId()
+        self._usage = usage
+
+    def find(self, media_pool_item: object, project: object = None) -> list:
+        """Return all usages of the media pool item.
+
+        The index is not built for a single media pool item. Its usage is
+        scanned unless the index is built and up to date for it.
+
+        Args:
+            media_pool_item (resolve.MediaPoolItem): media pool item
+            project (resolve.Project)[optional]: project of the item
+
+        Returns:
+            list[tuple[resolve.Timeline, resolve.TimelineItem]]: timeline
+                with the timeline item using the media pool item
+        """
+        usage_count = int(media_pool_item.GetClipProperty("Usage") or 0)
+        if not usage_count:
+            return []
+
+        if project is None:
+            project = get_current_project()
+
+        unique_id = media_pool_item.GetUniqueId()
+        built = self._is_built(project)
+        usage = self._usage.get(unique_id, []) if built else []
+        if len(usage) != usage_count:
+            # not indexed or the item was used or unused since indexed
+            usage = self._scan(project, unique_id, usage_count)
+            if built:
+                self._usage[unique_id] = usage
+
+        return list(usage)
+
+    def find_many(
+        self, media_pool_items: list, project: object = None
+    ) -> list:
+        """Return usages of many media pool items.
+
+        The index is built first if needed, so all timelines are traversed
+        once for all the media pool items.
+
+        Args:
+            media_pool_items (list[resolve.MediaPoolItem]): media pool items
+            project (resolve.Project)[optional]: project of the items
+
+        Returns:
+            list[list[tuple[resolve.Timeline, resolve.TimelineItem]]]:
+                usages in order of the media pool items
+        """
+        if project is None:
+            project = get_current_project()
+
+        if len(media_pool_items) > 1 and not self._is_built(project):
+            self.build(project)
+
+        return [
+            self.find(media_pool_item, project)
+            for media_pool_item in media_pool_items
+        ]
+
+    def discard(self, media_pool_items: list):
+        """Forget usage of media pool items, e.g. after their removal."""
+        if self._usage is None:
+            return
+        for media_pool_item in media_pool_items:
+            self._usage.pop(media_pool_item.GetUniqueId(), None)
 
-        if set_as_current:
-            media_pool.SetCurrentFolder(created_bin)
+    def clear(self):
+        self._project_id = None
+        self._usage = None
 
-        return created_bin
+
+self.clip_usage_index = ClipUsageIndex()
+
+
+# bumped when the add-on imports or deletes media pool items, caches of the
+# whole media pool synchronize with it again once it changed
+self.media_pool_generation = 0
+
+
+def invalidate_media_pool():
+    """Mark the media pool as changed by the add-on."""
+    self.media_pool_generation += 1
 
 
 def remove_media_pool_item(media_pool_item: object) -> bool:
     media_pool = get_current_project().GetMediaPool()
+    self.media_pool_index.discard([media_pool_item])
+    invalidate_media_pool()
     return media_pool.DeleteClips([media_pool_item])
 
 
@@ -215,8 +686,10 @@ def create_media_pool_item(
     media_pool = get_current_project().GetMediaPool()
     root_bin = root or media_pool.GetRootFolder()
 
-    # make sure files list is not empty and first available file exists
-    filepath = next((f for f in files if os.path.isfile(f)), None)
+    # make sure files list is not empty and first available file exists,
+    # the directories are listed once instead of checking file by file
+    existing_files = path_probe.get_existing(files)
+    filepath = existing_files[0] if existing_files else None
     if not filepath:
         raise FileNotFoundError("No file found in input files list")
 
@@ -228,8 +701,12 @@ def create_media_pool_item(
 
     # add all data in folder to media pool
     media_pool_items = media_pool.ImportMedia(files)
+    if not media_pool_items:
+        return False
 
-    return media_pool_items.pop() if media_pool_items else False
+    self.media_pool_index.add(root_bin, media_pool_items)
+    invalidate_media_pool()
+    return media_pool_items.pop()
 
 
 def get_media_pool_item(filepath, root: object = None) -> object:
@@ -243,16 +720,11 @@ def get_media_pool_item(filepath, root: object = None) -> object:
     Returns:
         object: resolve.MediaPoolItem
     """
-    media_pool = get_current_project().GetMediaPool()
-    root = root or media_pool.GetRootFolder()
-    fname = os.path.basename(filepath)
-
-    for _mpi in root.GetClipList():
-        _mpi_name = _mpi.GetClipProperty("File Name")
-        _mpi_name = get_reformated_path(_mpi_name, first=True)
-        if fname in _mpi_name:
-            return _mpi
-    return None
+    if root is None:
+        media_pool = get_current_project().GetMediaPool()
+        root = media_pool.GetRootFolder()
+
+    return self.media_pool_index.find(root, filepath)
 
 
 def create_timeline_item(
@@ -329,37 +801,96 @@ def create_timeline_item(
     return output_timeline_item
 
 
+def create_timeline_items(
+        clip_infos: list,
+        timeline: object = None,
+) -> list:
+    """
+    Append multiple media pool items to timeline with a single call.
+
+    Args:
+        clip_infos (list[Union[dict, resolve.MediaPoolItem]]): media pool
+            items or clip info dicts as accepted by
+            `MediaPool.AppendToTimeline`, e.g. with "mediaPoolItem",
+            "startFrame", "endFrame", "trackIndex" and "recordFrame" keys
+        timeline (Optional[resolve.Timeline]): resolve's object
+
+    Returns:
+        list[resolve.TimelineItem]: created timeline items, failed clips
+            are logged and not included
+    """
+    if not clip_infos:
+        return []
+
+    media_pool = get_current_project().GetMediaPool()
+    timeline = timeline or get_current_timeline()
+
+    clip_infos = [
+        clip_info if isinstance(clip_info, dict)
+        else {"mediaPoolItem": clip_info}
+        for clip_info in clip_infos
+    ]
+
+    # if timeline was used then switch it to current timeline
+    with maintain_current_timeline(timeline):
+        timeline_items = media_pool.AppendToTimeline(clip_infos) or []
+
+    # Adding the item may fail whilst Resolve will still return a
+    # TimelineItem instance - however all `Get*` calls return None
+    output_timeline_items = [
+        timeline_item for timeline_item in timeline_items
+        if timeline_item and timeline_item.GetDuration() is not None
+    ]
+    if len(output_timeline_items) != len(clip_infos):
+        log.warning(
+            "Only {} of {} clips were added to the timeline: '{}'".format(
+                len(output_timeline_items),
+                len(clip_infos),
+                timeline.GetName()
+            )
+        )
+    return output_timeline_items
+
+
 def get_timeline_item(media_pool_item: object,
-                      timeline: object = None) -> object:
+                      timeline: object = None,
+                      snapshot: "TimelineSnapshot" = None) -> object:
     """
     Returns clips related to input mediaPoolItem.
 
     Args:
         media_pool_item (resolve.MediaPoolItem): resolve's object
         timeline (resolve.Timeline)[optional]: resolve's object
+        snapshot (TimelineSnapshot)[optional]: already collected snapshot
+            of the timeline
 
     Returns:
         object: resolve.TimelineItem
     """
+    if snapshot is None:
+        snapshot = TimelineSnapshot(timeline or get_current_timeline())
+
+    # timeline items created from the media pool item directly
+    matching = snapshot.get_items_by_media_pool_item_id(
+        media_pool_item.GetUniqueId())
+    if matching:
+        return matching[-1]["clip"]["item"]
+
     clip_name = media_pool_item.GetClipProperty("File Name")
     output_timeline_item = None
-    timeline = timeline or get_current_timeline()
-
-    with maintain_current_timeline(timeline):
-        # search the timeline for the added clip
 
-        for ti_data in get_current_timeline_items():
-            ti_clip_item = ti_data["clip"]["item"]
-            ti_media_pool_item = ti_clip_item.GetMediaPoolItem()
+    # search the timeline for the added clip
+    for ti_data in snapshot.get_items():
+        ti_media_pool_item = ti_data["clip"]["mediaPoolItem"]
 
-            # Skip items that do not have a media pool item, like for example
-            # an "Adjustment Clip" or a "Fusion Composition" from the effects
-            # toolbox
-            if not ti_media_pool_item:
-                continue
+        # Skip items that do not have a media pool item, like for example
+        # an "Adjustment Clip" or a "Fusion Composition" from the effects
+        # toolbox
+        if not ti_media_pool_item:
+            continue
 
-            if clip_name in ti_media_pool_item.GetClipProperty("File Name"):
-                output_timeline_item = ti_clip_item
+        if clip_name in ti_media_pool_item.GetClipProperty("File Name"):
+            output_timeline_item = ti_data["clip"]["item"]
 
     return output_timeline_item
 
@@ -381,72 +912,275 @@ def get_video_track_names() -> list:
     return tracks
 
 
+class TimelineItemClipData(dict):
+    """Clip data of a timeline item read from Resolve on first access.
+
+    The keys of `getters` are read through the scripting bridge when they
+    are accessed the first time and kept, so consumers of the clip data
+    pay only for the attributes they use.
+    """
+
+    getters = {
+        "name": lambda data: data["item"].GetName(),
+        "uniqueId": lambda data: data["item"].GetUniqueId(),
+        "color": lambda data: data["item"].GetClipColor(),
+        "start": lambda data: data["item"].GetStart(),
+        "end": lambda data: data["item"].GetEnd(),
+        "leftOffset": lambda data: data["item"].GetLeftOffset(),
+        "rightOffset": lambda data: data["item"].GetRightOffset(),
+        "mediaPoolItem": lambda data: data["item"].GetMediaPoolItem(),
+        "mediaPoolItemId": lambda data: (
+            data["mediaPoolItem"].GetUniqueId()
+            if data["mediaPoolItem"] else None
+        ),
+    }
+
+    def __missing__(self, key):
+        getter = self.getters.get(key)
+        if getter is None:
+            raise KeyError(key)
+        value = self[key] = getter(self)
+        return value
+
+    def get(self, key, default=None):
+        if key in self or key in self.getters:
+            return self[key]
+        return default
+
+
+class TimelineSnapshot:
+    """Snapshot of timeline items collected in a single pass.
+
+    Walking the timeline tracks through the scripting bridge is expensive,
+    because every `GetTrackName`, `GetItemListInTrack` or `GetClipColor`
+    call is a round trip into Resolve. The snapshot lists the items of
+    each track once and keeps the item attributes once they are read, see
+    `TimelineItemClipData`, so that multiple consumers can share a single
+    walk. Items of a track are listed on first request of the track.
+
+    The item data is the same dict structure as returned by
+    `get_current_timeline_items()` extended with the clip attributes.
+
+    Args:
+        timeline (resolve.Timeline)[optional]: timeline to collect from,
+            defaults to the current timeline (or any timeline available)
+        track_types (Iterable[str])[optional]: track types to list items
+            of eagerly. Other track types are listed on first request.
+
+    Example:
+        >>> snapshot = TimelineSnapshot()
+        >>> items = snapshot.get_items(selecting_color="Pink")
+        >>> item_data = snapshot.get_item_by_unique_id(unique_id)
+    """
+
+    def __init__(self, timeline: object = None, track_types=("video",)):
+        self.project = get_current_project()
+        self.timeline = (
+            timeline or
+            get_current_timeline() or
+            get_any_timeline() or
+            get_new_timeline()
+        )
+        # all listed items in order they were listed
+        self.items = []
+        # track type -> track index -> track name
+        self.track_names = {}
+
+        self._items_by_track_index = {}
+        # clip data key -> (value -> items, number of indexed items)
+        self._indexes = {}
+
+        for track_type in track_types:
+            self._collect(track_type)
+
+    def _get_track_indexes(self, track_type: str, track_name=None) -> list:
+        """Return indexes of tracks with name contained in `track_name`."""
+        track_names = self.track_names.get(track_type)
+        if track_names is None:
+            track_names = self.track_names[track_type] = {}
+            track_count = self.timeline.GetTrackCount(track_type)
+            for track_index in range(1, (int(track_count) + 1)):
+                track_names[track_index] = self.timeline.GetTrackName(
+                    track_type, track_index)
+
+        return [
+            track_index
+            for track_index, name in track_names.items()
+            if not track_name or name in track_name
+        ]
+
+    def _collect(self, track_type: str, track_name=None) -> list:
+        """List items of the tracks not listed yet.
+
+        Args:
+            track_type (str): track type
+            track_name (str)[optional]: only tracks with name contained in
+                this value are listed
+
+        Returns:
+            list[int]: indexes of the tracks in order
+        """
+        track_indexes = self._get_track_indexes(track_type, track_name)
+        for track_index in track_indexes:
+            key = (track_type, track_index)
+            if key in self._items_by_track_index:
+                continue
+
+            track_data = {
+                "name": self.track_names[track_type][track_index],
+                "index": track_index,
+                "type": track_type
+            }
+            timeline_items = self.timeline.GetItemListInTrack(
+                track_type, track_index) or []
+            items = self._items_by_track_index[key] = []
+            for clip_index, ti in enumerate(timeline_items):
+                item_data = {
+                    "project": self.project,
+                    "timeline": self.timeline,
+                    "track": track_data,
+                    "clip": TimelineItemClipData(item=ti, index=clip_index)
+                }
+                items.append(item_data)
+                self.items.append(item_data)
+        return track_indexes
+
+    def _get_index(self, key: str) -> dict:
+        """Return listed items by value of the clip data key.
+
+        Values are read only for items listed since the last call.
+        """
+        index, indexed_count = self._indexes.get(key, ({}, 0))
+        for item_data in self.items[indexed_count:]:
+            index.setdefault(item_data["clip"][key], []).append(item_data)
+        self._indexes[key] = (index, len(self.items))
+        return index
+
+    def get_items(
+            self,
+            track_type: str = None,
+            track_name: str = None,
+            selecting_color: str = None) -> list:
+        """Return item data filtered like `get_current_timeline_items()`.
+
+        Args:
+            track_type (str)[optional]: track type, defaults to "video"
+            track_name (str)[optional]: only tracks with name contained
+                in this value are returned
+            selecting_color (str)[optional]: only items with clip color
+                containing this value are returned
+
+        Returns:
+            list[dict]: timeline item data
+        """
+        track_type = track_type or "video"
+        return [
+            item_data
+            for track_index in self._collect(track_type, track_name)
+            for item_data in self._items_by_track_index[
+                (track_type, track_index)]
+            if (
+                not selecting_color
+                or selecting_color in item_data["clip"]["color"]
+            )
+        ]
+
+    def get_items_by_track(
+            self, track_name: str, track_type: str = "video") -> list:
+        """Return item data of the track with the exact name."""
+        return [
+            item_data
+            for track_index in self._collect(track_type, track_name)
+            if self.track_names[track_type][track_index] == track_name
+            for item_data in self._items_by_track_index[
+                (track_type, track_index)]
+        ]
+
+    def get_track_names(self, track_type: str = "video") -> dict:
+        """Return track names of the track type by track index."""
+        self._get_track_indexes(track_type)
+        return dict(self.track_names[track_type])
+
+    def get_items_by_track_index(
+            self, track_index: int, track_type: str = "video") -> list:
+        """Return item data of the track at the index in track order."""
+        self._collect(track_type)
+        return list(
+            self._items_by_track_index.get((track_type, track_index), []))
+
+    def get_items_by_color(self, color: str) -> list:
+        """Return item data of listed items with the exact clip color."""
+        return list(self._get_index("color").get(color, []))
+
+    def get_items_by_name(self, name: str) -> list:
+        """Return item data of listed items with the exact item name."""
+        return list(self._get_index("name").get(name, []))
+
+    def get_items_by_media_pool_item_id(self, unique_id: str) -> list:
+        """Return item data of listed items using the media pool item."""
+        if not unique_id:
+            return []
+        return list(self._get_index("mediaPoolItemId").get(unique_id, []))
+
+    def get_item_by_unique_id(self, unique_id: str):
+        """Return item data by timeline item unique id.
+
+        Returns:
+            Union[dict, None]: timeline item data if found
+        """
+        items = self._get_index("uniqueId").get(unique_id)
+        if items:
+            return items[-1]
+        return None
+
+
 def get_current_timeline_items(
         filter: bool = False,
         track_type: str = None,
         track_name: str = None,
-        selecting_color: str = None) -> list:
+        selecting_color: str = None,
+        snapshot: TimelineSnapshot = None) -> list:
     """ Gets all available current timeline track items
+
+    Args:
+        filter (bool)[optional]: whether to filter by `selecting_color`
+        track_type (str)[optional]: track type, defaults to "video"
+        track_name (str)[optional]: filter by track name
+        selecting_color (str)[optional]: clip color used for filtering,
+            defaults to "Chocolate"
+        snapshot (TimelineSnapshot)[optional]: reuse already collected
+            timeline snapshot instead of walking the timeline again
+
+    Returns:
+        list[dict]: timeline item data
     """
     track_type = track_type or "video"
     selecting_color = selecting_color or "Chocolate"
-    project = get_current_project()
-
-    # get timeline anyhow
-    timeline = (
-        get_current_timeline() or
-        get_any_timeline() or
-        get_new_timeline()
-    )
-    selected_clips = []
-
-    # get all tracks count filtered by track type
-    selected_track_count = timeline.GetTrackCount(track_type)
-
-    # loop all tracks and get items
-    _clips = {}
-    for track_index in range(1, (int(selected_track_count) + 1)):
-        _track_name = timeline.GetTrackName(track_type, track_index)
-
-        # filter out all unmathed track names
-        if track_name and _track_name not in track_name:
-            continue
 
-        timeline_items = timeline.GetItemListInTrack(
-            track_type, track_index)
-        _clips[track_index] = timeline_items
+    if snapshot is None:
+        # only the tracks matching the filter are listed
+        snapshot = TimelineSnapshot(track_types=())
 
-        _data = {
-            "project": project,
-            "timeline": timeline,
-            "track": {
-                "name": _track_name,
-                "index": track_index,
-                "type": track_type}
-        }
-        # get track item object and its color
-        for clip_index, ti in enumerate(_clips[track_index]):
-            data = _data.copy()
-            data["clip"] = {
-                "item": ti,
-                "index": clip_index
-            }
-            ti_color = ti.GetClipColor()
-            if filter and selecting_color in ti_color or not filter:
-                selected_clips.append(data)
-    return selected_clips
+    return snapshot.get_items(
+        track_type=track_type,
+        track_name=track_name,
+        selecting_color=selecting_color if filter else None
+    )
 
 
-def get_pype_timeline_item_by_name(name: str) -> object:
+def get_pype_timeline_item_by_name(
+        name: str, snapshot: TimelineSnapshot = None) -> object:
     """Get timeline item by name.
 
     Args:
         name (str): name of timeline item
+        snapshot (TimelineSnapshot)[optional]: already collected snapshot
+            of the current timeline
 
     Returns:
         object: resolve.TimelineItem
     """
-    for _ti_data in get_current_timeline_items():
+    for _ti_data in get_current_timeline_items(snapshot=snapshot):
         _ti_clip = _ti_data["clip"]["item"]
         tag_data = get_timeline_item_pype_tag(_ti_clip)
         tag_name = tag_data.get("namespace")
@@ -457,6 +1191,270 @@ def get_pype_timeline_item_by_name(name: str) -> object:
     return None
 
 
+class TimelineItemTagCache:
+    """Write-through cache of parsed AYON tag data per timeline item.
+
+    Reading the tag requires fetching all markers of the timeline item
+    through the scripting bridge and parsing the json note. The cache keeps
+    the parsed data by the timeline item unique id so that repeated reads
+    of the same item (e.g. on imprint or during collecting) are free.
+
+    The cache is filled by the getter and updated by the setter functions
+    of this module. It is only used for the marker workflow.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, unique_id: str):
+        """Return copy of cached tag data or None if not cached."""
+        tag_data = self._data.get(unique_id)
+        if tag_data is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return copy.deepcopy(tag_data)
+
+    def set(self, unique_id: str, tag_data: dict):
+        self._data[unique_id] = copy.deepcopy(tag_data)
+
+    def invalidate(self, unique_id: str):
+        self._data.pop(unique_id, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """Return cache counters.
+
+        Returns:
+            dict: with `hits`, `misses` and `size` keys
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+        }
+
+
+self.tag_cache = TimelineItemTagCache()
+
+
+class LastVersionCache:
+    """Session cache of the last version id per product.
+
+    Clip coloring needs to know whether a loaded version is the latest
+    version of its product. Querying that per item makes one server request
+    for each loaded clip, so the last versions are instead queried in bulk
+    and kept for `ttl` seconds.
+
+    Callers updating many containers at once, e.g. the "Update to Latest"
+    inventory action, fill the cache first with `cache_representations`.
+    """
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        # (project_name, product_id) -> (timestamp, last version id)
+        self._entries = {}
+
+    def _get_entry(self, project_name: str, product_id: str):
+        entry = self._entries.get((project_name, product_id))
+        if entry is None:
+            return None
+        timestamp, last_version_id = entry
+        if time.time() - timestamp > self.ttl:
+            self._entries.pop((project_name, product_id), None)
+            return None
+        return entry
+
+    def is_cached(self, project_name: str, product_id: str) -> bool:
+        return self._get_entry(project_name, product_id) is not None
+
+    def get_last_version_ids(
+        self, project_name: str, product_ids: list
+    ) -> dict:
+        """Return last version id per product id.
+
+        Products missing in the cache are queried with a single request.
+
+        Args:
+            project_name (str): project name
+            product_ids (Iterable[str]): product ids
+
+        Returns:
+            dict[str, Union[str, None]]: last version id by product id,
+                None for products without versions
+        """
+        result = {}
+        missing = set()
+        for product_id in product_ids:
+            entry = self._get_entry(project_name, product_id)
+            if entry is None:
+                missing.add(product_id)
+            else:
+                result[product_id] = entry[1]
+
+        if missing:
+            last_versions = ayon_api.get_last_versions(
+                project_name, product_ids=missing, fields={"id"}
+            )
+            queried = {}
+            for product_id in missing:
+                version = last_versions.get(product_id)
+                queried[product_id] = version["id"] if version else None
+            self.update(project_name, queried)
+            result.update(queried)
+        return result
+
+    def get_latest_version_ids(
+        self, project_name: str, version_entities: list
+    ) -> set:
+        """Return ids of the versions which are the last of their product.
+
+        A version which is not the cached last version of its product is
+        outdated, unless it was published after the product was cached.
+        Products of such versions, or of versions without known creation
+        time, are queried again.
+
+        Args:
+            project_name (str): project name
+            version_entities (Iterable[dict]): versions with `id` and
+                `productId`
+
+        Returns:
+            set[str]: ids of the versions which are the last versions
+        """
+        version_entities = list(version_entities)
+        product_ids = {
+            version_entity["productId"] for version_entity in version_entities
+        }
+        cached_times = {}
+        for product_id in product_ids:
+            entry = self._get_entry(project_name, product_id)
+            if entry is not None:
+                cached_times[product_id] = entry[0]
+        last_version_ids = self.get_last_version_ids(
+            project_name, product_ids)
+
+        outdated = set()
+        for version_entity in version_entities:
+            product_id = version_entity["productId"]
+            cached_time = cached_times.get(product_id)
+            if (
+                cached_time is None
+                or last_version_ids[product_id] == version_entity["id"]
+            ):
+                continue
+            created_time = _get_entity_created_time(version_entity)
+            if created_time is None or created_time >= cached_time:
+                outdated.add(product_id)
+        if outdated:
+            self.invalidate(project_name, outdated)
+            last_version_ids.update(
+                self.get_last_version_ids(project_name, outdated))
+
+        return {
+            version_entity["id"]
+            for version_entity in version_entities
+            if last_version_ids[version_entity["productId"]]
+            == version_entity["id"]
+        }
+
+    def is_latest(self, project_name: str, version_entity: dict) -> bool:
+        """Return whether version entity is the last version of its product.
+        """
+        return version_entity["id"] in self.get_latest_version_ids(
+            project_name, [version_entity])
+
+    def cache_representations(
+        self, project_name: str, representation_ids: list
+    ):
+        """Cache last versions of the products of the representations.
+
+        This resolves the products of many representations (e.g. of all
+        loaded containers) with a fixed number of requests so following
+        lookups for any of them are served from the cache.
+
+        Args:
+            project_name (str): project name
+            representation_ids (Iterable[str]): representation ids
+        """
+        representation_ids = set(representation_ids)
+        if not representation_ids:
+            return
+
+        version_ids = {
+            repre["versionId"]
+            for repre in ayon_api.get_representations(
+                project_name,
+                representation_ids=representation_ids,
+                fields={"versionId"}
+            )
+        }
+        if not version_ids:
+            return
+
+        product_ids = {
+            version["productId"]
+            for version in ayon_api.get_versions(
+                project_name,
+                version_ids=version_ids,
+                fields={"productId"}
+            )
+        }
+        self.get_last_version_ids(project_name, product_ids)
+
+    def update(self, project_name: str, last_version_ids: dict):
+        """Store known last version ids, e.g. right after publishing.
+
+        Args:
+            project_name (str): project name
+            last_version_ids (dict[str, Union[str, None]]): last version id
+                by product id
+        """
+        timestamp = time.time()
+        for product_id, last_version_id in last_version_ids.items():
+            self._entries[(project_name, product_id)] = (
+                timestamp, last_version_id)
+
+    def invalidate(self, project_name: str, product_ids=None):
+        """Drop cached products of a project, all of them if not specified.
+        """
+        for key in list(self._entries):
+            if key[0] != project_name:
+                continue
+            if product_ids is None or key[1] in product_ids:
+                del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+
+def _get_entity_created_time(entity):
+    """Return creation time of the entity in seconds since epoch.
+
+    Returns:
+        Union[float, None]: creation time, None if unknown
+    """
+    created_at = entity.get("createdAt")
+    if not created_at:
+        return None
+    try:
+        created = datetime.datetime.fromisoformat(
+            created_at.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if created.tzinfo is None:
+        created = created.replace(tzinfo=datetime.timezone.utc)
+    return created.timestamp()
+
+
+self.last_version_cache = LastVersionCache()
+
+
 def get_timeline_item_pype_tag(timeline_item):
     """
     Get openpype track item tag created by creator or loader plugin.
@@ -470,7 +1468,16 @@ def get_timeline_item_pype_tag(timeline_item):
     return_tag = None
 
     if self.pype_marker_workflow:
-        return_tag = get_pype_marker(timeline_item)
+        unique_id = timeline_item.GetUniqueId()
+        return_tag = self.tag_cache.get(unique_id)
+        if return_tag is None:
+            marker = find_pype_marker(timeline_item)
+            if marker:
+                return_tag = marker.data
+                self.tag_cache.set(unique_id, marker.data)
+            else:
+                return_tag = dict()
+                self.tag_cache.set(unique_id, return_tag)
     else:
         media_pool_item = timeline_item.GetMediaPoolItem()
 
@@ -508,6 +1515,7 @@ def set_timeline_item_pype_tag(timeline_item, data=None):
 
         tag_data.update(data)
         set_pype_marker(timeline_item, tag_data)
+        self.tag_cache.set(timeline_item.GetUniqueId(), tag_data)
     else:
         if tag_data:
             media_pool_item = timeline_item.GetMediaPoolItem()
@@ -541,12 +1549,41 @@ def imprint(timeline_item, data=None):
             'productName': 'productMain'
         }
     """
-    data = data or {}
+    _imprint_publish_tag(timeline_item, data or {})
+
+
+def imprint_many(items_with_data, clip_color=None):
+    """Imprint publish data into multiple timeline items in one pass.
+
+    The final tag data including the `publish` attribute is built in memory
+    so each timeline item gets a single marker write and a single clip
+    color write.
+
+    Arguments:
+        items_with_data (Iterable[Tuple[resolve.TimelineItem, dict]]):
+            timeline items with data to be imprinted
+        clip_color (str)[optional]: clip color to set on the imprinted
+            timeline items, defaults to `publish_clip_color`
+
+    Returns:
+        list[dict]: imprinted tag data in order of the input items
+    """
+    clip_color = clip_color or self.publish_clip_color
 
-    set_timeline_item_pype_tag(timeline_item, data)
+    imprinted = []
+    for timeline_item, data in items_with_data:
+        tag_data = _imprint_publish_tag(timeline_item, data or {})
+        timeline_item.SetClipColor(clip_color)
+        imprinted.append(tag_data)
 
-    # add publish attribute
-    set_publish_attribute(timeline_item, True)
+    return imprinted
+
+
+def _imprint_publish_tag(timeline_item, data):
+    """Write the tag data with publish attribute with single tag write."""
+    data = dict(data)
+    data["publish"] = True
+    return set_timeline_item_pype_tag(timeline_item, data)
 
 
 def set_publish_attribute(timeline_item, value):
@@ -579,37 +1616,102 @@ def set_pype_marker(timeline_item, tag_data):
     frame = int(source_start + (item_duration / 2))
 
     # marker attributes
-    frameId = (frame / 10) * 10
     color = self.pype_marker_color
     name = self.pype_marker_name
     note = json.dumps(tag_data)
     duration = (self.pype_marker_duration / 10) * 10
 
-    timeline_item.AddMarker(
-        frameId,
+    # Resolve does not add the marker at a frame with another marker, use
+    # the free frame of the item closest to its middle then
+    first_frame = int(source_start)
+    last_frame = first_frame + max(int(item_duration), 1) - 1
+    occupied = {
+        int(marker_frame)
+        for marker_frame in (timeline_item.GetMarkers() or {})
+    }
+    candidates = sorted(
+        range(first_frame, last_frame + 1),
+        key=lambda candidate: abs(candidate - frame)
+    )
+    marker_frame = next(
+        (
+            candidate for candidate in candidates
+            if candidate not in occupied
+        ),
+        frame
+    )
+
+    if not timeline_item.AddMarker(
+        marker_frame,
         color,
         name,
         note,
-        duration
-    )
+        duration,
+        self.pype_marker_custom_data
+    ):
+        log.warning(
+            "Failed to add AYON marker to: {}".format(
+                timeline_item.GetName()))
 
 
-def get_pype_marker(timeline_item):
+PypeMarker = namedtuple("PypeMarker", ["frame", "data"])
+
+
+def find_pype_marker(timeline_item):
+    """Return the AYON marker of the timeline item.
+
+    Args:
+        timeline_item (resolve.TimelineItem): resolve object
+
+    Returns:
+        Union[PypeMarker, None]: marker frame with parsed marker data
+    """
     timeline_item_markers = timeline_item.GetMarkers()
     for marker_frame, marker in timeline_item_markers.items():
         color = marker["color"]
         name = marker["name"]
         if name == self.pype_marker_name and color == self.pype_marker_color:
             note = marker["note"]
-            self.temp_marker_frame = marker_frame
-            return json.loads(note)
+            return PypeMarker(marker_frame, json.loads(note))
+
+    return None
+
 
+def get_pype_marker(timeline_item):
+    marker = find_pype_marker(timeline_item)
+    if marker:
+        return marker.data
     return dict()
 
 
-def delete_pype_marker(timeline_item):
-    timeline_item.DeleteMarkerAtFrame(self.temp_marker_frame)
-    self.temp_marker_frame = None
+def delete_pype_marker(timeline_item, marker_frame=None):
+    """Delete the AYON marker of the timeline item.
+
+    The marker is deleted by its custom data, see `set_pype_marker`, so
+    it is found even if the artist moved it. Markers without the custom
+    data, e.g. created by older versions, are found by scanning the
+    markers.
+
+    Args:
+        timeline_item (resolve.TimelineItem): resolve object
+        marker_frame (float)[optional]: frame of the AYON marker, e.g.
+            from `find_pype_marker()`
+
+    Returns:
+        bool: True if a marker was deleted
+    """
+    self.tag_cache.invalidate(timeline_item.GetUniqueId())
+
+    if marker_frame is None:
+        if timeline_item.DeleteMarkerByCustomData(
+                self.pype_marker_custom_data):
+            return True
+
+        marker = find_pype_marker(timeline_item)
+        if marker is None:
+            return False
+        marker_frame = marker.frame
+    return bool(timeline_item.DeleteMarkerAtFrame(marker_frame))
 
 
 def create_compound_clip(clip_data, name, folder):
@@ -877,20 +1979,98 @@ def _convert_resolve_list_type(resolve_list):
 
 
 def create_otio_time_range_from_timeline_item_data(timeline_item_data):
-    timeline_item = timeline_item_data["clip"]["item"]
+    clip_data = timeline_item_data["clip"]
     project = timeline_item_data["project"]
     timeline = timeline_item_data["timeline"]
     timeline_start = timeline.GetStartFrame()
 
-    frame_start = int(timeline_item.GetStart() - timeline_start)
-    frame_duration = int(timeline_item.GetDuration())
+    # the range is read once and kept for other consumers of the clip data
+    if isinstance(clip_data, TimelineItemClipData) or "start" in clip_data:
+        item_start = clip_data["start"]
+        item_duration = clip_data["end"] - clip_data["start"]
+    else:
+        timeline_item = clip_data["item"]
+        item_start = timeline_item.GetStart()
+        item_duration = timeline_item.GetDuration()
+
+    frame_start = int(item_start - timeline_start)
+    frame_duration = int(item_duration)
     fps = project.GetSetting("timelineFrameRate")
 
     return otio_export.create_otio_time_range(
         frame_start, frame_duration, fps)
 
 
-def get_otio_clip_instance_data(otio_timeline, timeline_item_data):
+class OTIOClipIndex:
+    """Index of OTIO timeline clips by track name and range in track.
+
+    Clips within a track do not overlap, so the clips of each track are
+    kept sorted by their start and the clip covering a range is found with
+    a binary search instead of iterating all clips of the timeline.
+
+    Args:
+        otio_timeline (otio.schema.Timeline): otio timeline to index
+    """
+
+    def __init__(self, otio_timeline):
+        # track name -> list of (clip starts, clip entries) per track
+        self._tracks_by_name = {}
+        for otio_track in otio_timeline.tracks:
+            ranges = otio_track.range_of_all_children()
+            entries = sorted(
+                (
+                    (ranges[child].start_time.to_seconds(), index, child)
+                    for index, child in enumerate(otio_track)
+                    if isinstance(child, otio.schema.Clip)
+                ),
+                key=lambda entry: entry[:2]
+            )
+            self._tracks_by_name.setdefault(otio_track.name, []).append((
+                [entry[0] for entry in entries],
+                [(entry[2], ranges[entry[2]]) for entry in entries]
+            ))
+
+    def find(self, track_name, clip_name, timeline_range):
+        """Return otio clip covering the range in track of given name.
+
+        Args:
+            track_name (str): name of the track
+            clip_name (str): name of the timeline item, the otio clip
+                name has to be part of it
+            timeline_range (otio.opentime.TimeRange): range of the timeline
+                item relative to timeline start
+
+        Returns:
+            Union[otio.schema.Clip, None]: matching otio clip
+        """
+        tracks = self._tracks_by_name.get(track_name)
+        if tracks is None:
+            # unknown track name, search all tracks
+            tracks = [
+                track
+                for name_tracks in self._tracks_by_name.values()
+                for track in name_tracks
+            ]
+
+        start = timeline_range.start_time.to_seconds()
+        for starts, entries in tracks:
+            position = bisect.bisect_right(starts, start)
+            # only the last clip starting before the range can cover it,
+            # neighbours are checked too to stay safe of rounding errors
+            for index in range(
+                    max(position - 2, 0), min(position + 1, len(entries))):
+                otio_clip, parent_range = entries[index]
+                if otio_clip.name not in clip_name:
+                    continue
+                if is_overlapping_otio_ranges(
+                        parent_range, timeline_range, strict=True):
+                    return otio_clip
+        return None
+
+
+def get_otio_clip_instance_data(
+    otio_timeline, timeline_item_data, clip_index=None
+):
     """
     Return otio objects for timeline, track and clip
 
@@ -898,34 +2078,32 @@ def get_otio_clip_instance_data(otio_timeline, timeline_item_data):
         timeline_item_data (dict): timeline_item_data from list returned by
                                 resolve.get_current_timeline_items()
         otio_timeline (otio.schema.Timeline): otio object
+        clip_index (OTIOClipIndex)[optional]: index of the otio timeline
+            to reuse between calls
 
     Returns:
         dict: otio clip object
 
     """
+    if clip_index is None:
+        clip_index = OTIOClipIndex(otio_timeline)
 
     timeline_item = timeline_item_data["clip"]["item"]
     track_name = timeline_item_data["track"]["name"]
+    clip_name = (
+        timeline_item_data["clip"].get("name") or timeline_item.GetName())
     timeline_range = create_otio_time_range_from_timeline_item_data(
         timeline_item_data)
 
-    for otio_clip in otio_timeline.each_clip():
-        track_name = otio_clip.parent().name
-        parent_range = otio_clip.range_in_parent()
-        if track_name not in track_name:
-            continue
-        if otio_clip.name not in timeline_item.GetName():
-            continue
-        if is_overlapping_otio_ranges(
-                parent_range, timeline_range, strict=True):
-
-            # add pypedata marker to otio_clip metadata
-            for marker in otio_clip.markers:
-                if self.pype_marker_name in marker.name:
-                    otio_clip.metadata.update(marker.metadata)
-            return {"otioClip": otio_clip}
+    otio_clip = clip_index.find(track_name, clip_name, timeline_range)
+    if otio_clip is None:
+        return None
 
-    return None
+    # add pypedata marker to otio_clip metadata
+    for marker in otio_clip.markers:
+        if self.pype_marker_name in marker.name:
+            otio_clip.metadata.update(marker.metadata)
+    return {"otioClip": otio_clip}
 
 
 def get_reformated_path(path, padded=False, first=False):
@@ -6,6 +6,8 @@ from qtpy import QtWidgets, QtCore, QtGui
 from ayon_core.tools.utils import host_tools
 from ayon_core.pipeline import registered_host
 
+from . import jobs, workio
+
 
 MENU_LABEL = os.environ["AYON_MENU_LABEL"]
 
@@ -38,6 +40,67 @@ class Spacer(QtWidgets.QWidget):
         self.setLayout(layout)
 
 
+class JobsWidget(QtWidgets.QWidget):
+    """Progress of the background jobs with option to cancel them."""
+
+    def __init__(self, job_queue, *args, **kwargs):
+        super(JobsWidget, self).__init__(*args, **kwargs)
+
+        label = QtWidgets.QLabel(self)
+        label.setWordWrap(True)
+        progress_bar = QtWidgets.QProgressBar(self)
+        cancel_btn = QtWidgets.QPushButton("Cancel", self)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(label)
+        layout.addWidget(progress_bar)
+        layout.addWidget(cancel_btn)
+
+        cancel_btn.clicked.connect(self.on_cancel_clicked)
+        job_queue.job_added.connect(self.refresh)
+        job_queue.job_progress.connect(self.refresh)
+        job_queue.job_finished.connect(self.on_job_finished)
+
+        self._job_queue = job_queue
+        self._label = label
+        self._progress_bar = progress_bar
+        self._cancel_btn = cancel_btn
+        self._errors = []
+
+        self.setVisible(False)
+
+    def refresh(self, *args):
+        queued_jobs = self._job_queue.get_jobs()
+        if not queued_jobs:
+            self._label.setText("\n".join(self._errors))
+            self._cancel_btn.setText("Clear")
+            self._progress_bar.setVisible(False)
+            self.setVisible(bool(self._errors))
+            return
+
+        job = queued_jobs[0]
+        text = "{}: {} / {}".format(job.label, job.done, job.total)
+        if len(queued_jobs) > 1:
+            text += " ({} more queued)".format(len(queued_jobs) - 1)
+        self._label.setText("\n".join(self._errors + [text]))
+        self._progress_bar.setMaximum(max(job.total, 1))
+        self._progress_bar.setValue(job.done)
+        self._progress_bar.setVisible(True)
+        self._cancel_btn.setText("Cancel")
+        self.setVisible(True)
+
+    def on_job_finished(self, job):
+        if job.error is not None:
+            self._errors.append("{} failed: {}".format(job.label, job.error))
+        self.refresh()
+
+    def on_cancel_clicked(self):
+        self._errors.clear()
+        self._job_queue.cancel()
+        self.refresh()
+
+
 class AYONMenu(QtWidgets.QWidget):
     def __init__(self, *args, **kwargs):
         super(AYONMenu, self).__init__(*args, **kwargs)
@@ -102,6 +165,9 @@ class AYONMenu(QtWidgets.QWidget):
         layout.addWidget(Spacer(15, self))
         layout.addWidget(experimental_btn)
 
+        jobs_widget = JobsWidget(jobs.get_job_queue(), self)
+        layout.addWidget(jobs_widget)
+
         self.setLayout(layout)
 
         save_current_btn.clicked.connect(self.on_save_current_clicked)
@@ -128,7 +194,17 @@ class AYONMenu(QtWidgets.QWidget):
             return
 
         print(f"Saving current file to: {current_file}")
-        host.save_workfile(current_file)
+        # nothing reads the workfile here, copy it in the background
+        workio.save_file(
+            current_file, background=True, callback=self._on_file_saved)
+
+    @staticmethod
+    def _on_file_saved(path, error):
+        # called from the copy thread, only report the result
+        if error is not None:
+            print(f"Failed to save current file to: {path}")
+        else:
+            print(f"Current file saved: {path}")
 
     def on_workfile_clicked(self):
         print("Clicked Workfile")
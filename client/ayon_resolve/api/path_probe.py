@@ -0,0 +1,196 @@
+"""Batched filesystem checks of media before importing it to Resolve.
+
+Checking media file by file with `os.path.isfile` makes one `stat` call
+per file which is slow for long image sequences on network storage. The
+probe instead lists every directory once with `os.scandir`, lists many
+directories concurrently and keeps the listing as long as the modification
+time of the directory is unchanged.
+"""
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+# printf style frame padding like `%04d` or `%d`
+FRAME_PATTERN = re.compile(r"%(0?\d*)d")
+
+
+def _split_frame_pattern(path_pattern):
+    """Return path before the frame, frame format and path after it."""
+    # only the last padding is the frame number
+    match = None
+    for match in FRAME_PATTERN.finditer(path_pattern):
+        pass
+    if match is None:
+        return path_pattern, None, ""
+    return (
+        path_pattern[:match.start()],
+        "{{:{}d}}".format(match.group(1)),
+        path_pattern[match.end():]
+    )
+
+
+def format_frame(path_pattern, frame):
+    """Return path of the frame of a sequence path pattern.
+
+    Args:
+        path_pattern (str): path with frame padding, e.g. `plate.%04d.exr`
+        frame (int): frame number
+
+    Returns:
+        str: path of the frame
+    """
+    head, frame_format, tail = _split_frame_pattern(path_pattern)
+    if frame_format is None:
+        return path_pattern
+    return head + frame_format.format(frame) + tail
+
+
+class PathProbe:
+    """Cache of directory listings validated by directory mtime.
+
+    Args:
+        max_workers (int)[optional]: max number of directories listed
+            concurrently
+    """
+
+    def __init__(self, max_workers=8):
+        self.max_workers = max_workers
+        # directory -> (mtime ns, frozenset of file names)
+        self._listings = {}
+
+    @staticmethod
+    def _scan(directory, cached):
+        """Return listing of the directory, reuse cached if unchanged.
+
+        Returns:
+            Union[tuple[int, frozenset], None]: mtime with file names or
+                None if the directory does not exist
+        """
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+
+        if cached is not None and cached[0] == mtime:
+            return cached
+
+        try:
+            with os.scandir(directory) as entries:
+                names = frozenset(entry.name for entry in entries)
+        except OSError:
+            return None
+        return mtime, names
+
+    def list_directories(self, directories):
+        """Return file names of the directories.
+
+        Directories are listed concurrently, unchanged directories are
+        served from the cache after a single `stat` call.
+
+        Args:
+            directories (Iterable[str]): directory paths
+
+        Returns:
+            dict[str, Union[frozenset, None]]: file names per directory,
+                None for directories which do not exist
+        """
+        directories = list(dict.fromkeys(directories))
+        cached = [self._listings.get(directory) for directory in directories]
+
+        if len(directories) > 1 and self.max_workers > 1:
+            workers = min(self.max_workers, len(directories))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                listings = list(
+                    executor.map(self._scan, directories, cached))
+        else:
+            listings = [
+                self._scan(directory, listing)
+                for directory, listing in zip(directories, cached)
+            ]
+
+        output = {}
+        for directory, listing in zip(directories, listings):
+            if listing is None:
+                self._listings.pop(directory, None)
+                output[directory] = None
+                continue
+            self._listings[directory] = listing
+            output[directory] = listing[1]
+        return output
+
+    def get_existing(self, paths):
+        """Return the paths which exist.
+
+        Args:
+            paths (Iterable[str]): file paths
+
+        Returns:
+            list[str]: existing paths in the input order
+        """
+        paths = list(paths)
+        listings = self.list_directories(
+            os.path.dirname(path) for path in paths)
+        return [
+            path for path in paths
+            if os.path.basename(path) in (
+                listings[os.path.dirname(path)] or ())
+        ]
+
+    def check_sequences(self, sequences):
+        """Check completeness of image sequences.
+
+        Args:
+            sequences (Iterable[tuple[str, int, int]]): path pattern with
+                frame padding (e.g. `/path/plate.%04d.exr`), first and last
+                expected frame
+
+        Returns:
+            list[dict]: per sequence whether any frame `exists` and the
+                list of `missing_frames`
+        """
+        sequences = list(sequences)
+        listings = self.list_directories(
+            os.path.dirname(path_pattern)
+            for path_pattern, _, _ in sequences
+        )
+
+        results = []
+        for path_pattern, first_frame, last_frame in sequences:
+            names = listings[os.path.dirname(path_pattern)] or ()
+            head, frame_format, tail = _split_frame_pattern(
+                os.path.basename(path_pattern))
+            if frame_format is None:
+                frame_format = ""
+            missing_frames = [
+                frame for frame in range(first_frame, last_frame + 1)
+                if head + frame_format.format(frame) + tail not in names
+            ]
+            results.append({
+                "exists": (
+                    len(missing_frames) < last_frame - first_frame + 1),
+                "missing_frames": missing_frames,
+            })
+        return results
+
+    def invalidate(self, directory):
+        self._listings.pop(directory, None)
+
+    def clear(self):
+        self._listings.clear()
+
+
+def format_frame_ranges(frames):
+    """Return compact string of frame numbers, e.g. `1001-1003, 1010`."""
+    ranges = []
+    for frame in sorted(frames):
+        if ranges and frame == ranges[-1][1] + 1:
+            ranges[-1][1] = frame
+        else:
+            ranges.append([frame, frame])
+    return ", ".join(
+        str(start) if start == end else "{}-{}".format(start, end)
+        for start, end in ranges
+    )
+
+
+path_probe = PathProbe()
@@ -23,6 +23,7 @@ from ayon_core.host import (
 )
 
 from . import lib
+from .profiler import profile_operation
 from .utils import get_resolve_module
 from .workio import (
     open_file,
@@ -80,6 +81,8 @@ class ResolveHost(HostBase, IWorkfileHost, ILoadHost):
         return open_file(filepath)
 
     def save_workfile(self, filepath=None):
+        # tools read or list the workfile right after it is saved and
+        # cannot wait for a background copy, the export is written at once
         return save_file(filepath)
 
     def work_root(self, session):
@@ -89,6 +92,8 @@ class ResolveHost(HostBase, IWorkfileHost, ILoadHost):
         return current_file()
 
     def workfile_has_unsaved_changes(self):
+        # trims, grades, retimes and clip property edits are not detected,
+        # see `workio.has_unsaved_changes`
         return has_unsaved_changes()
 
     def get_workfile_extensions(self):
@@ -138,39 +143,200 @@ def containerise(timeline_item,
     return timeline_item
 
 
-def ls():
-    """List available containers.
+class MediaPoolContainerRegistry:
+    """Registry of media pool containers keyed by clip unique id.
 
-    This function is used by the Container Manager in Nuke. You'll
-    need to implement a for-loop that then *yields* one Container at
-    a time.
+    Listing the media pool containers requires reading and parsing the
+    metadata of every clip in the media pool. The registry keeps the parsed
+    containers and only re-reads metadata of clips it has not seen before.
 
-    See the `container.json` schema for details on how it should look,
-    and the Maya equivalent, which is in `avalon.maya.pipeline`
+    The media pool is walked again only when the current project changed
+    or the media pool generation of `lib` changed, i.e. the add-on imported
+    or deleted media pool items, see `lib.invalidate_media_pool`. Loaders
+    changing the container metadata update the registry directly through
+    `register` and `discard`. Changes made in Resolve are picked up on
+    `invalidate`, which `ls` calls on every listing.
     """
 
-    # Media Pool instances from Load Media loader
-    for clip in lib.iter_all_media_pool_clips():
+    required = ["schema", "id", "loader", "representation"]
+
+    def __init__(self):
+        self._entries = {}
+        self._by_representation = {}
+        # (project id, media pool generation) the registry is synced with
+        self._state = None
+
+    def _iter_folders_clips(self):
+        root = lib.get_current_project().GetMediaPool().GetRootFolder()
+        queue = [root]
+        for folder in queue:
+            yield from folder.GetClipList() or []
+            queue.extend(folder.GetSubFolderList() or [])
+
+    def _parse(self, clip):
         data = clip.GetMetadata(lib.pype_tag_name)
         if not data:
-            continue
-        data = json.loads(data)
+            return None
+        return self._to_container(clip, json.loads(data))
 
+    def _to_container(self, clip, data):
         # If not all required data, skip it
-        required = ['schema', 'id', 'loader', 'representation']
-        if not all(key in data for key in required):
-            continue
+        if not all(key in data for key in self.required):
+            return None
 
-        container = {key: data[key] for key in required}
+        container = {key: data[key] for key in self.required}
         container["objectName"] = clip.GetName()  # Get path in folders
         container["namespace"] = clip.GetName()
         container["name"] = clip.GetUniqueId()
         container["_item"] = clip
+        return container
+
+    def _index(self, container):
+        if container is not None:
+            self._by_representation.setdefault(
+                container["representation"], []).append(container)
+
+    def _unindex(self, container):
+        if container is None:
+            return
+        representation_id = container["representation"]
+        containers = [
+            indexed
+            for indexed in self._by_representation.get(representation_id, [])
+            if indexed is not container
+        ]
+        if containers:
+            self._by_representation[representation_id] = containers
+        else:
+            self._by_representation.pop(representation_id, None)
+
+    def update(self):
+        """Synchronize the registry with the media pool if it changed."""
+        project = lib.get_current_project()
+        state = (project.GetUniqueId(), lib.media_pool_generation)
+        if state == self._state:
+            return
+
+        entries = {}
+        for clip in self._iter_folders_clips():
+            unique_id = clip.GetUniqueId()
+            if unique_id in self._entries:
+                entries[unique_id] = self._entries[unique_id]
+            else:
+                entries[unique_id] = self._parse(clip)
+
+        self._entries = entries
+        self._by_representation = {}
+        for container in entries.values():
+            self._index(container)
+        self._state = state
+
+    def invalidate(self):
+        """Walk the media pool on next use, e.g. after changes in Resolve.
+        """
+        self._state = None
+
+    def register(self, clip, data):
+        """Register container data written to the clip metadata.
+
+        Args:
+            clip (resolve.MediaPoolItem): containerised media pool item
+            data (dict): container data imprinted into the clip
+        """
+        unique_id = clip.GetUniqueId()
+        self._unindex(self._entries.get(unique_id))
+        container = self._to_container(clip, data)
+        self._entries[unique_id] = container
+        self._index(container)
+
+    def discard(self, clip):
+        """Remove clip which is about to be deleted from the registry."""
+        unique_id = clip.GetUniqueId()
+        if unique_id in self._entries:
+            self._unindex(self._entries.pop(unique_id))
+
+    def get_containers(self):
+        """Return all media pool containers.
+
+        Returns:
+            list[dict]: container data
+        """
+        self.update()
+        return [
+            dict(container) for container in self._entries.values()
+            if container is not None
+        ]
+
+    def find_by_representation(self, representation_id):
+        """Return media pool containers of the representation.
+
+        Args:
+            representation_id (str): representation id
+
+        Returns:
+            list[dict]: container data
+        """
+        return self.find_by_representations([representation_id]).get(
+            representation_id, [])
+
+    def find_by_representations(self, representation_ids):
+        """Return media pool containers of multiple representations.
+
+        The registry is synchronized with the media pool once for all of
+        them.
+
+        Args:
+            representation_ids (Iterable[str]): representation ids
+
+        Returns:
+            dict[str, list[dict]]: container data by representation id,
+                representations without containers are not included
+        """
+        self.update()
+        containers_by_id = {}
+        for representation_id in representation_ids:
+            containers = self._by_representation.get(representation_id)
+            if containers:
+                containers_by_id[representation_id] = [
+                    dict(container) for container in containers
+                ]
+        return containers_by_id
+
+    def clear(self):
+        self._entries.clear()
+        self._by_representation.clear()
+        self._state = None
+
+
+media_pool_containers = MediaPoolContainerRegistry()
+
+
+@profile_operation("ls")
+def ls(snapshot=None):
+    """List available containers.
+
+    This function is used by the Container Manager in Nuke. You'll
+    need to implement a for-loop that then *yields* one Container at
+    a time.
+
+    See the `container.json` schema for details on how it should look,
+    and the Maya equivalent, which is in `avalon.maya.pipeline`
+
+    Args:
+        snapshot (lib.TimelineSnapshot)[optional]: already collected
+            snapshot of the current timeline
+    """
+
+    # Media Pool instances from Load Media loader, media changed in Resolve
+    # since the last listing are picked up
+    media_pool_containers.invalidate()
+    for container in media_pool_containers.get_containers():
         yield container
 
     # Timeline instances from Load Clip loader
     # get all track items from current timeline
-    all_timeline_items = lib.get_current_timeline_items(filter=False)
+    all_timeline_items = lib.get_current_timeline_items(
+        filter=False, snapshot=snapshot)
 
     for timeline_item_data in all_timeline_items:
         timeline_item = timeline_item_data["clip"]["item"]
@@ -179,6 +345,26 @@ def ls():
             yield container
 
 
+def cache_container_last_versions(project_name, containers=None):
+    """Cache last versions of all products loaded in the current project.
+
+    Useful before updating or coloring many containers so the latest
+    version state of all of them is resolved with few server requests.
+
+    Args:
+        project_name (str): project name
+        containers (Iterable[dict])[optional]: containers to cache the
+            last versions for, defaults to all containers from `ls()`
+    """
+    if containers is None:
+        containers = ls()
+
+    lib.last_version_cache.cache_representations(
+        project_name,
+        {container["representation"] for container in containers}
+    )
+
+
 def parse_container(timeline_item, validate=True):
     """Return container data from timeline_item's openpype tag.
 
@@ -277,12 +463,13 @@ def on_pyblish_instance_toggled(instance, old_value, new_value):
     set_publish_attribute(timeline_item, new_value)
 
 
-def remove_instance(instance):
+def remove_instance(instance, snapshot=None):
     """Remove instance marker from track item."""
     instance_id = instance.get("uuid")
 
     selected_timeline_items = lib.get_current_timeline_items(
-        filter=True, selecting_color=lib.publish_clip_color)
+        filter=True, selecting_color=lib.publish_clip_color,
+        snapshot=snapshot)
 
     found_ti = None
     for timeline_item_data in selected_timeline_items:
@@ -301,17 +488,19 @@ def remove_instance(instance):
     # removing instance by marker color
     print(f"Removing instance: {found_ti.GetName()}")
     found_ti.DeleteMarkersByColor(lib.pype_marker_color)
+    lib.tag_cache.invalidate(found_ti.GetUniqueId())
 
 
-def list_instances():
+def list_instances(snapshot=None):
     """List all created instances from current workfile."""
     listed_instances = []
     selected_timeline_items = lib.get_current_timeline_items(
-        filter=True, selecting_color=lib.publish_clip_color)
+        filter=True, selecting_color=lib.publish_clip_color,
+        snapshot=snapshot)
 
     for timeline_item_data in selected_timeline_items:
         timeline_item = timeline_item_data["clip"]["item"]
-        ti_name = timeline_item.GetName().split(".")[0]
+        ti_name = timeline_item_data["clip"]["name"].split(".")[0]
 
         # get openpype tag data
         tag_data = lib.get_timeline_item_pype_tag(timeline_item)
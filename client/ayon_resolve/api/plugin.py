@@ -569,6 +569,9 @@ class Creator(LegacyCreator):
             self.presets = resolve_p_settings["create"].get(
                 self.__class__.__name__, {})
 
+        # make sure tags are read fresh from Resolve for this creator
+        lib.tag_cache.clear()
+
         # adding basic current context resolve objects
         self.project = lib.get_current_project()
         self.timeline = lib.get_current_timeline()
@@ -655,6 +658,30 @@ class PublishClip:
         self._create_parents()
 
     def convert(self):
+        """Convert the track item to publishable instance.
+
+        Returns:
+            Union[resolve.TimelineItem, None]: imprinted timeline item
+        """
+        tag_data = self.get_tag_data()
+        if tag_data is None:
+            return
+
+        # create openpype tag on timeline_item and add data
+        lib.imprint(self.timeline_item, tag_data)
+
+        return self.timeline_item
+
+    def get_tag_data(self):
+        """Return tag data to be imprinted without imprinting it.
+
+        This allows to collect data of multiple clips first and imprint
+        them with `lib.imprint_many` at once.
+
+        Returns:
+            Union[dict, None]: tag data or None if the track item should
+                not be converted
+        """
         # solve track item data and add them to tag data
         self._convert_to_tag_data()
 
@@ -693,10 +720,9 @@ class PublishClip:
                 "track_data": self.timeline_item_data["track"]
             })
 
-        # create openpype tag on timeline_item and add data
-        lib.imprint(self.timeline_item, self.tag_data)
-
-        return self.timeline_item
+        # tag data is shared between instances and updated by following
+        # clips (e.g. vertical sync) so return its current state
+        return copy.deepcopy(self.tag_data)
 
     def _populate_timeline_item_default_data(self):
         """ Populate default formatting data from track item. """
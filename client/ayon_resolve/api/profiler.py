@@ -0,0 +1,297 @@
+"""Opt-in profiler of calls through the Resolve scripting bridge.
+
+Every Resolve API call is a round trip through the fusionscript bridge,
+which is usually far more expensive than the Python code around it. When
+enabled, the objects returned by `lib.get_project_manager()` and
+`lib.get_media_storage()` are wrapped in proxies which count and time
+every API call, including calls on all objects they return.
+
+Calls are grouped by the AYON operation in progress, e.g. a load, an
+update, `ls()` or a publish collector, see `profile_operation`. A summary
+table is logged when the outermost operation finishes.
+
+Enable by setting the `AYON_RESOLVE_PROFILE` environment variable to `1`.
+Set `AYON_RESOLVE_PROFILE_OUTPUT` to a `.json` file path to also write the
+collected statistics there.
+"""
+import os
+import json
+import time
+import inspect
+import functools
+import contextlib
+
+from ayon_core.lib import Logger
+
+log = Logger.get_logger(__name__)
+
+ENABLED_ENV = "AYON_RESOLVE_PROFILE"
+OUTPUT_ENV = "AYON_RESOLVE_PROFILE_OUTPUT"
+NO_OPERATION = "<no operation>"
+
+# Values passed through the bridge as is and never wrapped
+_PLAIN_TYPES = (str, bytes, int, float, bool, type(None))
+
+# Resolve object type returned by the API calls, used to label the calls
+_RETURN_TYPES = {
+    "GetProjectManager": "ProjectManager",
+    "GetMediaStorage": "MediaStorage",
+    "GetCurrentProject": "Project",
+    "LoadProject": "Project",
+    "CreateProject": "Project",
+    "GetMediaPool": "MediaPool",
+    "GetRootFolder": "Folder",
+    "GetCurrentFolder": "Folder",
+    "AddSubFolder": "Folder",
+    "GetSubFolderList": "Folder",
+    "GetClipList": "MediaPoolItem",
+    "ImportMedia": "MediaPoolItem",
+    "AddItemListToMediaPool": "MediaPoolItem",
+    "GetMediaPoolItem": "MediaPoolItem",
+    "GetCurrentTimeline": "Timeline",
+    "GetTimelineByIndex": "Timeline",
+    "CreateEmptyTimeline": "Timeline",
+    "CreateTimelineFromClips": "Timeline",
+    "ImportTimelineFromFile": "Timeline",
+    "GetItemListInTrack": "TimelineItem",
+    "AppendToTimeline": "TimelineItem",
+    "GetCurrentVideoItem": "TimelineItem",
+}
+
+
+class BridgeProfiler:
+    """Statistics of Resolve API calls grouped by operation."""
+
+    def __init__(self, enabled=False, output_path=None):
+        self.enabled = enabled
+        self.output_path = output_path
+        self._operations = []
+        # operation -> call name -> [count, total seconds]
+        self._stats = {}
+
+    @property
+    def current_operation(self):
+        if not self._operations:
+            return NO_OPERATION
+        return self._operations[0]
+
+    def record(self, call_name, duration):
+        calls = self._stats.setdefault(self.current_operation, {})
+        entry = calls.setdefault(call_name, [0, 0.0])
+        entry[0] += 1
+        entry[1] += duration
+
+    @contextlib.contextmanager
+    def operation(self, name):
+        """Group calls made inside the context under the operation name.
+
+        Nested operations are accounted to the outermost operation.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        self._operations.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._operations.pop()
+            if not self._operations:
+                self._finish_operation(name, time.perf_counter() - start)
+
+    def wrap(self, obj, type_name="Resolve"):
+        """Return proxy of the Resolve object recording its calls.
+
+        Returns the object itself when profiling is disabled.
+        """
+        if not self.enabled:
+            return obj
+        return _wrap_value(obj, type_name, self)
+
+    def get_stats(self):
+        """Return collected statistics.
+
+        Returns:
+            dict[str, dict[str, dict]]: per operation and call name the
+                `calls` count and total `time` in seconds
+        """
+        return {
+            operation: {
+                call_name: {"calls": count, "time": duration}
+                for call_name, (count, duration) in calls.items()
+            }
+            for operation, calls in self._stats.items()
+        }
+
+    def format_table(self, operation=None, limit=20):
+        """Return summary table of the calls sorted by total time.
+
+        Args:
+            operation (str)[optional]: only show this operation
+            limit (int)[optional]: max number of calls per operation
+        """
+        lines = []
+        for operation_name, calls in self._stats.items():
+            if operation is not None and operation_name != operation:
+                continue
+
+            total_calls = sum(count for count, _ in calls.values())
+            total_time = sum(duration for _, duration in calls.values())
+            lines.append(
+                "{}: {} calls, {:.3f}s".format(
+                    operation_name, total_calls, total_time)
+            )
+            lines.append(
+                "  {:<42} {:>8} {:>10} {:>10}".format(
+                    "call", "count", "total ms", "avg ms")
+            )
+            sorted_calls = sorted(
+                calls.items(), key=lambda item: item[1][1], reverse=True)
+            for call_name, (count, duration) in sorted_calls[:limit]:
+                lines.append(
+                    "  {:<42} {:>8} {:>10.2f} {:>10.3f}".format(
+                        call_name,
+                        count,
+                        duration * 1000,
+                        duration * 1000 / count
+                    )
+                )
+        return "\n".join(lines)
+
+    def write_json(self, path=None):
+        path = path or self.output_path
+        if not path:
+            return
+        with open(path, "w") as stream:
+            json.dump(self.get_stats(), stream, indent=4, sort_keys=True)
+
+    def reset(self):
+        self._stats.clear()
+
+    def _finish_operation(self, name, duration):
+        log.info(
+            "Resolve bridge calls of '{}' ({:.3f}s):\n{}".format(
+                name, duration, self.format_table(name))
+        )
+        if self.output_path:
+            try:
+                self.write_json()
+            except OSError:
+                log.warning(
+                    "Failed to write profile to: {}".format(
+                        self.output_path),
+                    exc_info=True
+                )
+
+
+class BridgeProxy:
+    """Proxy of a Resolve object recording calls of its API methods."""
+
+    __slots__ = ("_obj", "_type_name", "_profiler")
+
+    def __init__(self, obj, type_name, profiler):
+        object.__setattr__(self, "_obj", obj)
+        object.__setattr__(self, "_type_name", type_name)
+        object.__setattr__(self, "_profiler", profiler)
+
+    def __getattr__(self, name):
+        attr = getattr(self._obj, name)
+        if attr is None or not callable(attr):
+            # Resolve returns None for functions missing in the version
+            return attr
+
+        call_name = "{}.{}".format(self._type_name, name)
+        return_type = _RETURN_TYPES.get(name, "Object")
+        profiler = self._profiler
+
+        def api_call(*args, **kwargs):
+            args = [_unwrap_value(arg) for arg in args]
+            kwargs = {
+                key: _unwrap_value(value) for key, value in kwargs.items()
+            }
+            start = time.perf_counter()
+            try:
+                result = attr(*args, **kwargs)
+            finally:
+                profiler.record(call_name, time.perf_counter() - start)
+            return _wrap_value(result, return_type, profiler)
+
+        return api_call
+
+    def __eq__(self, other):
+        return self._obj == _unwrap_value(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._obj)
+
+    def __bool__(self):
+        return bool(self._obj)
+
+    def __repr__(self):
+        return "<BridgeProxy {!r}>".format(self._obj)
+
+
+def _wrap_value(value, type_name, profiler):
+    if isinstance(value, (_PLAIN_TYPES, BridgeProxy)):
+        return value
+    if isinstance(value, list):
+        return [_wrap_value(item, type_name, profiler) for item in value]
+    if isinstance(value, tuple):
+        return tuple(
+            _wrap_value(item, type_name, profiler) for item in value)
+    if isinstance(value, dict):
+        return {
+            key: _wrap_value(item, type_name, profiler)
+            for key, item in value.items()
+        }
+    return BridgeProxy(value, type_name, profiler)
+
+
+def _unwrap_value(value):
+    if isinstance(value, BridgeProxy):
+        return object.__getattribute__(value, "_obj")
+    if isinstance(value, list):
+        return [_unwrap_value(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_unwrap_value(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _unwrap_value(item) for key, item in value.items()}
+    return value
+
+
+def profile_operation(name):
+    """Decorator grouping the bridge calls of the function by operation.
+
+    Generator functions are profiled for the whole iteration. The wrapper
+    keeps the signature of the function as pyblish inspects the arguments
+    of the `process` method of the plugins.
+
+    Args:
+        name (str): name of the operation, e.g. `LoadMedia.load`
+    """
+    def decorator(func):
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with profiler.operation(name):
+                    yield from func(*args, **kwargs)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with profiler.operation(name):
+                    return func(*args, **kwargs)
+
+        wrapper.__signature__ = inspect.signature(func)
+        return wrapper
+
+    return decorator
+
+
+profiler = BridgeProfiler(
+    enabled=os.getenv(ENABLED_ENV, "").lower() in {"1", "true", "yes"},
+    output_path=os.getenv(OUTPUT_ENV) or None
+)
@@ -0,0 +1,237 @@
+"""Export of the Resolve project to workfiles.
+
+`ProjectManager.ExportProject` writes the `.drp` file in place, so
+a crash in the middle of the write leaves a truncated workfile behind.
+
+`export_project` exports next to the workfile and renames the export to
+the workfile at once, so the workfile is either the previous or the
+complete new file. It blocks Resolve for the time of the export, same as
+exporting to the workfile directly. It is used by the Workfiles tool,
+which reads and lists the workfile right after it is saved and has no
+way to wait for a save finished later.
+
+Saving from the AYON menu does not read the workfile afterwards. The
+project is exported to a local scratch directory there, which is fast
+even for large projects on network storage, and the export is copied to
+the workfile in a background thread, see `copy_staged_export`. The copy
+is renamed to the workfile at once too. The staged file is removed once
+copied.
+"""
+import os
+import sys
+import uuid
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ayon_core.lib import Logger
+
+from . import lib
+
+log = Logger.get_logger(__name__)
+
+self = sys.modules[__name__]
+self.copy_executor = None
+# destination path -> number of copies in progress
+self.pending_copies = {}
+# destination path -> event set once the last copy to it finished
+self.copy_events = {}
+
+_lock = threading.Lock()
+
+CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def get_scratch_dir():
+    return os.path.join(tempfile.gettempdir(), "ayon_resolve", "export")
+
+
+def copy_file(src, dst, chunk_size=CHUNK_SIZE):
+    """Copy file in chunks next to destination and rename it to it.
+
+    Args:
+        src (str): path to the source file
+        dst (str): path to the destination file
+        chunk_size (int)[optional]: bytes read and written at once
+
+    Raises:
+        OSError: copy failed, the destination is left untouched
+    """
+    dst_dir = os.path.dirname(dst)
+    if dst_dir:
+        os.makedirs(dst_dir, exist_ok=True)
+    tmp_path = _get_tmp_path(dst)
+
+    try:
+        with open(src, "rb") as src_stream, open(tmp_path, "wb") as stream:
+            while True:
+                chunk = src_stream.read(chunk_size)
+                if not chunk:
+                    break
+                stream.write(chunk)
+            stream.flush()
+            os.fsync(stream.fileno())
+
+        os.replace(tmp_path, dst)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _get_tmp_path(path):
+    root, ext = os.path.splitext(path)
+    return "{}.{}.tmp{}".format(root, uuid.uuid4().hex[:8], ext)
+
+
+def _export(project, path):
+    project_name = project.GetName()
+    if not lib.get_project_manager().ExportProject(project_name, path):
+        if os.path.exists(path):
+            os.remove(path)
+        raise RuntimeError(
+            "Failed to export project '{}' to: {}".format(
+                project_name, path))
+
+
+def export_project(project, destination):
+    """Export the project to the workfile and return once it is written.
+
+    Must be called from the main thread as it calls the Resolve API.
+
+    Args:
+        project (resolve.Project): project to export
+        destination (str): path to the workfile
+
+    Raises:
+        RuntimeError: Resolve failed to export the project, the workfile
+            is left untouched
+    """
+    # a copy to the same workfile started earlier must not overwrite it
+    wait_for_copy(destination)
+
+    dst_dir = os.path.dirname(destination)
+    if dst_dir:
+        os.makedirs(dst_dir, exist_ok=True)
+    tmp_path = _get_tmp_path(destination)
+    try:
+        _export(project, tmp_path)
+        os.replace(tmp_path, destination)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def stage_export(project):
+    """Export the project to the local scratch directory.
+
+    Must be called from the main thread as it calls the Resolve API.
+
+    Args:
+        project (resolve.Project): project to export
+
+    Returns:
+        str: path to the staged export
+
+    Raises:
+        RuntimeError: Resolve failed to export the project
+    """
+    directory = get_scratch_dir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, "{}.drp".format(uuid.uuid4().hex))
+    _export(project, path)
+    return path
+
+
+def _get_copy_executor():
+    # copies run one by one so that copies to the same destination are
+    # finished in order they were started
+    if self.copy_executor is None:
+        self.copy_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="ayon-resolve-export")
+    return self.copy_executor
+
+
+def copy_staged_export(staged_path, destination, callback=None):
+    """Copy the staged export to the destination in a background thread.
+
+    The staged export is removed once copied.
+
+    Args:
+        staged_path (str): path to the staged export, see `stage_export`
+        destination (str): path to the workfile
+        callback (Callable[[str, Union[Exception, None]], None])[optional]:
+            called with the destination and the error, if the copy failed,
+            once the copy finished. It is called from the copy thread.
+
+    Returns:
+        concurrent.futures.Future: future of the copy
+    """
+    pending_key = os.path.normpath(destination)
+    finished = threading.Event()
+    with _lock:
+        self.pending_copies[pending_key] = (
+            self.pending_copies.get(pending_key, 0) + 1)
+        self.copy_events[pending_key] = finished
+
+    def on_done(future):
+        try:
+            os.remove(staged_path)
+        except OSError:
+            pass
+        with _lock:
+            _decrement(self.pending_copies, pending_key)
+            if self.copy_events.get(pending_key) is finished:
+                del self.copy_events[pending_key]
+
+        error = future.exception()
+        if error is not None:
+            log.error(
+                "Failed to copy project export to: {}".format(destination),
+                exc_info=error
+            )
+        else:
+            log.info("Project exported: {}".format(destination))
+
+        try:
+            if callback is not None:
+                callback(destination, error)
+        finally:
+            finished.set()
+
+    future = _get_copy_executor().submit(copy_file, staged_path, destination)
+    future.add_done_callback(on_done)
+    return future
+
+
+def _decrement(counts, key):
+    count = counts.pop(key) - 1
+    if count:
+        counts[key] = count
+
+
+def is_copy_pending(path):
+    """Return whether a copy to the path is in progress."""
+    with _lock:
+        return os.path.normpath(path) in self.pending_copies
+
+
+def wait_for_copy(path, timeout=None):
+    """Wait until copies to the path in progress are finished.
+
+    Must be called before the workfile is read, e.g. opened or listed,
+    right after it was saved.
+
+    Args:
+        path (str): path to the workfile
+        timeout (float)[optional]: maximum time to wait in seconds
+
+    Returns:
+        bool: False if the copies did not finish in time
+    """
+    with _lock:
+        finished = self.copy_events.get(os.path.normpath(path))
+    if finished is None:
+        return True
+    return finished.wait(timeout)
@@ -1,7 +1,9 @@
 """Host API required Work Files tool"""
 
 import os
+import sys
 from ayon_core.lib import Logger
+from . import lib, workfile_export
 from .lib import (
     get_project_manager,
     get_current_project
@@ -10,17 +12,108 @@ from .lib import (
 
 log = Logger.get_logger(__name__)
 
+self = sys.modules[__name__]
+# fingerprint of the project content when it was last saved or opened
+self.saved_fingerprint = None
+
+FINGERPRINT_TRACK_TYPES = ("video", "audio", "subtitle")
+
 
 def file_extensions():
     return [".drp"]
 
 
+def get_project_fingerprint():
+    """Return cheap fingerprint of the current project content.
+
+    The fingerprint is made of the timeline count, the name, end frame,
+    item count per track and markers of each timeline and the count of
+    clips in the media pool. Reading it does not write anything to the
+    project database, unlike saving the project.
+
+    Edits which keep all of these, like trims, grades, retimes or changed
+    clip properties, do not change the fingerprint.
+
+    Returns:
+        tuple: fingerprint which can be compared for equality
+    """
+    project = get_current_project()
+    timelines = []
+    for index in range(1, int(project.GetTimelineCount()) + 1):
+        timeline = project.GetTimelineByIndex(index)
+        item_counts = []
+        for track_type in FINGERPRINT_TRACK_TYPES:
+            track_count = timeline.GetTrackCount(track_type) or 0
+            for track_index in range(1, int(track_count) + 1):
+                items = timeline.GetItemListInTrack(
+                    track_type, track_index) or []
+                item_counts.append(len(items))
+
+        timelines.append((
+            timeline.GetUniqueId(),
+            timeline.GetName(),
+            timeline.GetEndFrame(),
+            tuple(item_counts),
+            # marker dicts are compared as they are
+            timeline.GetMarkers() or {},
+        ))
+
+    clip_count = sum(1 for _ in lib.iter_all_media_pool_clips())
+    return project.GetUniqueId(), tuple(timelines), clip_count
+
+
+def remember_saved_state():
+    """Store fingerprint of the current project as saved."""
+    self.saved_fingerprint = get_project_fingerprint()
+
+
 def has_unsaved_changes():
+    """Return whether the project changed since it was saved or opened.
+
+    The fingerprint of the project content is compared with the one taken
+    on the last save or open, see `get_project_fingerprint`.
+
+    Edits which do not change the fingerprint are not reported: trims,
+    grades, retimes and changed clip properties. They are not lost though,
+    the project is saved to the Resolve project database whenever no
+    change is reported, same as before the fingerprint was used.
+    """
+    fingerprint = get_project_fingerprint()
+    saved_fingerprint = self.saved_fingerprint
+    if saved_fingerprint is None or saved_fingerprint[0] != fingerprint[0]:
+        # project was not saved or opened through AYON, e.g. opened in
+        # Resolve directly, consider its current state saved
+        self.saved_fingerprint = fingerprint
+        saved_fingerprint = fingerprint
+
+    if fingerprint != saved_fingerprint:
+        return True
+
+    # keep edits the fingerprint does not cover in the project database
     get_project_manager().SaveProject()
     return False
 
 
-def save_file(filepath):
+def save_file(filepath, background=False, callback=None):
+    """Save the current project to the workfile.
+
+    By default the project is exported to the workfile, which is complete
+    once this returns, see `workfile_export.export_project`.
+
+    With `background` the project is exported to a local scratch directory
+    and copied to the workfile in a background thread, see
+    `workfile_export.copy_staged_export`. Use `callback` or
+    `workfile_export.wait_for_copy` before reading the workfile then.
+    The project is considered saved only once the copy succeeded.
+
+    Args:
+        filepath (str): path to the workfile
+        background (bool)[optional]: copy the export to the workfile in
+            a background thread
+        callback (Callable[[str, Union[Exception, None]], None])[optional]:
+            called with the workfile path and the error, if the save
+            failed, once the workfile is written
+    """
     pm = get_project_manager()
     file = os.path.basename(filepath)
     fname, _ = os.path.splitext(file)
@@ -36,8 +129,35 @@ def save_file(filepath):
         response = project.SetName(fname)
         log.info("Project renamed: {}".format(response))
 
-    exported = pm.ExportProject(fname, filepath)
-    log.info("Project exported: {}".format(exported))
+    # project created above is the current one now
+    project = get_current_project()
+    fingerprint = get_project_fingerprint()
+
+    def on_saved(path, error):
+        if error is None:
+            self.saved_fingerprint = fingerprint
+        if callback is not None:
+            callback(path, error)
+
+    if not background:
+        try:
+            workfile_export.export_project(project, filepath)
+        except RuntimeError as error:
+            log.error(str(error))
+            on_saved(filepath, error)
+            return
+        log.info("Project exported: {}".format(filepath))
+        on_saved(filepath, None)
+        return
+
+    try:
+        staged_path = workfile_export.stage_export(project)
+    except RuntimeError as error:
+        log.error(str(error))
+        on_saved(filepath, error)
+        return
+
+    workfile_export.copy_staged_export(staged_path, filepath, on_saved)
 
 
 def open_file(filepath):
@@ -59,6 +179,16 @@ def open_file(filepath):
     file = os.path.basename(filepath)
     fname, _ = os.path.splitext(file)
 
+    # workfile saved right before may be still being written
+    workfile_export.wait_for_copy(filepath)
+
+    # cached data belong to the previously opened project
+    lib.tag_cache.clear()
+    lib.bin_path_cache.clear()
+    lib.media_pool_index.clear()
+    lib.last_version_cache.clear()
+    lib.clip_usage_index.clear()
+
     try:
         # load project from input path
         project = pm.LoadProject(fname)
@@ -71,8 +201,10 @@ def open_file(filepath):
             # load project from input path
             project = pm.LoadProject(fname)
             log.info(f"Project imported/loaded {project.GetName()}...")
+            remember_saved_state()
             return True
         return False
+    remember_saved_state()
     return True
 
 
@@ -87,8 +219,12 @@ def current_file():
     # create current file path
     current_file_path = os.path.join(workdir_path, file_name)
 
-    # return current file path if it exists
-    if os.path.exists(current_file_path):
+    # return current file path if it exists or is being written by a save
+    # from the AYON menu, readers wait for the copy with `wait_for_copy`
+    if (
+        os.path.exists(current_file_path)
+        or workfile_export.is_copy_pending(current_file_path)
+    ):
         return os.path.normpath(current_file_path)
 
 
@@ -31,13 +31,62 @@ def create_otio_time_range(start_frame, frame_duration, fps):
     )
 
 
-def create_otio_reference(media_pool_item):
-    metadata = _get_metadata_media_pool_item(media_pool_item)
+def create_otio_reference(media_pool_item, cache=None):
+    """Return OTIO media reference for the media pool item.
+
+    Args:
+        media_pool_item (resolve.MediaPoolItem): media pool item
+        cache (dict)[optional]: export cache shared between calls, see
+            `get_media_pool_item_data`
+
+    Returns:
+        otio.schema.MediaReference: media reference
+    """
+    data = get_media_pool_item_data(media_pool_item, cache)
+    return data["reference"].clone()
+
+
+def get_media_pool_item_data(media_pool_item, cache=None, unique_id=None):
+    """Return clip properties, metadata and reference of media pool item.
+
+    All data of the media pool item are queried once and stored in the
+    cache by the media pool item unique id, so clips sharing the same
+    media do not query them again.
+
+    Args:
+        media_pool_item (resolve.MediaPoolItem): media pool item
+        cache (dict)[optional]: export cache shared between calls
+        unique_id (str)[optional]: unique id of the media pool item if
+            already known
+
+    Returns:
+        dict: with `properties`, `metadata` and `reference` keys
+    """
+    if cache is None:
+        cache = {}
+
+    if unique_id is None:
+        unique_id = media_pool_item.GetUniqueId()
+    data = cache.get(unique_id)
+    if data is not None:
+        return data
+
     print("media pool item: {}".format(media_pool_item.GetName()))
+    clip_properties = media_pool_item.GetClipProperty() or {}
+    mp_metadata = media_pool_item.GetMetadata() or {}
+    data = {
+        "properties": clip_properties,
+        "metadata": mp_metadata,
+        "reference": _create_otio_reference(clip_properties, mp_metadata),
+    }
+    cache[unique_id] = data
+    return data
+
 
-    _mp_clip_property = media_pool_item.GetClipProperty
+def _create_otio_reference(clip_properties, mp_metadata):
+    metadata = _get_metadata_from_properties(clip_properties, mp_metadata)
 
-    path = _mp_clip_property("File Path")
+    path = clip_properties["File Path"]
     reformat_path = utils.get_reformated_path(path, padded=True)
     padding = utils.get_padding_from_path(path)
 
@@ -48,12 +97,12 @@ def create_otio_reference(media_pool_item):
         })
 
     # get clip property regarding to type
-    fps = float(_mp_clip_property("FPS"))
-    if _mp_clip_property("Type") == "Video":
-        frame_start = int(_mp_clip_property("Start"))
-        frame_duration = int(_mp_clip_property("Frames"))
+    fps = float(clip_properties["FPS"])
+    if clip_properties["Type"] == "Video":
+        frame_start = int(clip_properties["Start"])
+        frame_duration = int(clip_properties["Frames"])
     else:
-        audio_duration = str(_mp_clip_property("Duration"))
+        audio_duration = str(clip_properties["Duration"])
         frame_start = 0
         frame_duration = int(utils.timecode_to_frames(
             audio_duration, float(fps)))
@@ -95,13 +144,14 @@ def create_otio_reference(media_pool_item):
         )
 
     # add metadata to otio item
-    add_otio_metadata(otio_ex_ref_item, media_pool_item, **metadata)
+    otio_ex_ref_item.metadata.update(metadata)
 
     return otio_ex_ref_item
 
 
-def create_otio_markers(track_item, fps):
-    track_item_markers = track_item.GetMarkers()
+def create_otio_markers(track_item, fps, track_item_markers=None):
+    if track_item_markers is None:
+        track_item_markers = track_item.GetMarkers()
     markers = []
     for marker_frame in track_item_markers:
         note = track_item_markers[marker_frame]["note"]
@@ -124,44 +174,84 @@ def create_otio_markers(track_item, fps):
     return markers
 
 
-def create_otio_clip(track_item):
-    media_pool_item = track_item.GetMediaPoolItem()
-    _mp_clip_property = media_pool_item.GetClipProperty
+def create_otio_clip(
+    track_item,
+    cache=None,
+    media_pool_item=None,
+    clip_data=None,
+    track_item_markers=None
+):
+    """Return OTIO clip or list of clips per audio channel of track item.
+
+    Args:
+        track_item (resolve.TimelineItem): timeline item
+        cache (dict)[optional]: export cache shared between calls, see
+            `get_media_pool_item_data`
+        media_pool_item (resolve.MediaPoolItem)[optional]: media pool item
+            of the timeline item if already known
+        clip_data (dict)[optional]: already collected clip data of the
+            timeline item, see `ayon_resolve.api.lib.TimelineSnapshot`
+        track_item_markers (dict)[optional]: markers of the timeline item
+            if already known
+
+    Returns:
+        Union[otio.schema.Clip, list[otio.schema.Clip]]: clip or clips
+    """
+    if media_pool_item is None:
+        media_pool_item = track_item.GetMediaPoolItem()
+    data = get_media_pool_item_data(
+        media_pool_item,
+        cache,
+        clip_data.get("mediaPoolItemId") if clip_data else None
+    )
+    clip_properties = data["properties"]
 
     if not self.project_fps:
-        fps = float(_mp_clip_property("FPS"))
+        fps = float(clip_properties["FPS"])
     else:
         fps = self.project_fps
 
-    name = track_item.GetName()
+    if clip_data is None:
+        name = track_item.GetName()
+        left_offset = track_item.GetLeftOffset()
+        duration = track_item.GetDuration()
+    else:
+        name = clip_data["name"]
+        left_offset = clip_data["leftOffset"]
+        duration = clip_data["end"] - clip_data["start"]
 
-    media_reference = create_otio_reference(media_pool_item)
+    media_reference = data["reference"].clone()
+    # relative to the media start, flagged in the clip metadata
     source_range = create_otio_time_range(
-        int(track_item.GetLeftOffset()),
-        int(track_item.GetDuration()),
+        int(left_offset),
+        int(duration),
         fps
     )
 
-    if _mp_clip_property("Type") == "Audio":
+    if clip_properties["Type"] == "Audio":
         return_clips = list()
-        audio_chanels = _mp_clip_property("Audio Ch")
+        audio_chanels = clip_properties["Audio Ch"]
+        markers = create_otio_markers(track_item, fps, track_item_markers)
         for channel in range(0, int(audio_chanels)):
             clip = otio.schema.Clip(
                 name=f"{name}_{channel}",
                 source_range=source_range,
-                media_reference=media_reference
+                media_reference=media_reference,
+                metadata={utils.SOURCE_RANGE_RELATIVE_KEY: True}
             )
-            for marker in create_otio_markers(track_item, fps):
-                clip.markers.append(marker)
+            for marker in markers:
+                clip.markers.append(marker.clone())
             return_clips.append(clip)
         return return_clips
     else:
         clip = otio.schema.Clip(
             name=name,
             source_range=source_range,
-            media_reference=media_reference
+            media_reference=media_reference,
+            metadata={utils.SOURCE_RANGE_RELATIVE_KEY: True}
         )
-        for marker in create_otio_markers(track_item, fps):
+        for marker in create_otio_markers(
+                track_item, fps, track_item_markers):
             clip.markers.append(marker)
 
         return clip
@@ -202,10 +292,16 @@ def _get_timeline_metadata(project, timeline):
 
 
 def _get_metadata_media_pool_item(media_pool_item):
+    return _get_metadata_from_properties(
+        media_pool_item.GetClipProperty() or {},
+        media_pool_item.GetMetadata()
+    )
+
+
+def _get_metadata_from_properties(clip_properties, mp_metadata):
     data = dict()
-    data.update({k: v for k, v in media_pool_item.GetMetadata().items()})
-    property = media_pool_item.GetClipProperty() or {}
-    for name, value in property.items():
+    data.update({k: v for k, v in mp_metadata.items()})
+    for name, value in clip_properties.items():
         if "Resolution" in name and "" != value:
             width, height = value.split("x")
             data.update({
@@ -256,8 +352,19 @@ def add_otio_metadata(otio_item, media_pool_item, **kwargs):
         otio_item.metadata.update({key: value})
 
 
-def create_otio_timeline(resolve_project):
+def create_otio_timeline(resolve_project, snapshot=None, collect_cache=None):
+    """Return current timeline of the project converted to OTIO.
+
+    Args:
+        resolve_project (resolve.Project): project with the timeline
+        snapshot (ayon_resolve.api.lib.TimelineSnapshot)[optional]: already
+            collected items of the current timeline, see `iter_otio_tracks`
+        collect_cache (ayon_resolve.api.collect_cache.CollectCache)
+            [optional]: cache of OTIO clips of unchanged timeline items
 
+    Returns:
+        otio.schema.Timeline: otio timeline
+    """
     # get current timeline
     self.project_fps = resolve_project.GetSetting("timelineFrameRate")
     timeline = resolve_project.GetCurrentTimeline()
@@ -266,60 +373,272 @@ def create_otio_timeline(resolve_project):
     otio_timeline = _create_otio_timeline(
         resolve_project, timeline, self.project_fps)
 
-    # loop all defined track types
-    for track_type in list(self.track_types.keys()):
-        # get total track count
-        track_count = timeline.GetTrackCount(track_type)
+    for otio_track in iter_otio_tracks(timeline, snapshot, collect_cache):
+        # add track to otio timeline
+        otio_timeline.tracks.append(otio_track)
+
+    return otio_timeline
+
+
+def _iter_tracks_clip_data(timeline, track_type, snapshot=None):
+    """Yield track name and clip data of its items for each track.
+
+    Without snapshot the clip data hold only the timeline item, its media
+    pool item and start.
+    """
+    if snapshot is not None:
+        track_names = snapshot.get_track_names(track_type)
+        for track_index, track_name in sorted(track_names.items()):
+            yield track_name, [
+                item_data["clip"]
+                for item_data in snapshot.get_items_by_track_index(
+                    track_index, track_type)
+            ]
+        return
+
+    # get total track count
+    track_count = timeline.GetTrackCount(track_type)
+
+    # loop all tracks by track indexes
+    for track_index in range(1, int(track_count) + 1):
+        # get current track name
+        track_name = timeline.GetTrackName(track_type, track_index)
+
+        # get all track items in current track
+        current_track_items = timeline.GetItemListInTrack(
+            track_type, track_index) or []
+
+        clips_data = []
+        for track_item in current_track_items:
+            media_pool_item = track_item.GetMediaPoolItem()
+            clips_data.append({
+                "item": track_item,
+                "mediaPoolItem": media_pool_item,
+                # offline track items are skipped
+                "start": (
+                    track_item.GetStart() if media_pool_item else None),
+            })
+        yield track_name, clips_data
+
+
+def _get_cached_otio_clips(
+        clip_data, cache, collect_cache, timeline_id):
+    """Return OTIO clips of the item reusing the cached ones if unchanged.
+
+    The markers and fingerprint of the item are added to the clip data.
+    Media of items with cached clips are not queried.
+    """
+    track_item = clip_data["item"]
+    markers = track_item.GetMarkers() or {}
+    fingerprint = collect_cache.get_fingerprint(
+        clip_data, markers, self.project_fps)
+    clip_data["markers"] = markers
+    clip_data["fingerprint"] = fingerprint
+
+    serialized_clips = collect_cache.get(
+        timeline_id, fingerprint, "otioClips")
+    if serialized_clips is not None:
+        return [
+            otio.core.deserialize_json_from_string(serialized_clip)
+            for serialized_clip in serialized_clips
+        ]
+
+    otio_clip = create_otio_clip(
+        track_item,
+        cache,
+        clip_data["mediaPoolItem"],
+        clip_data=clip_data,
+        track_item_markers=markers
+    )
+    otio_clips = otio_clip if isinstance(otio_clip, list) else [otio_clip]
+    collect_cache.set(
+        timeline_id,
+        fingerprint,
+        "otioClips",
+        [
+            otio.core.serialize_json_to_string(clip, indent=-1)
+            for clip in otio_clips
+        ],
+        media_pool_item_id=clip_data["mediaPoolItemId"]
+    )
+    return otio_clips
+
+
+def iter_otio_tracks(timeline, snapshot=None, collect_cache=None):
+    """Yield OTIO tracks of the timeline one by one as they are built.
+
+    Audio clips are split into one track per audio channel so a timeline
+    track can yield multiple OTIO tracks.
+
+    With `snapshot` the items are not collected from the timeline again.
+    With `collect_cache` too, OTIO clips of items unchanged since cached
+    are reused and the `markers` and `fingerprint` of each item are added
+    to its clip data in the snapshot.
 
-        # loop all tracks by track indexes
-        for track_index in range(1, int(track_count) + 1):
-            # get current track name
-            track_name = timeline.GetTrackName(track_type, track_index)
+    Args:
+        timeline (resolve.Timeline): timeline to convert
+        snapshot (ayon_resolve.api.lib.TimelineSnapshot)[optional]: already
+            collected items of the timeline
+        collect_cache (ayon_resolve.api.collect_cache.CollectCache)
+            [optional]: cache of OTIO clips, used only with `snapshot`
 
+    Yields:
+        otio.schema.Track: converted track
+    """
+    timeline_start_frame = timeline.GetStartFrame()
+
+    # clip properties, metadata and references per media pool item
+    cache = {}
+
+    if snapshot is None:
+        collect_cache = None
+    if collect_cache is not None:
+        timeline_id = timeline.GetUniqueId()
+        fingerprints = []
+
+    # loop all defined track types
+    for track_type in list(self.track_types.keys()):
+        for track_name, clips_data in _iter_tracks_clip_data(
+                timeline, track_type, snapshot):
             # convert track to otio
             otio_track = create_otio_track(
                 track_type, track_name)
-
-            # get all track items in current track
-            current_track_items = timeline.GetItemListInTrack(
-                track_type, track_index)
+            # end frame of the last item in otio track relative to
+            # timeline start
+            track_cursor = 0
 
             # loop available track items in current track items
-            for track_item in current_track_items:
+            for clip_data in clips_data:
                 # skip offline track items
-                if track_item.GetMediaPoolItem() is None:
+                if clip_data["mediaPoolItem"] is None:
                     continue
 
                 # calculate real clip start
-                clip_start = track_item.GetStart() - timeline.GetStartFrame()
-
-                add_otio_gap(
-                    clip_start, otio_track, track_item, timeline)
+                clip_start = clip_data["start"] - timeline_start_frame
 
                 # create otio clip and add it to track
-                otio_clip = create_otio_clip(track_item)
-
-                if not isinstance(otio_clip, list):
-                    otio_track.append(otio_clip)
+                if collect_cache is not None:
+                    otio_clips = _get_cached_otio_clips(
+                        clip_data, cache, collect_cache, timeline_id)
+                    fingerprints.append(clip_data["fingerprint"])
                 else:
-                    for index, clip in enumerate(otio_clip):
-                        if index == 0:
-                            otio_track.append(clip)
-                        else:
-                            # add previous otio track to timeline
-                            otio_timeline.tracks.append(otio_track)
-                            # convert track to otio
-                            otio_track = create_otio_track(
-                                track_type, track_name)
-                            add_otio_gap(
-                                clip_start, otio_track,
-                                track_item, timeline)
-                            otio_track.append(clip)
+                    otio_clip = create_otio_clip(
+                        clip_data["item"],
+                        cache,
+                        clip_data["mediaPoolItem"],
+                        clip_data=clip_data if snapshot else None
+                    )
+                    otio_clips = (
+                        otio_clip if isinstance(otio_clip, list)
+                        else [otio_clip]
+                    )
+
+                for index, clip in enumerate(otio_clips):
+                    if index != 0:
+                        # add previous otio track to timeline
+                        yield otio_track
+                        # convert track to otio
+                        otio_track = create_otio_track(
+                            track_type, track_name)
+                        track_cursor = 0
+
+                    # if gap between track end and clip start
+                    if clip_start > track_cursor:
+                        otio_track.append(
+                            create_otio_gap(
+                                track_cursor,
+                                clip_start,
+                                0,
+                                self.project_fps
+                            )
+                        )
+                        track_cursor = clip_start
+
+                    otio_track.append(clip)
+                    track_cursor += clip.source_range.duration.value
 
             # add track to otio timeline
-            otio_timeline.tracks.append(otio_track)
+            yield otio_track
 
-    return otio_timeline
+    if collect_cache is not None:
+        # forget items removed from the timeline
+        collect_cache.retain(timeline_id, fingerprints)
+
+
+def write_otio_timeline_to_file(resolve_project, path):
+    """Export current timeline of the project to an OTIO file track by track.
+
+    Unlike `create_otio_timeline` with `write_to_file` the tracks are
+    serialized and written as soon as they are converted, so the whole OTIO
+    timeline is never held in memory. The written file is identical to the
+    one written by the `otio_json` adapter.
+
+    Args:
+        resolve_project (resolve.Project): project with the timeline
+        path (str): path to the .otio file to write
+    """
+    self.project_fps = resolve_project.GetSetting("timelineFrameRate")
+    timeline = resolve_project.GetCurrentTimeline()
+
+    otio_timeline = _create_otio_timeline(
+        resolve_project, timeline, self.project_fps)
+
+    # serialize the timeline with a placeholder track to know where in the
+    # json the tracks go and how deep they are indented
+    placeholder_track = otio.schema.Track(name="__otio_stream_placeholder__")
+    otio_timeline.tracks.append(placeholder_track)
+    skeleton = _serialize_otio(otio_timeline)
+    placeholder = _serialize_otio(placeholder_track)
+    otio_timeline.tracks.remove(placeholder_track)
+
+    indent = None
+    for candidate in range(0, len(skeleton), 4):
+        if _indent_json(placeholder, candidate) in skeleton:
+            indent = candidate
+            break
+
+    if indent is None:
+        # unexpected json layout, fall back to the in memory export
+        for otio_track in iter_otio_tracks(timeline):
+            otio_timeline.tracks.append(otio_track)
+        write_to_file(otio_timeline, path)
+        return
+
+    prefix, suffix = skeleton.split(_indent_json(placeholder, indent), 1)
+    # write next to the target first so a failed export does not leave
+    # a truncated file behind
+    tmp_path = "{}.tmp".format(path)
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as stream:
+            track_count = 0
+            for otio_track in iter_otio_tracks(timeline):
+                if track_count == 0:
+                    stream.write(prefix)
+                else:
+                    stream.write(",\n")
+                stream.write(
+                    _indent_json(_serialize_otio(otio_track), indent))
+                track_count += 1
+
+            if track_count:
+                stream.write(suffix)
+            else:
+                # timeline without tracks serializes as empty list
+                stream.write(_serialize_otio(otio_timeline))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _serialize_otio(otio_item):
+    return otio.adapters.write_to_string(otio_item, "otio_json")
+
+
+def _indent_json(json_string, indent):
+    prefix = " " * indent
+    return "\n".join(prefix + line for line in json_string.split("\n"))
 
 
 def write_to_file(otio_timeline, path):
@@ -1,50 +1,365 @@
+import os
+import re
 import sys
 import json
-import DaVinciResolveScript
 import opentimelineio as otio
+from . import utils
 
 
 self = sys.modules[__name__]
-self.resolve = DaVinciResolveScript.scriptapp('Resolve')
-self.fusion = DaVinciResolveScript.scriptapp('Fusion')
-self.project_manager = self.resolve.GetProjectManager()
-self.current_project = self.project_manager.GetCurrentProject()
-self.media_pool = self.current_project.GetMediaPool()
+self.resolve = None
+self.fusion = None
+self.project_manager = None
 self.track_types = {
     "video": otio.schema.TrackKind.Video,
     "audio": otio.schema.TrackKind.Audio
 }
+self.media_types = {
+    otio.schema.TrackKind.Video: 1,
+    otio.schema.TrackKind.Audio: 2
+}
 self.project_fps = None
+self.media_pool_folder_name = "otioImport"
+
+
+def get_project_manager():
+    """Return Resolve project manager, connect to Resolve on first call.
+
+    The connection is made lazily so importing this module does not
+    require a running Resolve.
+    """
+    if self.project_manager is None:
+        import DaVinciResolveScript
+
+        self.resolve = DaVinciResolveScript.scriptapp("Resolve")
+        self.fusion = DaVinciResolveScript.scriptapp("Fusion")
+        self.project_manager = self.resolve.GetProjectManager()
+    return self.project_manager
+
+
+def get_current_project():
+    return get_project_manager().GetCurrentProject()
+
+
+def build_timeline(otio_timeline, project=None):
+    """Build Resolve timeline from OTIO timeline.
+
+    All media references are de-duplicated and imported into the
+    `otioImport` media pool folder at once, every track is then added to
+    the timeline with a single `AppendToTimeline` call.
+
+    Args:
+        otio_timeline (otio.schema.Timeline): timeline to build
+        project (resolve.Project)[optional]: project to build the timeline
+            in, defaults to current project
+
+    Returns:
+        resolve.Timeline: the created timeline
+    """
+    if project is None:
+        project = get_current_project()
+    media_pool = project.GetMediaPool()
+    self.project_fps = float(project.GetSetting("timelineFrameRate"))
+
+    # import all media before the timeline is created
+    folder = _build_media_pool_folder(media_pool, self.media_pool_folder_name)
+    media_pool_items = _build_media_pool_items(
+        media_pool, folder, otio_timeline.find_clips())
+
+    timeline = _build_empty_timeline(project, otio_timeline)
+    timeline_start_frame = timeline.GetStartFrame()
+
+    track_indexes = {kind: 0 for kind in self.media_types}
+    for otio_track in otio_timeline.tracks:
+        if otio_track.kind not in self.media_types:
+            continue
+
+        track_indexes[otio_track.kind] += 1
+        _build_track(
+            media_pool,
+            timeline,
+            otio_track,
+            track_indexes[otio_track.kind],
+            timeline_start_frame,
+            media_pool_items
+        )
+
+    return timeline
+
+
+def _build_empty_timeline(project, otio_timeline):
+    media_pool = project.GetMediaPool()
+
+    # timeline names are unique in a project
+    existing_names = {
+        project.GetTimelineByIndex(index + 1).GetName()
+        for index in range(project.GetTimelineCount())
+    }
+    base_name = otio_timeline.name or self.media_pool_folder_name
+    name = base_name
+    index = 1
+    while name in existing_names:
+        name = "{}_{}".format(base_name, index)
+        index += 1
+
+    timeline = media_pool.CreateEmptyTimeline(name)
+    project.SetCurrentTimeline(timeline)
+
+    if otio_timeline.global_start_time is not None:
+        timeline.SetStartTimecode(
+            otio.opentime.to_timecode(
+                otio_timeline.global_start_time,
+                otio_timeline.global_start_time.rate
+            )
+        )
+    return timeline
+
+
+def _build_track(
+    media_pool,
+    timeline,
+    otio_track,
+    track_index,
+    timeline_start_frame,
+    media_pool_items
+):
+    """Add all clips of the OTIO track to the timeline at once.
+
+    Gaps are not built, clips are placed by their record frame.
+
+    Returns:
+        list[resolve.TimelineItem]: created timeline items
+    """
+    track_type = next(
+        key for key, kind in self.track_types.items()
+        if kind == otio_track.kind
+    )
+    while timeline.GetTrackCount(track_type) < track_index:
+        if track_type == "audio":
+            timeline.AddTrack(track_type, "stereo")
+        else:
+            timeline.AddTrack(track_type)
+
+    ranges = otio_track.range_of_all_children()
+    otio_clips = []
+    clip_infos = []
+    for otio_clip in otio_track:
+        if not isinstance(otio_clip, otio.schema.Clip):
+            continue
+
+        media_key = _get_media_key(otio_clip.media_reference)
+        media_pool_item = media_pool_items.get(media_key)
+        if media_pool_item is None:
+            print("Skipping clip without media: {}".format(otio_clip.name))
+            continue
+
+        otio_clips.append(otio_clip)
+        clip_infos.append(
+            _build_track_item(
+                otio_clip,
+                ranges[otio_clip],
+                media_pool_item,
+                track_index,
+                timeline_start_frame
+            )
+        )
+
+    if not clip_infos:
+        return []
 
+    timeline_items = media_pool.AppendToTimeline(clip_infos) or []
+    if len(timeline_items) == len(clip_infos):
+        placed = list(zip(otio_clips, timeline_items))
+    else:
+        print("Failed to add all clips to track: {}".format(otio_track.name))
+        # match placed items to their clips by record frame, clips of
+        # a track do not overlap
+        otio_clips_by_frame = {
+            clip_info["recordFrame"]: otio_clip
+            for otio_clip, clip_info in zip(otio_clips, clip_infos)
+        }
+        placed = [
+            (otio_clips_by_frame.get(timeline_item.GetStart()), timeline_item)
+            for timeline_item in timeline_items
+            if timeline_item
+        ]
+
+    # add markers once all clips of the track are placed
+    valid_items = []
+    for otio_clip, timeline_item in placed:
+        # Resolve may return invalid item for failed clips
+        if not timeline_item or timeline_item.GetDuration() is None:
+            continue
+        valid_items.append(timeline_item)
+        if otio_clip is None:
+            continue
+        for otio_marker in otio_clip.markers:
+            _build_marker(timeline_item, otio_marker)
+
+    return valid_items
+
+
+def _build_media_pool_items(media_pool, folder, otio_clips):
+    """Import media of all clips with one `ImportMedia` call per kind.
+
+    Resolve requires sequences as clipInfo dicts but single files as
+    plain paths so sequences and single files are imported separately.
+
+    Returns:
+        dict: media pool item by media key of `_get_media_key`
+    """
+    import_infos = {}
+    for otio_clip in otio_clips:
+        media_key = _get_media_key(otio_clip.media_reference)
+        if media_key is None or media_key in import_infos:
+            continue
+        import_infos[media_key] = _build_media_pool_item(
+            otio_clip.media_reference)
+
+    media_pool.SetCurrentFolder(folder)
+
+    media_pool_items = {}
+    for is_sequence in (True, False):
+        keys = [
+            key for key, info in import_infos.items()
+            if isinstance(info, dict) is is_sequence
+        ]
+        if not keys:
+            continue
+
+        items = media_pool.ImportMedia(
+            [import_infos[key] for key in keys]) or []
+        if len(items) == len(keys):
+            media_pool_items.update(zip(keys, items))
+            continue
+
+        # some media failed to import, match the rest by file path
+        for item in items:
+            file_path = item.GetClipProperty("File Path")
+            media_key = _get_media_key_from_path(file_path)
+            if media_key in import_infos:
+                media_pool_items[media_key] = item
+
+    for media_key in import_infos:
+        if media_key not in media_pool_items:
+            print("Failed to import media: {}".format(media_key[0]))
+
+    return media_pool_items
+
+
+def _get_media_key(otio_media_reference):
+    """Return hashable key identifying the media of the reference.
+
+    Returns:
+        Union[tuple[str, Union[int, None]], None]: normalized path with
+            start frame for sequences, None if reference has no media
+    """
+    import_info = _build_media_pool_item(otio_media_reference)
+    if import_info is None:
+        return None
+
+    if isinstance(import_info, dict):
+        return (
+            os.path.normpath(import_info["FilePath"]),
+            import_info["StartIndex"]
+        )
+    return (os.path.normpath(import_info), None)
 
-def build_timeline(otio_timeline):
-    # TODO: build timeline in mediapool `otioImport` folder
-    # TODO: loop otio tracks and build them in the new timeline
-    for clip in otio_timeline.each_clip():
-        # TODO: create track item
-        print(clip.name)
-        print(clip.parent().name)
-        print(clip.range_in_parent())
 
+def _get_media_key_from_path(file_path):
+    """Return media key from Resolve "File Path" clip property."""
+    first_frame = re.findall(r"\[(\d+)\-\d+\]", file_path)
+    if not first_frame:
+        return (os.path.normpath(file_path), None)
 
-def _build_track(otio_track):
-    # TODO: _build_track
-    pass
+    pattern = utils.get_reformated_path(file_path, padded=True)
+    return (os.path.normpath(pattern), int(first_frame[0]))
 
 
 def _build_media_pool_item(otio_media_reference):
-    # TODO: _build_media_pool_item
-    pass
+    """Return `ImportMedia` input for the OTIO media reference.
+
+    Returns:
+        Union[dict, str, None]: clipInfo dict for sequences, path for
+            single files or None for references without media
+    """
+    available_range = getattr(otio_media_reference, "available_range", None)
 
+    if isinstance(otio_media_reference, otio.schema.ImageSequenceReference):
+        start_frame = otio_media_reference.start_frame
+        frame_count = otio_media_reference.number_of_images_in_sequence()
+        file_path = "{}{}%0{}d{}".format(
+            otio_media_reference.target_url_base,
+            otio_media_reference.name_prefix,
+            otio_media_reference.frame_zero_padding,
+            otio_media_reference.name_suffix
+        )
+        return {
+            "FilePath": file_path,
+            "StartIndex": start_frame,
+            "EndIndex": start_frame + frame_count - 1,
+        }
 
-def _build_track_item(otio_clip):
-    # TODO: _build_track_item
-    pass
+    target_url = getattr(otio_media_reference, "target_url", None)
+    if not target_url:
+        return None
 
+    # sequences exported as `ExternalReference` with padded path
+    if re.search(r"%0?\d*d", target_url) and available_range is not None:
+        start_frame = int(available_range.start_time.value)
+        frame_count = int(available_range.duration.value)
+        return {
+            "FilePath": target_url,
+            "StartIndex": start_frame,
+            "EndIndex": start_frame + frame_count - 1,
+        }
 
-def _build_gap(otio_clip):
-    # TODO: _build_gap
-    pass
+    return target_url
+
+
+def _build_track_item(
+    otio_clip,
+    range_in_track,
+    media_pool_item,
+    track_index,
+    timeline_start_frame
+):
+    """Return `AppendToTimeline` clipInfo for the OTIO clip.
+
+    Args:
+        otio_clip (otio.schema.Clip): clip to build
+        range_in_track (otio.opentime.TimeRange): range of clip in track
+        media_pool_item (resolve.MediaPoolItem): media of the clip
+        track_index (int): index of the track to place the clip on
+        timeline_start_frame (int): start frame of the timeline
+
+    Returns:
+        dict: clipInfo
+    """
+    available_range = otio_clip.media_reference.available_range
+    source_range = otio_clip.source_range or otio_clip.available_range()
+
+    # source range is in media time, e.g. starts at 1010 for media
+    # starting at 1001, unless flagged as relative to the media start by
+    # the exporter of this addon, see `davinci_export.create_otio_clip`
+    start_frame = int(source_range.start_time.value)
+    if (
+        otio_clip.metadata.get(utils.SOURCE_RANGE_RELATIVE_KEY)
+        and available_range is not None
+    ):
+        start_frame += int(available_range.start_time.value)
+    duration = int(source_range.duration.value)
+    record_frame = timeline_start_frame + int(
+        otio.opentime.to_frames(range_in_track.start_time, self.project_fps))
+
+    return {
+        "mediaPoolItem": media_pool_item,
+        "startFrame": start_frame,
+        "endFrame": start_frame + duration - 1,
+        "mediaType": self.media_types[otio_clip.parent().kind],
+        "trackIndex": track_index,
+        "recordFrame": record_frame,
+    }
 
 
 def _build_marker(track_item, otio_marker):
@@ -52,14 +367,14 @@ def _build_marker(track_item, otio_marker):
     frame_duration = otio_marker.marked_range.duration.value
 
     # marker attributes
-    frameId = (frame_start / 10) * 10
     color = otio_marker.color
     name = otio_marker.name
-    note = otio_marker.metadata.get("note") or json.dumps(otio_marker.metadata)
-    duration = (frame_duration / 10) * 10
+    note = otio_marker.metadata.get("note") or json.dumps(
+        otio_marker.metadata, default=_otio_value_to_json)
+    duration = frame_duration
 
     track_item.AddMarker(
-        frameId,
+        frame_start,
         color,
         name,
         note,
@@ -67,13 +382,21 @@ def _build_marker(track_item, otio_marker):
     )
 
 
-def _build_media_pool_folder(name):
+def _otio_value_to_json(value):
+    # OTIO metadata containers are not json serializable directly
+    if hasattr(value, "keys"):
+        return dict(value)
+    return list(value)
+
+
+def _build_media_pool_folder(media_pool, name):
     """
     Returns folder with input name and sets it as current folder.
 
     It will create new media bin if none is found in root media bin
 
     Args:
+        media_pool (resolve.MediaPool): media pool of the project
         name (str): name of bin
 
     Returns:
@@ -81,28 +404,26 @@ def _build_media_pool_folder(name):
 
     """
 
-    root_folder = self.media_pool.GetRootFolder()
+    root_folder = media_pool.GetRootFolder()
     sub_folders = root_folder.GetSubFolderList()
-    testing_names = list()
-
-    for subfolder in sub_folders:
-        subf_name = subfolder.GetName()
-        if name in subf_name:
-            testing_names.append(subfolder)
-        else:
-            testing_names.append(False)
 
-    matching = next((f for f in testing_names if f is not False), None)
+    matching = next(
+        (
+            subfolder for subfolder in sub_folders
+            if name in subfolder.GetName()
+        ),
+        None
+    )
 
     if not matching:
-        new_folder = self.media_pool.AddSubFolder(root_folder, name)
-        self.media_pool.SetCurrentFolder(new_folder)
+        new_folder = media_pool.AddSubFolder(root_folder, name)
+        media_pool.SetCurrentFolder(new_folder)
     else:
-        self.media_pool.SetCurrentFolder(matching)
+        media_pool.SetCurrentFolder(matching)
 
-    return self.media_pool.GetCurrentFolder()
+    return media_pool.GetCurrentFolder()
 
 
 def read_from_file(otio_file):
     otio_timeline = otio.adapters.read_from_file(otio_file)
-    build_timeline(otio_timeline)
+    return build_timeline(otio_timeline)
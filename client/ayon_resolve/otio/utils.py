@@ -1,6 +1,11 @@
 import re
 import opentimelineio as otio
 
+# metadata key of OTIO clips with source range relative to the start of
+# their media, as written by `davinci_export.create_otio_clip`, instead of
+# in media time
+SOURCE_RANGE_RELATIVE_KEY = "resolveSourceRangeRelative"
+
 
 def timecode_to_frames(timecode, framerate):
     rt = otio.opentime.from_timecode(timecode, 24)
@@ -263,10 +263,17 @@ class CreateShotClip(plugin.Creator):
             "sq_markers": sq_markers
         }
         print(kwargs)
+        items_with_data = []
         for i, track_item_data in enumerate(sorted_selected_track_items):
             self.rename_index = i
             self.log.info(track_item_data)
             # convert track item to timeline media pool item
-            track_item = plugin.PublishClip(
-                self, track_item_data, **kwargs).convert()
-            track_item.SetClipColor(lib.publish_clip_color)
+            tag_data = plugin.PublishClip(
+                self, track_item_data, **kwargs).get_tag_data()
+            if tag_data is None:
+                continue
+            items_with_data.append(
+                (track_item_data["clip"]["item"], tag_data))
+
+        # imprint all clips at once with publish clip color
+        lib.imprint_many(items_with_data, lib.publish_clip_color)
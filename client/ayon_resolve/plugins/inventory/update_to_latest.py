@@ -0,0 +1,32 @@
+from ayon_core.pipeline import (
+    InventoryAction,
+    get_current_project_name,
+)
+from ayon_core.pipeline.load.utils import update_container
+
+from ayon_resolve.api import lib
+
+
+class UpdateSelectedToLatest(InventoryAction):
+
+    label = "Update Selected to Latest"
+    icon = "angle-double-up"
+    color = "#d8d8d8"
+    order = -1
+
+    @staticmethod
+    def is_compatible(container):
+        return container.get("loader") in {"LoadClip", "LoadMedia"}
+
+    def process(self, containers):
+        # resolve the last versions of all selected containers with a few
+        # requests, coloring of the updated items is served from the cache
+        lib.last_version_cache.cache_representations(
+            get_current_project_name(),
+            {container["representation"] for container in containers}
+        )
+
+        for container in containers:
+            update_container(container, -1)
+
+        return True
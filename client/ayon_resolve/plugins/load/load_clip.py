@@ -1,6 +1,5 @@
-import ayon_api
-
 from ayon_resolve.api import lib, plugin
+from ayon_resolve.api.profiler import profile_operation
 from ayon_resolve.api.pipeline import (
     containerise,
     update_container,
@@ -37,6 +36,7 @@ class LoadClip(plugin.TimelineItemLoader):
     clip_color_last = "Olive"
     clip_color = "Orange"
 
+    @profile_operation("LoadClip.load")
     def load(self, context, name, namespace, options):
 
         # load clip to timeline and get main variables
@@ -63,6 +63,7 @@ class LoadClip(plugin.TimelineItemLoader):
     def switch(self, container, context):
         self.update(container, context)
 
+    @profile_operation("LoadClip.update")
     def update(self, container, context):
         """ Updating previously loaded clips
         """
@@ -126,22 +127,13 @@ class LoadClip(plugin.TimelineItemLoader):
     @classmethod
     def set_item_color(cls, project_name, timeline_item, version_entity):
         """Color timeline item based on whether it is outdated or latest"""
-        # get all versions in list
-        last_version_entity = ayon_api.get_last_version_by_product_id(
-            project_name,
-            version_entity["productId"],
-            fields=["name"]
-        )
-        last_version_id = None
-        if last_version_entity:
-            last_version_id = last_version_entity["id"]
-
         # set clip colour
-        if version_entity["id"] == last_version_id:
+        if lib.last_version_cache.is_latest(project_name, version_entity):
             timeline_item.SetClipColor(cls.clip_color_last)
         else:
             timeline_item.SetClipColor(cls.clip_color)
 
+    @profile_operation("LoadClip.remove")
     def remove(self, container):
         timeline_item = container["_timeline_item"]
         media_pool_item = timeline_item.GetMediaPoolItem()
@@ -155,12 +147,7 @@ class LoadClip(plugin.TimelineItemLoader):
         else:
             # Resolve versions older than 18.5 can't delete clips via API
             # so all we can do is just remove the pype marker to 'untag' it
-            if lib.get_pype_marker(timeline_item):
-                # Note: We must call `get_pype_marker` because
-                # `delete_pype_marker` uses a global variable set by
-                # `get_pype_marker` to delete the right marker
-                # TODO: Improve code to avoid the global `temp_marker_frame`
-                lib.delete_pype_marker(timeline_item)
+            lib.delete_pype_marker(timeline_item)
 
         # if media pool item has no remaining usages left
         # remove it from the media pool
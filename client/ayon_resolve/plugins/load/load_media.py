@@ -4,14 +4,14 @@ from pathlib import Path
 from collections import defaultdict
 from typing import Union, List, Optional, TypedDict, Tuple
 
-from ayon_api import version_is_latest
+from qtpy import QtCore
+
 from ayon_core.lib import StringTemplate
 from ayon_core.pipeline.colorspace import get_remapped_colorspace_to_native
 from ayon_core.pipeline import (
     Anatomy,
     LoaderPlugin,
     get_representation_path,
-    registered_host
 )
 from ayon_core.pipeline.load import get_representation_path_with_anatomy
 from ayon_core.lib.transcoding import (
@@ -19,8 +19,15 @@ from ayon_core.lib.transcoding import (
     IMAGE_EXTENSIONS
 )
 from ayon_core.lib import BoolDef
-from ayon_resolve.api import lib
-from ayon_resolve.api.pipeline import AVALON_CONTAINER_ID
+from ayon_resolve.api import lib, jobs
+from ayon_resolve.api.profiler import profile_operation
+from ayon_resolve.api.path_probe import path_probe, format_frame_ranges
+from ayon_resolve.api.collect_cache import mark_media_pool_items_changed
+from ayon_resolve.api.pipeline import (
+    AVALON_CONTAINER_ID,
+    cache_container_last_versions,
+    media_pool_containers
+)
 
 
 FRAME_SPLITTER = "__frame_splitter__"
@@ -92,6 +99,10 @@ def find_clip_usage(media_pool_item, project=None):
     Each entry in the list is a tuple of Timeline and TimelineItem so that
     it's easy to know which Timeline the TimelineItem belongs to.
 
+    The usage is looked up in the project wide `lib.clip_usage_index`, use
+    `lib.clip_usage_index.find_many` to find the usage of many media pool
+    items with one traversal of the timelines.
+
     Arguments:
         media_pool_item (MediaPoolItem): The Media Pool Item to search for.
         project (Project): The resolve project the media pool item resides in.
@@ -101,37 +112,7 @@ def find_clip_usage(media_pool_item, project=None):
             the timeline item.
 
     """
-    usage = int(media_pool_item.GetClipProperty("Usage"))
-    if not usage:
-        return []
-
-    if project is None:
-        project = lib.get_current_project()
-
-    matching_items = []
-    unique_id = media_pool_item.GetUniqueId()
-    for timeline_idx in range(project.GetTimelineCount()):
-        timeline = project.GetTimelineByIndex(timeline_idx + 1)
-
-        # Consider audio and video tracks
-        for track_type in ["video", "audio"]:
-            for track_idx in range(timeline.GetTrackCount(track_type)):
-                timeline_items = timeline.GetItemListInTrack(track_type,
-                                                             track_idx + 1)
-                for timeline_item in timeline_items:
-                    timeline_item_mpi = timeline_item.GetMediaPoolItem()
-                    if not timeline_item_mpi:
-                        continue
-
-                    if timeline_item_mpi.GetUniqueId() == unique_id:
-                        matching_items.append((timeline, timeline_item))
-                        usage -= 1
-                        if usage <= 0:
-                            # If there should be no usage left after this found
-                            # entry we return early
-                            return matching_items
-
-    return matching_items
+    return lib.clip_usage_index.find(media_pool_item, project=project)
 
 
 class LoadMedia(LoaderPlugin):
@@ -175,8 +156,13 @@ class LoadMedia(LoaderPlugin):
 
     media_pool_bin_path = "Loader/{folder[path]}"
 
+    load_in_background = False
+
     metadata: List[MetadataEntry] = []
 
+    # contexts and options of `load` calls waiting for `_load_pending`
+    _pending_loads = None
+
     # cached on apply settings
     _host_imageio_settings = None
 
@@ -186,110 +172,406 @@ class LoadMedia(LoaderPlugin):
         cls._host_imageio_settings = project_settings["resolve"]["imageio"]
 
     def load(self, context, name, namespace, options):
+        if self.load_in_background and jobs.is_available():
+            # Store the timeline on submit, it should not matter which
+            # timeline is current by the time the job runs
+            if self.timeline is None:
+                self.timeline = lib.get_current_timeline()
+            jobs.get_job_queue().submit(
+                LoadMediaJob(self, [context], options))
+            return
+
+        if jobs.is_available():
+            # The loader calls `load` for each selected representation right
+            # after each other, load them in one batch once the event loop
+            # is back
+            self._add_pending_load(context, options)
+            return
+
+        self.load_batch([context], options)
+
+    def _add_pending_load(self, context, options):
+        cls = self.__class__
+        if cls._pending_loads is None:
+            cls._pending_loads = []
+            # Store the timeline on first load, the current timeline can
+            # change with the imported media
+            if self.timeline is None:
+                self.timeline = lib.get_current_timeline()
+            QtCore.QTimer.singleShot(0, self._load_pending)
+        cls._pending_loads.append((context, options))
+
+    def _load_pending(self):
+        cls = self.__class__
+        pending, cls._pending_loads = cls._pending_loads, None
+
+        # consecutive loads with the same options are loaded at once
+        batches = []
+        for context, options in pending:
+            if batches and batches[-1][1] == options:
+                batches[-1][0].append(context)
+            else:
+                batches.append(([context], options))
+
+        for contexts, options in batches:
+            try:
+                self.load_batch(contexts, options)
+            except Exception:
+                self.log.error(
+                    "Failed to load {} representations.".format(
+                        len(contexts)),
+                    exc_info=True
+                )
+
+    def load_batch(self, contexts, options=None):
+        """Load multiple representations at once.
+
+        Representations are grouped by their target bin and each group is
+        imported with a single `ImportMedia` call. The latest version state
+        of all versions is resolved with one server query and all media are
+        added to the timeline with a single `AppendToTimeline` call.
+
+        Args:
+            contexts (list[dict]): representation contexts to load
+            options (dict)[optional]: loader options
+
+        Returns:
+            list[resolve.MediaPoolItem]: loaded media pool items
+        """
+        if not contexts:
+            return []
+
+        prepared = self.prepare_batch(contexts, options)
+        loaded_items = self.load_prepared(prepared)
+        if len(loaded_items) != len(contexts):
+            raise RuntimeError(
+                "Failed to import {} of {} representations. "
+                "See log for details.".format(
+                    len(contexts) - len(loaded_items), len(contexts))
+            )
+
+        return loaded_items
+
+    def prepare_batch(self, contexts, options=None):
+        """Prepare loading of the representations without touching Resolve.
+
+        Resolves the bin paths and files of all representations, checks the
+        files exist and queries the latest version state. This makes no
+        Resolve API calls so it can run in a background thread.
+
+        Args:
+            contexts (list[dict]): representation contexts to load
+            options (dict)[optional]: loader options
+
+        Returns:
+            dict: data for `load_prepared`
+        """
+        self._project_name = contexts[0]["project"]["name"]
+        anatomy = Anatomy(self._project_name)
+        file_infos = {
+            index: self._get_file_info(context, anatomy)
+            for index, context in enumerate(contexts)
+        }
+        return {
+            "contexts": contexts,
+            "options": options or {},
+            "bin_paths": [
+                self._get_bin_path(context) for context in contexts
+            ],
+            "file_infos": file_infos,
+            "missing": self._get_missing_file_infos(file_infos),
+            "colors": self.get_item_colors(contexts),
+        }
+
+    @profile_operation("LoadMedia.load")
+    def load_prepared(self, prepared, indexes=None):
+        """Load prepared representations into Resolve.
+
+        Args:
+            prepared (dict): result of `prepare_batch`
+            indexes (Iterable[int])[optional]: load only the
+                representations with these indexes, all by default
+
+        Returns:
+            list[resolve.MediaPoolItem]: loaded media pool items
+        """
+        contexts = prepared["contexts"]
+        options = prepared["options"]
+        if indexes is None:
+            indexes = range(len(contexts))
 
         # For loading multiselection, we store timeline before first load
         # because the current timeline can change with the imported media.
         if self.timeline is None:
             self.timeline = lib.get_current_timeline()
 
-        representation = context["representation"]
-        self._project_name = context["project"]["name"]
-
         project = lib.get_current_project()
         media_pool = project.GetMediaPool()
 
+        items = {}
+
         # Allow to use an existing media pool item and re-use it
-        item = None
         if options.get("load_once", True):
-            host = registered_host()
-            repre_id = context["representation"]["id"]
-            for container in host.ls():
-                if container["representation"] != repre_id:
-                    continue
-
-                if container["loader"] != self.__class__.__name__:
-                    continue
+            items.update(self._find_loaded_items(contexts, indexes))
+
+        # Group the media to import by their target bin
+        indexes_by_bin_path = defaultdict(list)
+        for index in indexes:
+            if (
+                items.get(index) is not None
+                or index in prepared["missing"]
+            ):
+                continue
+            indexes_by_bin_path[prepared["bin_paths"][index]].append(index)
+
+        for bin_path, bin_indexes in indexes_by_bin_path.items():
+            imported_items = self._import_media_to_bin(
+                [contexts[index] for index in bin_indexes],
+                [prepared["file_infos"][index] for index in bin_indexes],
+                media_pool,
+                bin_path
+            )
+            items.update(zip(bin_indexes, imported_items))
 
-                print(f"Re-using existing container: {container}")
-                item = container["_item"]
+        loaded = [
+            (index, items[index])
+            for index in indexes
+            if items.get(index) is not None
+        ]
 
-        if item is None:
-            item = self._import_media_to_bin(context, media_pool, representation)
         # Always update clip color - even if re-using existing clip
-        color = self.get_item_color(context)
-        item.SetClipColor(color)
+        for index, item in loaded:
+            item.SetClipColor(prepared["colors"][index])
 
+        loaded_items = [item for _, item in loaded]
         if options.get("load_to_timeline", True):
             timeline = options.get("timeline", self.timeline)
             if timeline:
                 # Add media to active timeline
-                lib.create_timeline_item(
-                    media_pool_item=item,
-                    timeline=timeline
+                lib.create_timeline_items(loaded_items, timeline=timeline)
+
+        return loaded_items
+
+    def _find_loaded_items(self, contexts, indexes):
+        """Return media pool items of already loaded representations.
+
+        Args:
+            contexts (list[dict]): representation contexts
+            indexes (Iterable[int]): indexes of the contexts to look up
+
+        Returns:
+            dict[int, resolve.MediaPoolItem]: media pool item by index of
+                the context, representations not loaded are not included
+        """
+        indexes = list(indexes)
+        containers_by_repre_id = (
+            media_pool_containers.find_by_representations(
+                contexts[index]["representation"]["id"]
+                for index in indexes
+            )
+        )
+
+        items = {}
+        for index in indexes:
+            repre_id = contexts[index]["representation"]["id"]
+            for container in containers_by_repre_id.get(repre_id, []):
+                if container["loader"] != self.__class__.__name__:
+                    continue
+
+                print(f"Re-using existing container: {container}")
+                items[index] = container["_item"]
+        return items
+
+    def _get_bin_path(self, context):
+        """Return media pool bin path for the context.
+
+        Returns:
+            Union[str, None]: bin path or None to use current bin
+        """
+        if not self.media_pool_bin_path:
+            return None
+
+        media_pool_bin_path = StringTemplate(
+            self.media_pool_bin_path).format_strict(context)
+        # double slashes will create unconnected folders
+        return media_pool_bin_path.replace("//", "/")
+
+    def _get_missing_file_infos(self, file_infos):
+        """Return keys of file infos whose media do not exist.
+
+        The filesystem is probed for all media at once. Sequences with
+        some frames missing are only reported and still imported.
+
+        Args:
+            file_infos (dict[Any, Tuple[bool, dict]]): results of
+                `_get_file_info` by any key
+
+        Returns:
+            set: keys of the file infos without any existing file
+        """
+        sequence_keys = [
+            key for key, (is_sequence, _) in file_infos.items()
+            if is_sequence
+        ]
+        file_keys = [
+            key for key, (is_sequence, _) in file_infos.items()
+            if not is_sequence
+        ]
+
+        missing = set()
+        results = path_probe.check_sequences(
+            (
+                file_infos[key][1]["FilePath"],
+                file_infos[key][1]["StartIndex"],
+                file_infos[key][1]["EndIndex"],
+            )
+            for key in sequence_keys
+        )
+        for key, result in zip(sequence_keys, results):
+            file_path = file_infos[key][1]["FilePath"]
+            if not result["exists"]:
+                missing.add(key)
+                self.log.error(f"Media not found: {file_path}")
+            elif result["missing_frames"]:
+                self.log.warning(
+                    "Sequence {} is missing frames: {}".format(
+                        file_path,
+                        format_frame_ranges(result["missing_frames"])
+                    )
                 )
 
-    def _import_media_to_bin(
-        self, context, media_pool, representation
-    ):
+        existing = set(path_probe.get_existing(
+            file_infos[key][1]["FilePath"] for key in file_keys
+        ))
+        for key in file_keys:
+            file_path = file_infos[key][1]["FilePath"]
+            if file_path not in existing:
+                missing.add(key)
+                self.log.error(f"Media not found: {file_path}")
+
+        return missing
+
+    def _import_media_to_bin(self, contexts, file_infos, media_pool, bin_path):
         """Import media to Resolve Media Pool.
 
         Also create a bin if `media_pool_bin_path` is set.
 
         Args:
-            context (dict): The context dictionary.
+            contexts (list[dict]): The context dictionaries.
+            file_infos (list[Tuple[bool, dict]]): The file info of each
+                context, see `_get_file_info`.
             media_pool (resolve.MediaPool): The Resolve Media Pool.
-            representation (dict): The representation data.
+            bin_path (Union[str, None]): The bin path to import into, if
+                not set the media is added into the current active bin.
 
         Returns:
-            resolve.MediaPoolItem: The imported media pool item.
+            list[Union[resolve.MediaPoolItem, None]]: The imported media
+                pool items in order of the contexts, None for media which
+                failed to import.
         """
         # Create or set the bin folder, we add it in there
         # If bin path is not set we just add into the current active bin
-        if self.media_pool_bin_path:
-            media_pool_bin_path = StringTemplate(
-                self.media_pool_bin_path).format_strict(context)
-
+        if bin_path:
             folder = lib.create_bin(
-                # double slashes will create unconnected folders
-                name=media_pool_bin_path.replace("//", "/"),
+                name=bin_path,
                 root=media_pool.GetRootFolder(),
                 set_as_current=False
             )
             media_pool.SetCurrentFolder(folder)
+        else:
+            folder = media_pool.GetCurrentFolder()
 
         # Import media
         # Resolve API: ImportMedia function requires a list of dictionaries
         # with keys "FilePath", "StartIndex" and "EndIndex" for sequences
         # but only string with absolute path for single files.
-        is_sequence, file_info = self._get_file_info(context)
-        items = (
-            media_pool.ImportMedia([file_info])
-            if is_sequence
-            else media_pool.ImportMedia([file_info["FilePath"]])
-        )
-        assert len(items) == 1, "Must import only one media item"
+        # Hence we import all sequences and all single files at once.
+        indexes_by_is_sequence = defaultdict(list)
+        for index, (is_sequence, _) in enumerate(file_infos):
+            indexes_by_is_sequence[is_sequence].append(index)
+        file_infos = [file_info for _, file_info in file_infos]
+
+        results = [None] * len(contexts)
+        for is_sequence, indexes in indexes_by_is_sequence.items():
+            import_infos = [
+                file_infos[index] if is_sequence
+                else file_infos[index]["FilePath"]
+                for index in indexes
+            ]
+            items = media_pool.ImportMedia(import_infos) or []
+            lib.media_pool_index.add(folder, items)
+
+            for index, item in zip(
+                indexes,
+                self._match_imported_items(
+                    [file_infos[index] for index in indexes], items)
+            ):
+                results[index] = item
+
+        for context, file_info, result in zip(contexts, file_infos, results):
+            if result is None:
+                self.log.error(
+                    "Failed to import media: {}".format(file_info["FilePath"])
+                )
+                continue
 
-        result = items[0]
+            representation = context["representation"]
+            self._set_metadata(result, context)
+            self._set_colorspace_from_representation(result, representation)
 
-        self._set_metadata(result, context)
-        self._set_colorspace_from_representation(result, representation)
+            data = self._get_container_data(context)
 
-        data = self._get_container_data(context)
+            # Add containerise data only needed on first load
+            data.update({
+                "schema": "openpype:container-2.0",
+                "id": AVALON_CONTAINER_ID,
+                "loader": str(self.__class__.__name__),
+            })
 
-        # Add containerise data only needed on first load
-        data.update({
-            "schema": "openpype:container-2.0",
-            "id": AVALON_CONTAINER_ID,
-            "loader": str(self.__class__.__name__),
-        })
+            result.SetMetadata(lib.pype_tag_name, json.dumps(data))
+            media_pool_containers.register(result, data)
+
+        return results
 
-        result.SetMetadata(lib.pype_tag_name, json.dumps(data))
+    @staticmethod
+    def _match_imported_items(file_infos, items):
+        """Return imported items in order of the file infos.
 
-        return result
+        Resolve returns the imported items in order of the import list,
+        however media failing to import are missing from the result. In
+        that case the items are matched by their file path.
+
+        Returns:
+            list[Union[resolve.MediaPoolItem, None]]: matching items
+        """
+        if len(items) == len(file_infos):
+            return list(items)
+
+        index = lib.MediaPoolIndex
+        item_by_key = {}
+        for item in items:
+            for key in index.get_clip_keys(item.GetClipProperty() or {}):
+                item_by_key[key] = item
+
+        matched = []
+        for file_info in file_infos:
+            if "StartIndex" in file_info:
+                key = (
+                    "sequence",
+                    (
+                        index.normalize_path(file_info["FilePath"]),
+                        int(file_info["StartIndex"])
+                    )
+                )
+            else:
+                key = ("path", index.normalize_path(file_info["FilePath"]))
+            matched.append(item_by_key.get(key))
+        return matched
 
     def switch(self, container, context):
         self.update(container, context)
 
+    @profile_operation("LoadMedia.update")
     def update(self, container, context):
         # Update MediaPoolItem filepath and metadata
         item = container["_item"]
@@ -310,10 +592,14 @@ class LoadMedia(LoaderPlugin):
                 f"Failed to replace media pool item clip to filepath: {path}"
             )
 
+        # Collected data of timeline items using the media are outdated
+        mark_media_pool_items_changed([item.GetUniqueId()])
+
         # Update the metadata
         update_data = self._get_container_data(context)
         data.update(update_data)
         item.SetMetadata(lib.pype_tag_name, json.dumps(data))
+        media_pool_containers.register(item, data)
 
         self._set_metadata(media_pool_item=item, context=context)
         self._set_colorspace_from_representation(
@@ -333,38 +619,60 @@ class LoadMedia(LoaderPlugin):
                     f"Failed to re-apply colorspace: {colorspace_before}."
                 )
 
-        # Update the clip color
+        # Update the clip color, when updating many containers at once
+        # resolve the last versions for all of them on first update
+        project_name = context["project"]["name"]
+        if not lib.last_version_cache.is_cached(
+                project_name, context["version"]["productId"]):
+            cache_container_last_versions(
+                project_name, media_pool_containers.get_containers())
         color = self.get_item_color(context)
         item.SetClipColor(color)
 
     def remove(self, container):
+        self.remove_batch([container])
+
+    @profile_operation("LoadMedia.remove")
+    def remove_batch(self, containers):
+        """Remove multiple containers at once.
+
+        Usages of all media pool items are deleted with one `DeleteClips`
+        call per timeline and all media pool items with one `DeleteClips`
+        call on the media pool.
+
+        Args:
+            containers (list[dict]): containers to remove
+        """
         # Remove MediaPoolItem entry
         project = lib.get_current_project()
         media_pool = project.GetMediaPool()
-        item = container["_item"]
+        items = [container["_item"] for container in containers]
 
         # Delete any usages of the media pool item so there's no trail
         # left in existing timelines. Currently only the media pool item
         # gets removed which fits the Resolve workflow but is confusing
         # artists
-        usage = find_clip_usage(media_pool_item=item, project=project)
-        if usage:
-            # Group all timeline items per timeline, so we can delete the clips
-            # in the timeline at once. The Resolve objects are not hashable, so
-            # we need to store them in the dict by id
-            usage_by_timeline = defaultdict(list)
-            timeline_by_id = {}
+        # Group all timeline items per timeline, so we can delete the clips
+        # in the timeline at once. The Resolve objects are not hashable, so
+        # we need to store them in the dict by id
+        usage_by_timeline = defaultdict(list)
+        timeline_by_id = {}
+        for usage in lib.clip_usage_index.find_many(items, project=project):
             for timeline, timeline_item in usage:
                 timeline_id = timeline.GetUniqueId()
                 timeline_by_id[timeline_id] = timeline
-                usage_by_timeline[timeline.GetUniqueId()].append(timeline_item)
+                usage_by_timeline[timeline_id].append(timeline_item)
 
-            for timeline_id, timeline_items in usage_by_timeline.items():
-                timeline = timeline_by_id[timeline_id]
-                timeline.DeleteClips(timeline_items)
+        for timeline_id, timeline_items in usage_by_timeline.items():
+            timeline = timeline_by_id[timeline_id]
+            timeline.DeleteClips(timeline_items)
 
-        # Delete the media pool item
-        media_pool.DeleteClips([item])
+        # Delete the media pool items
+        lib.clip_usage_index.discard(items)
+        lib.media_pool_index.discard(items)
+        for item in items:
+            media_pool_containers.discard(item)
+        media_pool.DeleteClips(items)
 
     def _get_container_data(self, context: dict) -> dict:
         """Return metadata related to the representation and version."""
@@ -399,13 +707,36 @@ class LoadMedia(LoaderPlugin):
 
         Coloring depends on whether representation is the latest version.
         """
+        return cls.get_item_colors([context])[0]
+
+    @classmethod
+    def get_item_colors(cls, contexts: List[dict]) -> List[str]:
+        """Return item color names for multiple contexts.
+
+        The last versions of all products not cached yet, or cached
+        before the colored version was published, are queried at once per
+        project.
+        """
+        versions_by_project = defaultdict(list)
+        for context in contexts:
+            versions_by_project[context["project"]["name"]].append(
+                context["version"])
+
+        last_version_ids = set()
+        for project_name, version_entities in versions_by_project.items():
+            last_version_ids.update(
+                lib.last_version_cache.get_latest_version_ids(
+                    project_name, version_entities)
+            )
+
         # Compare version with last version
         # set clip colour
-        if version_is_latest(project_name=context["project"]["name"],
-                             version_id=context["version"]["id"]):
-            return cls.clip_color_last
-        else:
-            return cls.clip_color_old
+        return [
+            cls.clip_color_last
+            if context["version"]["id"] in last_version_ids
+            else cls.clip_color_old
+            for context in contexts
+        ]
 
     def _set_metadata(self, media_pool_item, context: dict):
         """Set Media Pool Item Clip Properties"""
@@ -417,11 +748,14 @@ class LoadMedia(LoaderPlugin):
             value_formatted = StringTemplate(value).format_strict(context)
             media_pool_item.SetClipProperty(clip_property, value_formatted)
 
-    def _get_file_info(self, context: dict) -> Tuple[bool, Union[str, dict]]:
+    def _get_file_info(
+        self, context: dict, anatomy: Optional[Anatomy] = None
+    ) -> Tuple[bool, Union[str, dict]]:
         """Return file info for Resolve ImportMedia.
 
         Args:
             context (dict): The context dictionary.
+            anatomy (Optional[Anatomy]): Project anatomy to reuse.
 
         Returns:
             Tuple[bool, Union[str, dict]]: A tuple of whether the file is a
@@ -429,7 +763,8 @@ class LoadMedia(LoaderPlugin):
         """
 
         representation = context["representation"]
-        anatomy = Anatomy(self._project_name)
+        if anatomy is None:
+            anatomy = Anatomy(self._project_name)
 
         # Get path to representation with correct frame number
         repre_path = get_representation_path_with_anatomy(
@@ -446,10 +781,6 @@ class LoadMedia(LoaderPlugin):
 
         # This is sequence
         is_sequence = True
-        repre_files = [
-            file["path"].format(root=anatomy.roots)
-            for file in representation["files"]
-        ]
 
         # Change frame in representation context to get path with frame
         #   splitter.
@@ -471,7 +802,8 @@ class LoadMedia(LoaderPlugin):
         abs_filepath = Path(repre_dir, file_name)
 
         start_index = int(first_frame)
-        end_index = int(int(first_frame) + len(repre_files) - 1)
+        end_index = int(
+            int(first_frame) + len(representation["files"]) - 1)
 
         # See Resolve API, to import for example clip "file_[001-100].dpx":
         # ImportMedia([{"FilePath":"file_%03d.dpx",
@@ -531,3 +863,54 @@ class LoadMedia(LoaderPlugin):
                 self.log.warning(
                     f"Failed to apply colorspace: {colorspace}."
                 )
+
+
+class LoadMediaJob(jobs.Job):
+    """Load representations with `LoadMedia` in the background.
+
+    Jobs of consecutive `load` calls of the same loader and options are
+    merged so the representations selected in the loader are imported in
+    few batches.
+    """
+
+    label = "Load media"
+    # representations loaded per step
+    chunk_size = 50
+
+    def __init__(self, loader, contexts, options=None):
+        super(LoadMediaJob, self).__init__()
+        self.loader = loader
+        self.contexts = list(contexts)
+        self.options = options or {}
+        self.total = len(self.contexts)
+        self._prepared = None
+
+    def can_merge(self, other):
+        return (
+            isinstance(other, LoadMediaJob)
+            and type(other.loader) is type(self.loader)
+            and other.options == self.options
+        )
+
+    def merge(self, other):
+        self.contexts.extend(other.contexts)
+        self.total = len(self.contexts)
+
+    def prepare(self):
+        self._prepared = self.loader.prepare_batch(
+            self.contexts, self.options)
+
+    def iter_steps(self):
+        loaded = 0
+        for start in range(0, self.total, self.chunk_size):
+            end = min(start + self.chunk_size, self.total)
+            loaded += len(
+                self.loader.load_prepared(self._prepared, range(start, end)))
+            yield end
+
+        if loaded != self.total:
+            raise RuntimeError(
+                "Failed to import {} of {} representations. "
+                "See log for details.".format(
+                    self.total - loaded, self.total)
+            )
@@ -30,7 +30,8 @@ class ExtractWorkfile(publish.Extractor):
         drp_file_path = os.path.normpath(
             os.path.join(staging_dir, drp_file_name))
 
-        # write out the drp workfile
+        # write out the drp workfile, always exported from the current
+        # project state so that no edit since the last save is missed
         get_project_manager().ExportProject(
             project.GetName(), drp_file_path)
 
@@ -3,7 +3,11 @@ from pprint import pformat
 import pyblish
 
 from ayon_core.pipeline import AYON_INSTANCE_ID, AVALON_INSTANCE_ID
+from ayon_resolve.api import lib
+from ayon_resolve.api.profiler import profile_operation
 from ayon_resolve.api.lib import (
+    OTIOClipIndex,
+    TimelineSnapshot,
     get_current_timeline_items,
     get_timeline_item_pype_tag,
     publish_clip_color,
@@ -19,100 +23,76 @@ class PrecollectInstances(pyblish.api.ContextPlugin):
     label = "Precollect Instances"
     hosts = ["resolve"]
 
+    @profile_operation("PrecollectInstances")
     def process(self, context):
         otio_timeline = context.data["otioTimeline"]
+
+        # read the tags fresh from Resolve once per publish
+        lib.tag_cache.clear()
+
+        # collect the timeline once so later collectors can reuse it
+        snapshot = context.data.get("timelineSnapshot")
+        if snapshot is None:
+            snapshot = TimelineSnapshot()
+            context.data["timelineSnapshot"] = snapshot
+
+        # index the otio clips once so later collectors can reuse it
+        otio_clip_index = context.data.get("otioClipIndex")
+        if otio_clip_index is None:
+            otio_clip_index = OTIOClipIndex(otio_timeline)
+            context.data["otioClipIndex"] = otio_clip_index
+
         selected_timeline_items = get_current_timeline_items(
-            filter=True, selecting_color=publish_clip_color)
+            filter=True, selecting_color=publish_clip_color,
+            snapshot=snapshot)
 
         self.log.info(
             "Processing enabled track items: {}".format(
                 len(selected_timeline_items)))
 
-        for timeline_item_data in selected_timeline_items:
-
-            data = {}
-            timeline_item = timeline_item_data["clip"]["item"]
-
-            # get pype tag data
-            tag_data = get_timeline_item_pype_tag(timeline_item)
-            self.log.debug(f"__ tag_data: {pformat(tag_data)}")
-
-            if not tag_data:
-                continue
+        # instance data of items unchanged since the last publish are
+        # reused, the fingerprint of items is set by `PrecollectWorkfile`
+        collect_cache = context.data.get("collectCache")
+        timeline_id = None
+        if collect_cache is not None:
+            timeline_id = snapshot.timeline.GetUniqueId()
 
-            if tag_data.get("id") not in {
-                AYON_INSTANCE_ID, AVALON_INSTANCE_ID
-            }:
+        for timeline_item_data in selected_timeline_items:
+            clip_data = timeline_item_data["clip"]
+            timeline_item = clip_data["item"]
+            fingerprint = clip_data.get("fingerprint")
+
+            data = None
+            if collect_cache is not None and fingerprint:
+                data = collect_cache.get(timeline_id, fingerprint, "instance")
+                if data is not None:
+                    self.log.debug(
+                        "Reusing data of unchanged item: {}".format(
+                            clip_data["name"]))
+
+            if data is None:
+                data = self.collect_instance_data(timeline_item_data) or {}
+                if collect_cache is not None and fingerprint:
+                    # items which are not instances are stored too
+                    collect_cache.set(
+                        timeline_id,
+                        fingerprint,
+                        "instance",
+                        data,
+                        media_pool_item_id=clip_data["mediaPoolItemId"]
+                    )
+
+            if not data:
                 continue
 
-            media_pool_item = timeline_item.GetMediaPoolItem()
-            source_duration = int(media_pool_item.GetClipProperty("Frames"))
-
-            # solve handles length
-            handle_start = min(
-                tag_data["handleStart"], int(timeline_item.GetLeftOffset()))
-            handle_end = min(
-                tag_data["handleEnd"], int(
-                    source_duration - timeline_item.GetRightOffset()))
-
-            self.log.debug("Handles: <{}, {}>".format(handle_start, handle_end))
-
-            # add tag data to instance data
             data.update({
-                k: v for k, v in tag_data.items()
-                if k not in ("id", "applieswhole", "label")
-            })
-
-            folder_path = tag_data["folder_path"]
-            # Backward compatibility fix of 'entity_type' > 'folder_type'
-            if "parents" in data:
-                for parent in data["parents"]:
-                    if "entity_type" in parent:
-                        parent["folder_type"] = parent.pop("entity_type")
-
-            # TODO: remove backward compatibility
-            product_name = tag_data.get("productName")
-            if product_name is None:
-                # backward compatibility: subset -> productName
-                product_name = tag_data.get("subset")
-
-            # backward compatibility: product_name should not be missing
-            if not product_name:
-                self.log.error(
-                    "Product name is not defined for: {}".format(folder_path))
-
-            # TODO: remove backward compatibility
-            product_type = tag_data.get("productType")
-            if product_type is None:
-                # backward compatibility: family -> productType
-                product_type = tag_data.get("family")
-
-            # backward compatibility: product_type should not be missing
-            if not product_type:
-                self.log.error(
-                    "Product type is not defined for: {}".format(folder_path))
-
-            data.update({
-                "name": "{}_{}".format(folder_path, product_name),
-                "label": "{} {}".format(folder_path, product_name),
-                "folderPath": folder_path,
                 "item": timeline_item,
-                "publish": get_publish_attribute(timeline_item),
                 "fps": context.data["fps"],
-                "handleStart": handle_start,
-                "handleEnd": handle_end,
-                "newHierarchyIntegration": True,
-                # Backwards compatible (Deprecated since 24/06/06)
-                "newAssetPublishing": True,
-                "families": ["clip"],
-                "productType": product_type,
-                "productName": product_name,
-                "family": product_type
             })
 
             # otio clip data
             otio_data = get_otio_clip_instance_data(
-                otio_timeline, timeline_item_data) or {}
+                otio_timeline, timeline_item_data, otio_clip_index) or {}
             data.update(otio_data)
 
             # add resolution
@@ -128,6 +108,111 @@ class PrecollectInstances(pyblish.api.ContextPlugin):
             self.log.debug(
                 "_ instance.data: {}".format(pformat(instance.data)))
 
+        self.log.debug(
+            "Tag cache stats: {}".format(lib.tag_cache.stats()))
+
+        if collect_cache is not None:
+            self.log.debug(
+                "Collect cache stats: {}".format(collect_cache.stats()))
+            try:
+                collect_cache.save()
+            except OSError as error:
+                self.log.warning(
+                    "Failed to save collect cache: {}".format(error))
+
+    def collect_instance_data(self, timeline_item_data):
+        """Return instance data of the timeline item.
+
+        The data do not contain the timeline item, fps, otio clip and
+        resolution and are json serializable so they can be cached.
+
+        Args:
+            timeline_item_data (dict): timeline item data
+
+        Returns:
+            Union[dict, None]: instance data or None if the item is not
+                an instance
+        """
+        data = {}
+        clip_data = timeline_item_data["clip"]
+        timeline_item = clip_data["item"]
+
+        # get pype tag data
+        tag_data = get_timeline_item_pype_tag(timeline_item)
+        self.log.debug(f"__ tag_data: {pformat(tag_data)}")
+
+        if not tag_data:
+            return None
+
+        if tag_data.get("id") not in {
+            AYON_INSTANCE_ID, AVALON_INSTANCE_ID
+        }:
+            return None
+
+        media_pool_item = clip_data["mediaPoolItem"]
+        source_duration = int(media_pool_item.GetClipProperty("Frames"))
+
+        # solve handles length
+        handle_start = min(
+            tag_data["handleStart"], int(clip_data["leftOffset"]))
+        handle_end = min(
+            tag_data["handleEnd"], int(
+                source_duration - clip_data["rightOffset"]))
+
+        self.log.debug("Handles: <{}, {}>".format(handle_start, handle_end))
+
+        # add tag data to instance data
+        data.update({
+            k: v for k, v in tag_data.items()
+            if k not in ("id", "applieswhole", "label")
+        })
+
+        folder_path = tag_data["folder_path"]
+        # Backward compatibility fix of 'entity_type' > 'folder_type'
+        if "parents" in data:
+            for parent in data["parents"]:
+                if "entity_type" in parent:
+                    parent["folder_type"] = parent.pop("entity_type")
+
+        # TODO: remove backward compatibility
+        product_name = tag_data.get("productName")
+        if product_name is None:
+            # backward compatibility: subset -> productName
+            product_name = tag_data.get("subset")
+
+        # backward compatibility: product_name should not be missing
+        if not product_name:
+            self.log.error(
+                "Product name is not defined for: {}".format(folder_path))
+
+        # TODO: remove backward compatibility
+        product_type = tag_data.get("productType")
+        if product_type is None:
+            # backward compatibility: family -> productType
+            product_type = tag_data.get("family")
+
+        # backward compatibility: product_type should not be missing
+        if not product_type:
+            self.log.error(
+                "Product type is not defined for: {}".format(folder_path))
+
+        data.update({
+            "name": "{}_{}".format(folder_path, product_name),
+            "label": "{} {}".format(folder_path, product_name),
+            "folderPath": folder_path,
+            "publish": get_publish_attribute(timeline_item),
+            "handleStart": handle_start,
+            "handleEnd": handle_end,
+            "newHierarchyIntegration": True,
+            # Backwards compatible (Deprecated since 24/06/06)
+            "newAssetPublishing": True,
+            "families": ["clip"],
+            "productType": product_type,
+            "productName": product_name,
+            "family": product_type
+        })
+        return data
+
     def get_resolution_to_data(self, data, context):
         assert data.get("otioClip"), "Missing `otioClip` data"
 
@@ -4,6 +4,9 @@ from pprint import pformat
 from ayon_core.pipeline import get_current_folder_path
 
 from ayon_resolve import api as rapi
+from ayon_resolve.api import lib
+from ayon_resolve.api.profiler import profile_operation
+from ayon_resolve.api.collect_cache import get_collect_cache
 from ayon_resolve.otio import davinci_export
 
 
@@ -13,6 +16,7 @@ class PrecollectWorkfile(pyblish.api.ContextPlugin):
     label = "Precollect Workfile"
     order = pyblish.api.CollectorOrder - 0.5
 
+    @profile_operation("PrecollectWorkfile")
     def process(self, context):
         current_folder_path = get_current_folder_path()
         folder_name = current_folder_path.split("/")[-1]
@@ -22,8 +26,20 @@ class PrecollectWorkfile(pyblish.api.ContextPlugin):
         fps = project.GetSetting("timelineFrameRate")
         video_tracks = rapi.get_video_track_names()
 
+        # collect the timeline once so later collectors can reuse it
+        snapshot = rapi.TimelineSnapshot(
+            timeline=project.GetCurrentTimeline())
+
+        # otio clips of items unchanged since the last publish are reused,
+        # the tags are stored in the media pool items without markers so
+        # the items fingerprint would not cover them
+        collect_cache = None
+        if lib.pype_marker_workflow:
+            collect_cache = get_collect_cache(project)
+
         # adding otio timeline to context
-        otio_timeline = davinci_export.create_otio_timeline(project)
+        otio_timeline = davinci_export.create_otio_timeline(
+            project, snapshot, collect_cache)
 
         instance_data = {
             "name": "{}_{}".format(folder_name, product_name),
@@ -43,6 +59,8 @@ class PrecollectWorkfile(pyblish.api.ContextPlugin):
         context_data = {
             "activeProject": project,
             "otioTimeline": otio_timeline,
+            "timelineSnapshot": snapshot,
+            "collectCache": collect_cache,
             "videoTracks": video_tracks,
             "currentFile": project.GetName(),
             "fps": fps,
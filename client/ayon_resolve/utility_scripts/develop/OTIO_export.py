@@ -59,13 +59,12 @@ def _export_button(event):
     pm = resolve.GetProjectManager()
     project = pm.GetCurrentProject()
     timeline = project.GetCurrentTimeline()
-    otio_timeline = otio_export.create_otio_timeline(project)
     otio_path = os.path.join(
         itm["exportfilebttn"].Text,
         timeline.GetName() + ".otio")
     print(otio_path)
-    otio_export.write_to_file(
-        otio_timeline,
+    otio_export.write_otio_timeline_to_file(
+        project,
         otio_path)
     _close_window(None)
 
@@ -1,8 +1,14 @@
 import os
+import json
 import shutil
+import hashlib
 from ayon_core.lib import Logger, is_running_from_build
 
 RESOLVE_ADDON_ROOT = os.path.dirname(os.path.abspath(__file__))
+# manifest of files synced to Resolve's utility scripts dir
+MANIFEST_FILENAME = ".ayon_manifest.json"
+# not copied to Resolve's utility scripts dir
+IGNORED_NAMES = {"__pycache__"}
 
 
 def setup(env):
@@ -32,16 +38,8 @@ def setup(env):
     # Make sure scripts dir exists
     os.makedirs(util_scripts_dir, exist_ok=True)
 
-    # make sure no script file is in folder
-    for script in os.listdir(util_scripts_dir):
-        path = os.path.join(util_scripts_dir, script)
-        log.info("Removing `{}`...".format(path))
-        if os.path.isdir(path):
-            shutil.rmtree(path, onerror=None)
-        else:
-            os.remove(path)
-
-    # copy scripts into Resolve's utility scripts dir
+    # collect files to copy into Resolve's utility scripts dir
+    files = {}
     for directory, scripts in scripts.items():
         for script in scripts:
             if (
@@ -51,6 +49,9 @@ def setup(env):
                 # only copy those if started from build
                 continue
 
+            if script in IGNORED_NAMES:
+                continue
+
             src = os.path.join(directory, script)
             dst = os.path.join(util_scripts_dir, script)
 
@@ -61,11 +62,124 @@ def setup(env):
                 dst = os.path.join(os.path.dirname(util_scripts_dir),
                                    script)
 
-            log.info("Copying `{}` to `{}`...".format(src, dst))
-            if os.path.isdir(src):
-                shutil.copytree(
-                    src, dst, symlinks=False,
-                    ignore=None, ignore_dangling_symlinks=False
-                )
-            else:
-                shutil.copy2(src, dst)
+            if not os.path.isdir(src):
+                files[dst] = src
+                continue
+
+            for root, dirnames, filenames in os.walk(src):
+                dirnames[:] = [
+                    name for name in dirnames if name not in IGNORED_NAMES]
+                for filename in filenames:
+                    file_src = os.path.join(root, filename)
+                    files[os.path.join(
+                        dst, os.path.relpath(file_src, src))] = file_src
+
+    sync_files(files, util_scripts_dir, log)
+
+
+def get_file_hash(path):
+    """Return sha256 checksum of the file."""
+    file_hash = hashlib.sha256()
+    with open(path, "rb") as stream:
+        for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def _get_stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def sync_files(files, root, log):
+    """Copy changed files into the root dir and remove stale files from it.
+
+    Copied files are recorded in a manifest stored in the root dir with
+    size and modification time of the source and the destination and the
+    checksum of the content. A file is copied only when it is missing in
+    the destination, the destination was changed or the source content
+    changed. Files in the root dir which are not synced are removed, so
+    repeated sync of unchanged files does not write anything.
+
+    Every file is copied next to its destination first and renamed to it,
+    so an interrupted sync does not leave partially written files.
+
+    Args:
+        files (dict[str, str]): source path by destination path, the
+            destinations may be outside of the root dir
+        root (str): dir the manifest is stored in, all files in it which
+            are not in `files` are removed
+        log (logging.Logger): logger
+    """
+    manifest_path = os.path.join(root, MANIFEST_FILENAME)
+    try:
+        with open(manifest_path, "r") as stream:
+            manifest = json.load(stream)
+    except (OSError, ValueError):
+        manifest = {}
+
+    new_manifest = {}
+    for dst, src in files.items():
+        key = os.path.relpath(dst, root)
+        entry = manifest.get(key)
+        src_stat = _get_stat(src)
+        dst_stat = _get_stat(dst)
+
+        if entry is not None and dst_stat == entry["destination"]:
+            if src_stat == entry["source"]:
+                new_manifest[key] = entry
+                continue
+
+            # source touched, compare the content
+            checksum = get_file_hash(src)
+            if checksum == entry["hash"]:
+                new_manifest[key] = dict(entry, source=src_stat)
+                continue
+        else:
+            checksum = get_file_hash(src)
+
+        log.info("Copying `{}` to `{}`...".format(src, dst))
+        dst_dir = os.path.dirname(dst)
+        os.makedirs(dst_dir, exist_ok=True)
+        tmp_path = os.path.join(
+            dst_dir, ".{}.tmp".format(os.path.basename(dst)))
+        shutil.copy2(src, tmp_path)
+        os.replace(tmp_path, dst)
+        new_manifest[key] = {
+            "source": src_stat,
+            "destination": _get_stat(dst),
+            "hash": checksum,
+        }
+
+    # remove files not synced any more, destinations outside of the root
+    # dir are removed only if they were synced before
+    synced = {os.path.normpath(dst) for dst in files}
+    stale = [
+        os.path.normpath(os.path.join(root, key))
+        for key in manifest
+        if key not in new_manifest
+    ]
+    for dirpath, dirnames, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.normpath(os.path.join(dirpath, filename))
+            if path not in synced and filename != MANIFEST_FILENAME:
+                stale.append(path)
+
+    for path in set(stale):
+        if os.path.isfile(path):
+            log.info("Removing `{}`...".format(path))
+            os.remove(path)
+
+    # remove dirs left empty
+    for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+        if dirpath != root and not os.listdir(dirpath):
+            os.rmdir(dirpath)
+
+    if new_manifest != manifest:
+        tmp_path = "{}.tmp".format(manifest_path)
+        with open(tmp_path, "w") as stream:
+            json.dump(new_manifest, stream, indent=4, sort_keys=True)
+        os.replace(tmp_path, manifest_path)
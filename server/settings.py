@@ -114,6 +114,15 @@ class LoadMediaModel(BaseSettingsModel):
         "Loader/{folder[path]}",
         title="Media Pool bin path template"
     )
+    load_in_background: bool = SettingsField(
+        False,
+        title="Load in background",
+        description=(
+            "Load the media in the background of the AYON menu so the UI"
+            " stays responsive during large loads. Progress is shown in the"
+            " AYON menu."
+        )
+    )
     metadata: list[MetadataMappingModel] = SettingsField(
         default_factory=list,
         title="Metadata mapping",
@@ -182,6 +191,7 @@ DEFAULT_VALUES = {
             "media_pool_bin_path": (
                 "Loader/{folder[path]}"
             ),
+            "load_in_background": False,
             "metadata": [
                 {
                     "name": "Comments",